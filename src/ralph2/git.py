@@ -4,11 +4,13 @@ This module provides the GitBranchManager class which encapsulates all git
 worktree and branch operations with context manager support for guaranteed cleanup.
 """
 
+import atexit
 import logging
 import os
 import subprocess
 import sys
-from typing import Optional, Tuple
+import threading
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -311,6 +313,100 @@ def _run_git_command(command: list[str], cwd: str) -> subprocess.CompletedProces
     return subprocess.run(command, capture_output=True, text=True, cwd=cwd)
 
 
+class GitPlumbingSession:
+    """Answers read-only object lookups through one long-running git process.
+
+    A `git cat-file --batch-check` process is spawned on first use and kept
+    open, so resolving many refs costs a pipe round-trip each instead of a
+    process spawn. Refs are resolved fresh on every query, so branches created
+    or deleted by other git commands are seen immediately.
+
+    Only lookups go through the session; commands that change the repository
+    (branch, worktree, checkout, merge) still run via _run_git_command.
+    """
+
+    def __init__(self, cwd: str):
+        """Initialize the session.
+
+        Args:
+            cwd: Working directory (git repository root)
+        """
+        self._cwd = cwd
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def query(self, rev: str) -> Optional[str]:
+        """Resolve a revision (e.g. "refs/heads/main") to an object name.
+
+        Args:
+            rev: Revision to resolve; must not contain newlines
+
+        Returns:
+            The object name, or None if it does not resolve (including
+            outside a git repository)
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._proc = subprocess.Popen(
+                    ["git", "cat-file", "--batch-check=%(objectname)"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    cwd=self._cwd
+                )
+            try:
+                self._proc.stdin.write(f"{rev}\n")
+                self._proc.stdin.flush()
+            except BrokenPipeError:
+                # git exited early (e.g. not a repository)
+                return None
+            reply = self._proc.stdout.readline().rstrip("\n")
+        if not reply or reply.endswith((" missing", " ambiguous")):
+            return None
+        return reply
+
+    def close(self) -> None:
+        """Terminate the git process. Safe to call multiple times."""
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+            finally:
+                self._proc.stdout.close()
+                self._proc = None
+
+
+_plumbing_sessions: Dict[str, GitPlumbingSession] = {}
+
+
+def get_plumbing_session(cwd: str) -> GitPlumbingSession:
+    """Return the shared plumbing session for a repository, creating it if needed.
+
+    Args:
+        cwd: Working directory (git repository root)
+
+    Returns:
+        The GitPlumbingSession for cwd
+    """
+    session = _plumbing_sessions.get(cwd)
+    if session is None:
+        session = _plumbing_sessions.setdefault(cwd, GitPlumbingSession(cwd))
+    return session
+
+
+@atexit.register
+def _close_plumbing_sessions() -> None:
+    """Terminate all cached plumbing session processes."""
+    for session in _plumbing_sessions.values():
+        session.close()
+    _plumbing_sessions.clear()
+
+
 def create_worktree(
     work_item_id: str,
     run_id: str,
@@ -365,6 +461,25 @@ def create_worktree(
         raise
 
 
+def _current_branch(cwd: str) -> Optional[str]:
+    """Get the branch checked out in cwd by reading .git/HEAD, without running git.
+
+    Args:
+        cwd: Working directory (repository root)
+
+    Returns:
+        The branch name, or None if it can't be read this way (detached HEAD,
+        linked worktree, or cwd is not a repository root)
+    """
+    try:
+        with open(os.path.join(cwd, ".git", "HEAD")) as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    prefix = "ref: refs/heads/"
+    return head[len(prefix):] if head.startswith(prefix) else None
+
+
 def merge_branch(
     branch_name: str,
     cwd: str,
@@ -386,22 +501,22 @@ def merge_branch(
     Returns:
         (success, error_message) - error_message is empty on success
     """
-    # Ensure we're on the target branch
-    result = _run_git_command(["git", "checkout", target_branch], cwd)
-    if result.returncode != 0:
-        return False, f"Failed to checkout {target_branch}: {result.stderr}"
+    # Ensure we're on the target branch (serial merges are usually already there)
+    if _current_branch(cwd) != target_branch:
+        result = _run_git_command(["git", "checkout", target_branch], cwd)
+        if result.returncode != 0:
+            return False, f"Failed to checkout {target_branch}: {result.stderr}"
 
     # Merge feature branch
     result = _run_git_command(["git", "merge", branch_name, "--no-ff", "-m", f"Merge {branch_name}"], cwd)
     if result.returncode != 0:
-        # Check for merge conflict
-        status_result = _run_git_command(["git", "status", "--porcelain"], cwd)
-        conflicts = [
-            line for line in (status_result.stdout.strip().split('\n') if status_result.stdout.strip() else [])
-            if line.startswith('UU ') or line.startswith('AA ') or line.startswith('DD ')
-        ]
+        # Check for merge conflict. Unmerged paths are recorded in the index,
+        # so ask for those directly instead of having `git status` walk the
+        # whole working tree (including untracked files) to find them.
+        unmerged = _run_git_command(["git", "diff", "--name-only", "--diff-filter=U"], cwd)
+        conflicts = unmerged.stdout.splitlines()
         if conflicts:
-            return False, f"Merge conflict in files: {', '.join(line[3:] for line in conflicts)}"
+            return False, f"Merge conflict in files: {', '.join(conflicts)}"
         return False, f"Merge failed: {result.stderr}"
 
     return True, ""
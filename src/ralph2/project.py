@@ -7,8 +7,9 @@ Handles the .ralph2-id file in project roots and computes paths to
 import os
 import tempfile
 import uuid
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Set
 
 
 RALPH2_ID_FILENAME = ".ralph2-id"
@@ -16,6 +17,15 @@ RALPH2_HOME = Path.home() / ".ralph2"
 RALPH2_PROJECTS_DIR = RALPH2_HOME / "projects"
 
 
+def _projects_dir() -> Path:
+    """Return the directory holding per-project state.
+
+    $RALPH2_HOME, when set, replaces ~/.ralph2 (e.g. for tests or sandboxes).
+    """
+    home = os.environ.get("RALPH2_HOME")
+    return Path(home) / "projects" if home else RALPH2_PROJECTS_DIR
+
+
 def find_git_root(start_path: Optional[Path] = None) -> Optional[Path]:
     """
     Find the git repository root.
@@ -40,12 +50,29 @@ def find_git_root(start_path: Optional[Path] = None) -> Optional[Path]:
         return None
 
 
+# Per-process map of resolved start directory -> project root found from it.
+# Only successful lookups are cached, so a Ralph2file created after a miss is
+# still found; call clear_project_root_cache() after adding or moving a
+# Ralph2file below a cached root.
+_project_root_cache: Dict[Path, Path] = {}
+
+
+def clear_project_root_cache() -> None:
+    """Forget all cached find_project_root results."""
+    _project_root_cache.clear()
+
+
 def find_project_root(start_path: Optional[Path] = None, require_spec: bool = True) -> Optional[Path]:
     """
     Find the project root by looking for a Ralph2file or git root.
 
     Walks up from start_path (or cwd) until it finds a Ralph2file.
-    If require_spec is False, falls back to git root.
+    If require_spec is False, falls back to git root. Found roots are cached
+    per start directory for the life of the process.
+
+    A cached root is reused for as long as its own Ralph2file exists. A
+    Ralph2file created later in a directory between start_path and the cached
+    root is not seen until clear_project_root_cache() is called.
 
     Args:
         start_path: Starting directory (defaults to cwd)
@@ -54,15 +81,24 @@ def find_project_root(start_path: Optional[Path] = None, require_spec: bool = Tr
     Returns:
         Path to project root, or None if no Ralph2file found (and require_spec=True)
     """
-    current = Path(start_path or Path.cwd()).resolve()
+    start = Path(start_path or Path.cwd()).resolve()
+
+    # A previous walk from this directory is reused as long as its Ralph2file
+    # is still there: one stat instead of one per parent directory
+    cached = _project_root_cache.get(start)
+    if cached is not None and (cached / "Ralph2file").exists():
+        return cached
 
+    current = start
     while current != current.parent:
         if (current / "Ralph2file").exists():
+            _project_root_cache[start] = current
             return current
         current = current.parent
 
     # Check root directory too
     if (current / "Ralph2file").exists():
+        _project_root_cache[start] = current
         return current
 
     # Fall back to git root if spec not required
@@ -95,10 +131,12 @@ def get_project_id(project_root: Path) -> str:
 
     id_path = project_root / RALPH2_ID_FILENAME
 
-    if id_path.exists():
+    try:
         project_id = id_path.read_text().strip()
-        if project_id:
-            return project_id
+    except FileNotFoundError:
+        project_id = ""
+    if project_id:
+        return project_id
 
     # Generate new UUID
     project_id = str(uuid.uuid4())
@@ -141,6 +179,19 @@ def get_project_id(project_root: Path) -> str:
         raise
 
 
+# State directories already created by this process. Ralph2 never deletes them
+# while running, so each one only needs a mkdir the first time it is handed out.
+_created_dirs: Set[Path] = set()
+
+
+def _ensure_dir(path: Path) -> Path:
+    """Create path (and parents) once per process and return it."""
+    if path not in _created_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(path)
+    return path
+
+
 def get_project_state_dir(project_id: str) -> Path:
     """
     Get the state directory for a project.
@@ -153,9 +204,7 @@ def get_project_state_dir(project_id: str) -> Path:
     Returns:
         Path to the project's state directory
     """
-    state_dir = RALPH2_PROJECTS_DIR / project_id
-    state_dir.mkdir(parents=True, exist_ok=True)
-    return state_dir
+    return _ensure_dir(_projects_dir() / project_id)
 
 
 def get_project_db_path(project_id: str) -> Path:
@@ -183,9 +232,7 @@ def get_project_outputs_dir(project_id: str) -> Path:
     Returns:
         Path to outputs directory for this project
     """
-    outputs_dir = get_project_state_dir(project_id) / "outputs"
-    outputs_dir.mkdir(parents=True, exist_ok=True)
-    return outputs_dir
+    return _ensure_dir(get_project_state_dir(project_id) / "outputs")
 
 
 def get_project_summaries_dir(project_id: str) -> Path:
@@ -200,9 +247,7 @@ def get_project_summaries_dir(project_id: str) -> Path:
     Returns:
         Path to summaries directory for this project
     """
-    summaries_dir = get_project_state_dir(project_id) / "summaries"
-    summaries_dir.mkdir(parents=True, exist_ok=True)
-    return summaries_dir
+    return _ensure_dir(get_project_state_dir(project_id) / "summaries")
 
 
 def get_memory_path(project_id: str) -> Path:
@@ -248,7 +293,7 @@ def write_memory(project_id: str, content: str) -> None:
     """
     memory_path = get_memory_path(project_id)
     # Ensure parent directory exists
-    memory_path.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(memory_path.parent)
     memory_path.write_text(content)
 
 
@@ -265,21 +310,18 @@ def ensure_ralph2_id_in_gitignore(project_root: Path) -> bool:
     gitignore_path = project_root / ".gitignore"
     id_entry = RALPH2_ID_FILENAME
 
-    if gitignore_path.exists():
+    try:
         content = gitignore_path.read_text()
-        lines = content.splitlines()
-    else:
+    except FileNotFoundError:
         content = ""
-        lines = []
 
-    if id_entry in lines:
+    if id_entry in content.splitlines():
         return False
 
-    # Add .ralph2-id to gitignore
-    if content and not content.endswith('\n'):
-        content += '\n'
-    content += id_entry + '\n'
-    gitignore_path.write_text(content)
+    # Append .ralph2-id rather than rewriting the whole file
+    separator = '\n' if content and not content.endswith('\n') else ''
+    with gitignore_path.open('a') as f:
+        f.write(separator + id_entry + '\n')
 
     return True
 
@@ -288,7 +330,9 @@ class ProjectContext:
     """
     Encapsulates all project-related paths and IDs.
 
-    Use this to get consistent paths throughout Ralph2.
+    Use this to get consistent paths throughout Ralph2. The project ID and
+    state directory never change for a context, so the state directory tree
+    is created once at construction and the derived paths are plain joins.
     """
 
     def __init__(self, project_root: Optional[Path] = None, require_spec: bool = True):
@@ -314,21 +358,24 @@ class ProjectContext:
         self.project_root = project_root
         self.project_id = get_project_id(project_root)
         self.state_dir = get_project_state_dir(self.project_id)
+        # Create the whole state tree up front so the path properties do no I/O
+        for subdir in ("outputs", "summaries"):
+            _ensure_dir(self.state_dir / subdir)
 
-    @property
+    @cached_property
     def db_path(self) -> Path:
         """Path to the SQLite database."""
-        return get_project_db_path(self.project_id)
+        return self.state_dir / "ralph2.db"
 
-    @property
+    @cached_property
     def outputs_dir(self) -> Path:
         """Path to the outputs directory."""
-        return get_project_outputs_dir(self.project_id)
+        return self.state_dir / "outputs"
 
-    @property
+    @cached_property
     def summaries_dir(self) -> Path:
         """Path to the summaries directory."""
-        return get_project_summaries_dir(self.project_id)
+        return self.state_dir / "summaries"
 
     @property
     def ralph2file_path(self) -> Path:
@@ -1,14 +1,18 @@
 """Main iteration loop orchestration for Ralph2."""
 
 import asyncio
+import os
+import random
 import re
 import subprocess
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict, Any
 from dataclasses import dataclass
+from functools import lru_cache
 import uuid
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from .state.db import Ralph2DB
 from .state.models import Run, Iteration, AgentOutput, HumanInput
@@ -19,7 +23,89 @@ from .agents.specialist import CodeReviewerSpecialist, run_specialist
 from .project import ProjectContext, read_memory
 from .feedback import create_work_items_from_feedback
 from .milestone import complete_milestone
-from .git import create_worktree, merge_branch_to_main, merge_branch, remove_worktree, abort_merge
+from .git import create_worktree, merge_branch_to_main, merge_branch, remove_worktree, abort_merge, get_plumbing_session
+
+
+class _SlugTranslation(dict):
+    """str.translate() table for slugs: keeps [a-z0-9], maps whitespace to a space, drops the rest.
+
+    Entries for characters outside the precomputed ASCII range are resolved
+    on first lookup and memoized.
+    """
+
+    def __missing__(self, codepoint: int):
+        value = ' ' if chr(codepoint).isspace() else None
+        self[codepoint] = value
+        return value
+
+
+_SLUG_TRANSLATION = _SlugTranslation(
+    {ord(c): c for c in 'abcdefghijklmnopqrstuvwxyz0123456789'}
+)
+
+# First H1 heading ("# Title"), ignoring surrounding whitespace on the line
+_SPEC_H1_RE = re.compile(r'^[^\S\n]*# [^\S\n]*(\S.*?)[^\S\n]*$', re.MULTILINE)
+
+# Error messages that need human intervention rather than a retry, matched
+# case-insensitively in one pass (see classify_error)
+_FATAL_ERROR_RE = re.compile(
+    "|".join(re.escape(pattern) for pattern in (
+        "api key",
+        "authentication",
+        "unauthorized",
+        "401",
+        "403",
+        "permission denied",
+        "file not found",
+        "no such file",
+        "invalid config",
+    )),
+    re.IGNORECASE
+)
+
+# Planner/verifier retry backoff: decorrelated jitter starting at the base
+# delay and capped at the max, precomputed once per runner (see retry_delays)
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 8.0
+_RETRY_SCHEDULE_LENGTH = 2
+
+
+def retry_delays(count: int, base: float = _RETRY_BASE_DELAY, cap: float = _RETRY_MAX_DELAY) -> List[float]:
+    """Build a decorrelated-jitter backoff schedule.
+
+    Each delay is drawn uniformly from [base, previous * 3] and capped, so
+    concurrent runners retrying the same outage spread out instead of waking
+    in lockstep.
+
+    Args:
+        count: Number of delays to generate
+        base: First/minimum delay in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        List of `count` delays in seconds
+    """
+    delays = []
+    previous = base
+    for _ in range(count):
+        previous = min(cap, random.uniform(base, previous * 3))
+        delays.append(previous)
+    return delays
+
+
+# Encoder for agent message JSONL records. Messages are plain trees of
+# dicts/lists from the SDK, so the per-call circular-reference bookkeeping
+# json.dumps does is skipped
+_encode_jsonl_record = json.JSONEncoder(check_circular=False).encode
+
+# Exception types classified before any message matching (True = recoverable).
+# Subclasses inherit their nearest listed base via the MRO (see classify_error)
+_ERROR_TYPE_RECOVERABLE: Dict[type, bool] = {
+    TimeoutError: True,
+    ConnectionError: True,
+    PermissionError: False,
+    FileNotFoundError: False,
+}
 
 
 @dataclass
@@ -50,14 +136,13 @@ def _extract_spec_title(spec_content: str) -> str:
     Returns:
         The extracted title or "Spec" as default
     """
-    lines = spec_content.split('\n')
-    for line in lines:
-        if line.strip().startswith('# '):
-            # Remove the # and any leading/trailing whitespace
-            return line.strip()[2:].strip()
+    match = _SPEC_H1_RE.search(spec_content)
+    if match:
+        return match.group(1)
     return "Spec"
 
 
+@lru_cache(maxsize=256)
 def slugify_spec_title(title: str, max_length: int = 50) -> str:
     """
     Convert a spec title to a URL/branch-safe slug.
@@ -71,30 +156,27 @@ def slugify_spec_title(title: str, max_length: int = 50) -> str:
 
     Returns:
         Slugified title, or "spec" if result would be empty
+
+    Results are memoized, since the same title is slugified repeatedly
+    while naming and probing milestone branches.
     """
     if not title:
         return "spec"
 
-    # Convert to lowercase
-    slug = title.lower()
-
-    # Replace any non-alphanumeric character (except spaces) with nothing
-    slug = re.sub(r'[^a-z0-9\s]', '', slug)
-
-    # Replace multiple spaces with single space
-    slug = re.sub(r'\s+', ' ', slug)
+    if title.isascii() and title.replace(' ', '').isalnum():
+        # Fast path: plain ASCII words and spaces have nothing to strip
+        slug = title.lower()
+    else:
+        # Lowercase, then drop special characters and normalize whitespace in one pass
+        slug = title.lower().translate(_SLUG_TRANSLATION)
 
-    # Replace spaces with hyphens
-    slug = slug.replace(' ', '-')
+    # Collapse runs of whitespace into single hyphens (no leading/trailing ones)
+    slug = '-'.join(slug.split())
 
-    # Remove leading/trailing hyphens
-    slug = slug.strip('-')
-
-    # Truncate to max_length, ensuring we don't cut mid-word if possible
+    # Truncate to max_length; words are joined by single hyphens, so at
+    # most one trailing hyphen can be left behind by the cut
     if len(slug) > max_length:
-        slug = slug[:max_length]
-        # Remove trailing hyphen if present
-        slug = slug.rstrip('-')
+        slug = slug[:max_length].rstrip('-')
 
     # If result is empty, return default
     if not slug:
@@ -107,6 +189,9 @@ def branch_exists(branch_name: str, cwd: str) -> bool:
     """
     Check if a git branch exists.
 
+    Uses a cached per-repository `git cat-file --batch-check` process
+    rather than spawning git for every check.
+
     Args:
         branch_name: The branch name to check
         cwd: Working directory (git repository root)
@@ -114,14 +199,7 @@ def branch_exists(branch_name: str, cwd: str) -> bool:
     Returns:
         True if branch exists, False otherwise
     """
-    result = subprocess.run(
-        ["git", "show-ref", "--verify", "--quiet", f"refs/heads/{branch_name}"],
-        capture_output=True,
-        text=True,
-        cwd=cwd,
-        check=False
-    )
-    return result.returncode == 0
+    return get_plumbing_session(str(cwd)).query(f"refs/heads/{branch_name}") is not None
 
 
 def repo_has_commits(cwd: str) -> bool:
@@ -201,20 +279,52 @@ def generate_unique_branch_name(
     # Generate base branch name
     base_name = f"feature/{slug}"
 
-    # Check if base name exists
-    if not branch_exists(base_name, cwd):
+    # One git call lists every taken candidate; suffixes are picked in Python
+    return _first_free_branch_name(base_name, _existing_branch_names(base_name, cwd))
+
+
+def _existing_branch_names(base_name: str, cwd: str) -> set:
+    """
+    List local branches named base_name or base_name-<suffix> in one git call.
+
+    Args:
+        base_name: The unsuffixed branch name
+        cwd: Working directory (git repository root)
+
+    Returns:
+        Set of matching branch names (empty if git fails)
+    """
+    result = subprocess.run(
+        [
+            "git", "for-each-ref", "--format=%(refname:lstrip=2)",
+            f"refs/heads/{base_name}", f"refs/heads/{base_name}-*",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        check=False
+    )
+    if result.returncode != 0:
+        return set()
+    return set(result.stdout.splitlines())
+
+
+def _first_free_branch_name(base_name: str, existing: set) -> str:
+    """
+    Pick base_name, or the first of base_name-2, -3, ... not in existing.
+
+    Raises:
+        RuntimeError: If no free name is found within the suffix limit
+    """
+    if base_name not in existing:
         return base_name
 
-    # Try with suffixes -2, -3, etc.
-    suffix = 2
-    while True:
+    # Try with suffixes -2, -3, etc. (capped to catch runaway naming)
+    for suffix in range(2, 101):
         candidate = f"{base_name}-{suffix}"
-        if not branch_exists(candidate, cwd):
+        if candidate not in existing:
             return candidate
-        suffix += 1
-        # Safety limit to prevent infinite loop
-        if suffix > 100:
-            raise RuntimeError(f"Could not find unique branch name for {base_name}")
+    raise RuntimeError(f"Could not find unique branch name for {base_name}")
 
 
 def slugify_to_branch_name(title: str, max_length: int = 50) -> str:
@@ -268,15 +378,8 @@ def create_milestone_branch(
             return branch_name
         else:
             # Auto-generated: find unique name with suffix
-            suffix = 2
-            while True:
-                candidate = f"{branch_name}-{suffix}"
-                if not branch_exists(candidate, cwd):
-                    branch_name = candidate
-                    break
-                suffix += 1
-                if suffix > 100:
-                    raise RuntimeError(f"Could not find unique branch name for {branch_name}")
+            existing = _existing_branch_names(branch_name, cwd) | {branch_name}
+            branch_name = _first_free_branch_name(branch_name, existing)
 
     # Create the branch from main (as per spec: "create branch from main")
     result = subprocess.run(
@@ -319,6 +422,41 @@ def _create_milestone_branch(branch_name: str, cwd: str) -> bool:
     return result.returncode == 0
 
 
+def classify_error(error: BaseException) -> bool:
+    """Determine if an error is recoverable (can be retried) or fatal.
+
+    Recoverable errors:
+    - Rate limits (429, overloaded)
+    - Network timeouts
+    - Connection errors
+    - Temporary service unavailability
+
+    Fatal errors (require human intervention):
+    - Invalid API key / authentication
+    - Invalid configuration
+    - Missing required files
+    - Permission errors
+
+    Args:
+        error: The exception to classify
+
+    Returns:
+        True if the error is recoverable and can be retried
+    """
+    # Exception types settle the common cases without formatting the message
+    # (asyncio.TimeoutError is TimeoutError on the supported Pythons)
+    for cls in type(error).__mro__:
+        recoverable = _ERROR_TYPE_RECOVERABLE.get(cls)
+        if recoverable is not None:
+            return recoverable
+
+    # Anything that is not known to be fatal is retried: unknown errors
+    # default to recoverable, which is safer since retry is harmless. The
+    # recoverable cases above (rate limits, timeouts, 5xx, ...) need no
+    # separate check for that reason.
+    return _FATAL_ERROR_RE.search(str(error)) is None
+
+
 class Ralph2Runner:
     """Orchestrates the Ralph2 multi-agent iteration loop."""
 
@@ -399,6 +537,9 @@ class Ralph2Runner:
         # Output directory is managed by ProjectContext
         self.output_dir = project_context.outputs_dir
 
+        # Backoff between planner/verifier retries, drawn once per runner
+        self._retry_delays = retry_delays(_RETRY_SCHEDULE_LENGTH)
+
     @property
     def branch_option(self) -> Optional[str]:
         """Get the explicit branch option passed to the runner."""
@@ -541,11 +682,10 @@ class Ralph2Runner:
         """
         output_path = self.output_dir / f"iteration_{iteration_id}_{agent_type}.jsonl"
 
-        # Save as JSONL (each message is one line)
-        with open(output_path, 'w') as f:
-            for msg in messages:
-                json.dump(msg, f)
-                f.write('\n')
+        # Save as JSONL (each message is one line). Serialize everything up
+        # front and hand the file a single write rather than streaming each
+        # message through json.dump's many small chunked writes.
+        output_path.write_text(''.join(_encode_jsonl_record(msg) + '\n' for msg in messages))
 
         return str(output_path)
 
@@ -553,17 +693,49 @@ class Ralph2Runner:
         """Clean up abandoned ralph2/* feature branches and worktrees from interrupted work."""
         try:
             cwd = self.project_context.project_root
-            self._cleanup_worktrees(cwd)
-            self._cleanup_branches(cwd)
+            if not self._has_linked_worktrees(cwd):
+                # Nothing registered under .git/worktrees: skip `git worktree list`
+                self._cleanup_branches(cwd, self._list_git(["branch", "--list", "ralph2/*"], cwd))
+                return
+            # The two listings are read-only and independent, so run them
+            # concurrently; removals still happen worktrees-first.
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                worktrees = pool.submit(self._list_git, ["worktree", "list", "--porcelain"], cwd)
+                branches = pool.submit(self._list_git, ["branch", "--list", "ralph2/*"], cwd)
+                worktree_listing = worktrees.result()
+                branch_listing = branches.result()
+            self._cleanup_worktrees(cwd, worktree_listing)
+            self._cleanup_branches(cwd, branch_listing)
         except Exception as e:
             print(f"   ⚠️  Warning: Could not clean up branches/worktrees: {e}")
 
-    def _cleanup_worktrees(self, cwd):
-        """Clean up abandoned worktrees."""
-        result = subprocess.run(
-            ["git", "worktree", "list", "--porcelain"],
+    @staticmethod
+    def _has_linked_worktrees(cwd) -> bool:
+        """Cheap check for registered linked worktrees without running git.
+
+        Git records each linked worktree as an entry under .git/worktrees. When
+        .git is not a plain directory (e.g. cwd is itself a worktree) this
+        can't tell, so it answers True and lets `git worktree list` decide.
+        """
+        git_dir = Path(cwd) / ".git"
+        if not git_dir.is_dir():
+            return True
+        try:
+            with os.scandir(git_dir / "worktrees") as entries:
+                return any(True for _ in entries)
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _list_git(args, cwd):
+        """Run a read-only git listing command and return the completed process."""
+        return subprocess.run(
+            ["git", *args],
             capture_output=True, text=True, check=False, cwd=cwd
         )
+
+    def _cleanup_worktrees(self, cwd, result):
+        """Clean up abandoned worktrees from a `git worktree list --porcelain` result."""
         if result.returncode != 0:
             return
 
@@ -578,12 +750,8 @@ class Ralph2Runner:
                         capture_output=True, check=False, cwd=cwd
                     )
 
-    def _cleanup_branches(self, cwd):
-        """Clean up abandoned ralph2/* branches."""
-        result = subprocess.run(
-            ["git", "branch", "--list", "ralph2/*"],
-            capture_output=True, text=True, check=False, cwd=cwd
-        )
+    def _cleanup_branches(self, cwd, result):
+        """Clean up abandoned ralph2/* branches from a `git branch --list` result."""
         if result.returncode != 0 or not result.stdout.strip():
             return
 
@@ -737,68 +905,9 @@ class Ralph2Runner:
     def _is_recoverable_error(self, error: Exception) -> bool:
         """Determine if an error is recoverable (can be retried) or fatal.
 
-        Recoverable errors:
-        - Rate limits (429, overloaded)
-        - Network timeouts
-        - Connection errors
-        - Temporary service unavailability
-
-        Fatal errors (require human intervention):
-        - Invalid API key / authentication
-        - Invalid configuration
-        - Missing required files
-        - Permission errors
-
-        Args:
-            error: The exception to classify
-
-        Returns:
-            True if the error is recoverable and can be retried
+        See classify_error for the classification rules.
         """
-        error_str = str(error).lower()
-
-        # Recoverable patterns
-        recoverable_patterns = [
-            "rate limit",
-            "429",
-            "overloaded",
-            "timeout",
-            "connection",
-            "network",
-            "temporary",
-            "unavailable",
-            "retry",
-            "503",
-            "502",
-            "500",
-        ]
-
-        # Fatal patterns (non-recoverable)
-        fatal_patterns = [
-            "api key",
-            "authentication",
-            "unauthorized",
-            "401",
-            "403",
-            "permission denied",
-            "file not found",
-            "no such file",
-            "invalid config",
-        ]
-
-        # Check for fatal patterns first
-        for pattern in fatal_patterns:
-            if pattern in error_str:
-                return False
-
-        # Check for recoverable patterns
-        for pattern in recoverable_patterns:
-            if pattern in error_str:
-                return True
-
-        # Default: assume recoverable for unknown errors
-        # This is safer than defaulting to fatal, as retry is harmless
-        return True
+        return classify_error(error)
 
     def _build_iteration_history(self, run_id: str, current_iteration: int) -> list[dict]:
         """Build summary of previous iterations for pattern recognition.
@@ -832,6 +941,13 @@ class Ralph2Runner:
 
         return history
 
+    def _retry_delay(self, attempt: int) -> float:
+        """Backoff before retrying after the given (0-based) failed attempt.
+
+        Attempts past the precomputed schedule reuse its last delay.
+        """
+        return self._retry_delays[min(attempt, len(self._retry_delays) - 1)]
+
     async def _run_planner_with_retry(
         self, ctx: IterationContext, human_messages: List[str], max_retries: int = 3
     ) -> Tuple[Optional[dict], Optional[Exception]]:
@@ -874,9 +990,9 @@ class Ralph2Runner:
 
                 # Recoverable error - retry with backoff
                 if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1, 2, 4 seconds
+                    wait_time = self._retry_delay(attempt)
                     print(f"   ⚠️  Planner attempt {attempt + 1} failed: {e}")
-                    print(f"   ⏳ Retrying in {wait_time}s...")
+                    print(f"   ⏳ Retrying in {wait_time:.1f}s...")
                     await asyncio.sleep(wait_time)
 
         print(f"   ❌ Planner failed after {max_retries} attempts")
@@ -1101,9 +1217,9 @@ class Ralph2Runner:
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1, 2, 4 seconds
+                    wait_time = self._retry_delay(attempt)
                     print(f"   ⚠️  Verifier attempt {attempt + 1} failed: {e}")
-                    print(f"   ⏳ Retrying in {wait_time}s...")
+                    print(f"   ⏳ Retrying in {wait_time:.1f}s...")
                     await asyncio.sleep(wait_time)
 
         # All retries failed - return the last error
@@ -2,13 +2,68 @@
 
 import sqlite3
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from datetime import datetime
 import json
 from contextlib import contextmanager
 
 from .models import Run, Iteration, AgentOutput, HumanInput
 
+# Bump when _SCHEMA_SQL or the migrations in _init_schema change
+_SCHEMA_VERSION = 2
+
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id TEXT PRIMARY KEY,
+        spec_path TEXT NOT NULL,
+        spec_content TEXT NOT NULL,
+        status TEXT NOT NULL,
+        config TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        ended_at TEXT,
+        root_work_item_id TEXT,
+        milestone_branch TEXT
+    );
+
+    -- Lets get_latest_run/list_runs walk the index instead of sorting the table
+    CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at DESC);
+
+    CREATE TABLE IF NOT EXISTS iterations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        number INTEGER NOT NULL,
+        intent TEXT NOT NULL,
+        outcome TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        ended_at TEXT,
+        FOREIGN KEY (run_id) REFERENCES runs(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS agent_outputs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        iteration_id INTEGER NOT NULL,
+        agent_type TEXT NOT NULL,
+        raw_output_path TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        FOREIGN KEY (iteration_id) REFERENCES iterations(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS human_inputs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        input_type TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        consumed_at TEXT,
+        FOREIGN KEY (run_id) REFERENCES runs(id)
+    );
+"""
+
+_INSERT_RUN_SQL = """
+    INSERT INTO runs (id, spec_path, spec_content, status, config, started_at, ended_at, root_work_item_id, milestone_branch)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class Ralph2DB:
     """Manages SQLite database for Ralph2 state."""
@@ -18,11 +73,15 @@ class Ralph2DB:
         Initialize database connection and ensure schema exists.
 
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file, or a "file:" URI
+                (e.g. "file:name?mode=memory&cache=shared" for a shared
+                in-memory database)
         """
         self.db_path = db_path
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(db_path)
+        is_uri = db_path.startswith("file:")
+        if not is_uri:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, uri=is_uri)
         self.conn.row_factory = sqlite3.Row
         self._in_transaction = False
         self._transaction_depth = 0
@@ -30,75 +89,27 @@ class Ralph2DB:
         self._init_schema()
 
     def _init_schema(self):
-        """Create database schema if it doesn't exist."""
-        cursor = self.conn.cursor()
+        """Create database schema if it doesn't exist.
 
-        # Runs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS runs (
-                id TEXT PRIMARY KEY,
-                spec_path TEXT NOT NULL,
-                spec_content TEXT NOT NULL,
-                status TEXT NOT NULL,
-                config TEXT NOT NULL,
-                started_at TEXT NOT NULL,
-                ended_at TEXT,
-                root_work_item_id TEXT,
-                milestone_branch TEXT
-            )
-        """)
-
-        # Iterations table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS iterations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                run_id TEXT NOT NULL,
-                number INTEGER NOT NULL,
-                intent TEXT NOT NULL,
-                outcome TEXT NOT NULL,
-                started_at TEXT NOT NULL,
-                ended_at TEXT,
-                FOREIGN KEY (run_id) REFERENCES runs(id)
-            )
-        """)
-
-        # Agent outputs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS agent_outputs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                iteration_id INTEGER NOT NULL,
-                agent_type TEXT NOT NULL,
-                raw_output_path TEXT NOT NULL,
-                summary TEXT NOT NULL,
-                FOREIGN KEY (iteration_id) REFERENCES iterations(id)
-            )
-        """)
+        The schema version is recorded in PRAGMA user_version, so databases
+        that are already current skip DDL and migration probes entirely.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= _SCHEMA_VERSION:
+            return
 
-        # Human inputs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS human_inputs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                run_id TEXT NOT NULL,
-                input_type TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                consumed_at TEXT,
-                FOREIGN KEY (run_id) REFERENCES runs(id)
-            )
-        """)
+        cursor.executescript(_SCHEMA_SQL)
 
-        # Migration: Add root_work_item_id column to runs table if it doesn't exist
+        # Migrations for databases created before these columns existed
         cursor.execute("PRAGMA table_info(runs)")
         columns = [row[1] for row in cursor.fetchall()]
         if "root_work_item_id" not in columns:
             cursor.execute("ALTER TABLE runs ADD COLUMN root_work_item_id TEXT")
-
-        # Migration: Add milestone_branch column to runs table if it doesn't exist
-        cursor.execute("PRAGMA table_info(runs)")
-        columns = [row[1] for row in cursor.fetchall()]
         if "milestone_branch" not in columns:
             cursor.execute("ALTER TABLE runs ADD COLUMN milestone_branch TEXT")
 
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         self.conn.commit()
 
     @contextmanager
@@ -207,13 +218,19 @@ class Ralph2DB:
             milestone_branch=row["milestone_branch"] if "milestone_branch" in row.keys() else None
         )
 
-    def create_run(self, run: Run) -> Run:
-        """Create a new run."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO runs (id, spec_path, spec_content, status, config, started_at, ended_at, root_work_item_id, milestone_branch)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    def _run_to_params(self, run: Run) -> tuple:
+        """
+        Convert a Run object to the parameter tuple for an INSERT into runs.
+
+        Column order matches _INSERT_RUN_SQL.
+
+        Args:
+            run: The Run to convert
+
+        Returns:
+            A tuple of column values ready for execute()/executemany()
+        """
+        return (
             run.id,
             run.spec_path,
             run.spec_content,
@@ -223,10 +240,36 @@ class Ralph2DB:
             run.ended_at.isoformat() if run.ended_at else None,
             run.root_work_item_id,
             run.milestone_branch
-        ))
+        )
+
+    def create_run(self, run: Run) -> Run:
+        """Create a new run."""
+        return self.create_runs([run])[0]
+
+    def create_runs(self, runs: Iterable[Run]) -> List[Run]:
+        """
+        Create several runs with a single executemany() and one commit.
+
+        The batch is all-or-nothing: outside a transaction, a failing row
+        rolls back the rows inserted before it.
+
+        Args:
+            runs: The Run objects to insert
+
+        Returns:
+            The inserted Run objects, in order
+        """
+        runs = list(runs)
+        cursor = self.conn.cursor()
+        try:
+            cursor.executemany(_INSERT_RUN_SQL, [self._run_to_params(run) for run in runs])
+        except sqlite3.Error:
+            if self._should_auto_commit():
+                self.conn.rollback()
+            raise
         if self._should_auto_commit():
             self.conn.commit()
-        return run
+        return runs
 
     def get_run(self, run_id: str) -> Optional[Run]:
         """Get a run by ID."""
@@ -573,3 +616,16 @@ class Ralph2DB:
             pass
         finally:
             self._closed = True
+
+    def __enter__(self) -> "Ralph2DB":
+        """Return self so the database can be used in a with-statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        """Close the connection on exit.
+
+        Returns:
+            False (does not suppress exceptions)
+        """
+        self.close()
+        return False
@@ -1,8 +1,8 @@
 """Data models for Ralph2 state management."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Optional
 import json
 
 
@@ -19,18 +19,18 @@ class Run:
     root_work_item_id: Optional[str] = None
     milestone_branch: Optional[str] = None  # Feature branch for milestone isolation
 
+    # Field names, resolved once after the class is built (see below)
+    _FIELDS: ClassVar[tuple] = ()
+
     def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "spec_path": self.spec_path,
-            "spec_content": self.spec_content,
-            "status": self.status,
-            "config": json.dumps(self.config),
-            "started_at": self.started_at.isoformat(),
-            "ended_at": self.ended_at.isoformat() if self.ended_at else None,
-            "root_work_item_id": self.root_work_item_id,
-            "milestone_branch": self.milestone_branch,
-        }
+        result = {name: getattr(self, name) for name in self._FIELDS}
+        result["config"] = json.dumps(self.config)
+        result["started_at"] = self.started_at.isoformat()
+        result["ended_at"] = self.ended_at.isoformat() if self.ended_at else None
+        return result
+
+
+Run._FIELDS = tuple(f.name for f in fields(Run))
 
 
 @dataclass
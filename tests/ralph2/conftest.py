@@ -0,0 +1,134 @@
+"""Shared fixtures for the ralph2 test suite."""
+
+import shutil
+import subprocess
+from collections import namedtuple
+
+import pytest
+
+
+# After `git init`, configuring the identity and `trc init` don't depend on
+# each other, so they run concurrently. The two `git config` writes stay in one
+# chain because concurrent writers contend for .git/config.lock.
+_SETUP_SCRIPTS = (
+    "git config user.email test@example.com && git config user.name 'Test User'",
+    "trc init",
+)
+
+_COMMIT_SCRIPT = "git add . && git commit -q -m 'Initial commit'"
+
+
+def _run_script(cwd, script):
+    """Run a `&&`-chained shell script, failing on the first failing step."""
+    subprocess.run(["sh", "-c", script], cwd=cwd, check=True, capture_output=True)
+
+
+def _run_scripts_concurrently(cwd, scripts):
+    """Run independent shell scripts in parallel and fail if any of them fails."""
+    procs = [
+        subprocess.Popen(["sh", "-c", script], cwd=cwd,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        for script in scripts
+    ]
+    for script, proc in zip(scripts, procs):
+        _, stderr = proc.communicate()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, script, stderr=stderr)
+
+
+@pytest.fixture(autouse=True)
+def ralph2_home(tmp_path, monkeypatch):
+    """Give every test its own RALPH2_HOME so project state never touches ~/.ralph2.
+
+    Tests never share a state directory, which also keeps them safe to run
+    in parallel (e.g. under pytest-xdist).
+    """
+    home = tmp_path / ".ralph2"
+    monkeypatch.setenv("RALPH2_HOME", str(home))
+    return home
+
+
+@pytest.fixture(scope="session")
+def template_project(tmp_path_factory):
+    """Build the git + trace project once per session; temp_project hands out copies."""
+    project_root = tmp_path_factory.mktemp("template")
+
+    # Initialize git, then configure it and initialize trace side by side
+    subprocess.run(["git", "init", "-q"], cwd=project_root, check=True, capture_output=True)
+    _run_scripts_concurrently(project_root, _SETUP_SCRIPTS)
+
+    # Create a Ralph2file
+    ralph2file = project_root / "Ralph2file"
+    ralph2file.write_text("# Test Spec\n\nThis is a test specification.")
+
+    # Commit initial state
+    _run_script(project_root, _COMMIT_SCRIPT)
+
+    return project_root
+
+
+@pytest.fixture
+def temp_project(tmp_path, template_project):
+    """Create a temporary project directory with git and trace initialized."""
+    project_root = tmp_path / "project"
+    shutil.copytree(template_project, project_root)
+    return project_root
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with one empty commit on main and return its path."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "t@t")
+    git("config", "user.name", "t")
+    git("commit", "-q", "--allow-empty", "-m", "init")
+    return repo
+
+
+CompletedProcessLite = namedtuple("CompletedProcessLite", ["returncode", "stdout", "stderr"])
+
+_GIT_OK = CompletedProcessLite(0, "", "")
+
+
+class GitCmdRecorder:
+    """Callable stand-in for ralph2.git._run_git_command that records each command.
+
+    Every git command is recorded as a tuple and answered from `plan` instead
+    of running git. `plan` maps a command (list of str) to a
+    (returncode, stdout, stderr) tuple; without one every command succeeds
+    with empty output.
+    """
+
+    __slots__ = ("calls", "plan")
+
+    def __init__(self, plan=None):
+        self.calls = []
+        self.plan = plan
+
+    def __call__(self, cmd, cwd=None):
+        self.calls.append(tuple(cmd))
+        if self.plan is None:
+            return _GIT_OK
+        return CompletedProcessLite(*self.plan(cmd))
+
+    def has(self, *tokens) -> bool:
+        """True if any recorded command contains all of the given arguments."""
+        return any(all(t in call for t in tokens) for call in self.calls)
+
+    def count(self, *tokens) -> int:
+        """Number of recorded commands containing all of the given arguments."""
+        return sum(all(t in call for t in tokens) for call in self.calls)
+
+
+@pytest.fixture
+def git_cmds(monkeypatch):
+    """Replace ralph2.git._run_git_command with a GitCmdRecorder and return it."""
+    recorder = GitCmdRecorder()
+    monkeypatch.setattr("ralph2.git._run_git_command", recorder)
+    return recorder
@@ -166,9 +166,9 @@ class TestMergeBranchTargetBranch:
             elif 'merge' in cmd:
                 result.returncode = 1
                 result.stderr = "CONFLICT in file.py"
-            elif 'status' in cmd:
+            elif 'diff' in cmd:
                 result.returncode = 0
-                result.stdout = "UU file.py"
+                result.stdout = "file.py\n"
             else:
                 result.returncode = 0
             result.stdout = getattr(result, 'stdout', "")
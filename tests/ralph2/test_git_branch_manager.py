@@ -64,11 +64,11 @@ class TestGitBranchManager:
                 manager.__enter__()
 
         # Verify branch creation
-        branch_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and 'ralph2/ralph-test1' in ' '.join(cmd)]
+        branch_cmds = [cmd for cmd in git_commands if 'branch' in cmd and 'ralph2/ralph-test1' in cmd]
         assert len(branch_cmds) > 0, f"Should create branch, commands: {git_commands}"
 
         # Verify worktree creation
-        worktree_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'add' in ' '.join(cmd)]
+        worktree_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'add' in cmd]
         assert len(worktree_cmds) > 0, f"Should create worktree, commands: {git_commands}"
 
     def test_exit_cleans_up_worktree_and_branch(self):
@@ -93,11 +93,11 @@ class TestGitBranchManager:
                 manager.__exit__(None, None, None)
 
         # Verify worktree removal
-        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
+        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'remove' in cmd]
         assert len(worktree_remove_cmds) > 0, "Should remove worktree on exit"
 
         # Verify branch deletion
-        branch_delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
+        branch_delete_cmds = [cmd for cmd in git_commands if 'branch' in cmd and '-D' in cmd]
         assert len(branch_delete_cmds) > 0, "Should delete branch on exit"
 
     def test_exit_cleans_up_on_exception(self):
@@ -123,7 +123,7 @@ class TestGitBranchManager:
                 manager.__exit__(ValueError, ValueError("test error"), None)
 
         # Cleanup should still happen
-        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
+        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'remove' in cmd]
         assert len(worktree_remove_cmds) > 0, "Should remove worktree even on exception"
 
     def test_cleanup_when_branch_exists_but_worktree_fails(self):
@@ -137,10 +137,10 @@ class TestGitBranchManager:
             result = MagicMock()
 
             # Branch creation succeeds
-            if 'branch' in ' '.join(cmd) and '-D' not in cmd:
+            if 'branch' in cmd and '-D' not in cmd:
                 result.returncode = 0
             # Worktree creation fails
-            elif 'worktree' in ' '.join(cmd) and 'add' in ' '.join(cmd):
+            elif 'worktree' in cmd and 'add' in cmd:
                 result.returncode = 1
                 result.stderr = "fatal: worktree failed"
             else:
@@ -160,7 +160,7 @@ class TestGitBranchManager:
                     manager.__enter__()
 
         # Verify branch was cleaned up after worktree failure
-        branch_delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
+        branch_delete_cmds = [cmd for cmd in git_commands if 'branch' in cmd and '-D' in cmd]
         assert len(branch_delete_cmds) > 0, "Should delete branch when worktree creation fails"
 
     def test_merge_to_main_method(self):
@@ -183,8 +183,8 @@ class TestGitBranchManager:
                 success, error = manager.merge_to_main()
 
         # Verify checkout main and merge commands
-        checkout_cmds = [cmd for cmd in git_commands if 'checkout' in ' '.join(cmd) and 'main' in ' '.join(cmd)]
-        merge_cmds = [cmd for cmd in git_commands if 'merge' in ' '.join(cmd)]
+        checkout_cmds = [cmd for cmd in git_commands if 'checkout' in cmd and 'main' in cmd]
+        merge_cmds = [cmd for cmd in git_commands if 'merge' in cmd]
 
         assert len(checkout_cmds) > 0, "Should checkout main"
         assert len(merge_cmds) > 0, "Should merge feature branch"
@@ -197,7 +197,7 @@ class TestGitBranchManager:
         def mock_run(cmd, *args, **kwargs):
             result = MagicMock()
 
-            if 'merge' in ' '.join(cmd):
+            if 'merge' in cmd:
                 result.returncode = 1
                 result.stderr = "CONFLICT: merge conflict"
             else:
@@ -365,7 +365,7 @@ class TestMergeToMainBranches:
 
         def mock_run(cmd, *args, **kwargs):
             result = MagicMock()
-            if 'checkout' in ' '.join(cmd):
+            if 'checkout' in cmd:
                 result.returncode = 1
                 result.stderr = "error: pathspec 'main' did not match any file(s) known to git"
             else:
@@ -389,7 +389,7 @@ class TestMergeToMainBranches:
 
         def mock_run(cmd, *args, **kwargs):
             result = MagicMock()
-            if 'branch' in ' '.join(cmd) and '-D' not in cmd:
+            if 'branch' in cmd and '-D' not in cmd:
                 result.returncode = 1
                 result.stderr = "fatal: A branch named 'ralph2/ralph-test1' already exists."
             else:
@@ -419,7 +419,7 @@ class TestCleanupLoggingOnFailure:
         def mock_run(cmd, *args, **kwargs):
             result = MagicMock()
             # Worktree removal fails
-            if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd):
+            if 'worktree' in cmd and 'remove' in cmd:
                 result.returncode = 1
                 result.stderr = "fatal: worktree removal failed"
             else:
@@ -454,10 +454,10 @@ class TestCleanupLoggingOnFailure:
         def mock_run(cmd, *args, **kwargs):
             result = MagicMock()
             # Worktree removal succeeds
-            if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd):
+            if 'worktree' in cmd and 'remove' in cmd:
                 result.returncode = 0
             # Branch deletion fails
-            elif 'branch' in ' '.join(cmd) and '-D' in cmd:
+            elif 'branch' in cmd and '-D' in cmd:
                 result.returncode = 1
                 result.stderr = "error: branch deletion failed"
             else:
@@ -492,14 +492,14 @@ class TestCleanupLoggingOnFailure:
             result = MagicMock()
 
             # Branch creation succeeds
-            if 'branch' in ' '.join(cmd) and '-D' not in cmd:
+            if 'branch' in cmd and '-D' not in cmd:
                 result.returncode = 0
             # Worktree creation fails
-            elif 'worktree' in ' '.join(cmd) and 'add' in ' '.join(cmd):
+            elif 'worktree' in cmd and 'add' in cmd:
                 result.returncode = 1
                 result.stderr = "fatal: worktree failed"
             # Branch cleanup ALSO fails (this is the edge case)
-            elif 'branch' in ' '.join(cmd) and '-D' in cmd:
+            elif 'branch' in cmd and '-D' in cmd:
                 result.returncode = 1
                 result.stderr = "error: Cannot delete branch"
             else:
@@ -553,8 +553,8 @@ class TestCleanupMethod:
                 result = manager.cleanup()
 
         # Cleanup should have been called
-        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
-        branch_delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
+        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'remove' in cmd]
+        branch_delete_cmds = [cmd for cmd in git_commands if 'branch' in cmd and '-D' in cmd]
 
         assert len(worktree_remove_cmds) > 0, "Should remove worktree"
         assert len(branch_delete_cmds) > 0, "Should delete branch"
@@ -610,7 +610,7 @@ class TestExitWithNoWorktree:
                 result = manager.__exit__(None, None, None)
 
         # No cleanup commands should have been issued
-        worktree_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd)]
+        worktree_cmds = [cmd for cmd in git_commands if 'worktree' in cmd]
         assert len(worktree_cmds) == 0, "Should not call cleanup when worktree not created"
         assert result is False, "__exit__ should return False (not suppress exceptions)"
 
@@ -639,7 +639,7 @@ class TestGitBranchManagerIntegration:
                     assert manager.worktree_path is not None
 
                 # After context exits, cleanup should have happened
-                worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
+                worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'remove' in cmd]
                 assert len(worktree_remove_cmds) > 0, "Should clean up worktree after context exit"
 
 
@@ -80,10 +80,7 @@ class TestGenerateUniqueBranchName:
         """Test basic branch name generation."""
         from ralph2.runner import generate_unique_branch_name
 
-        def mock_branch_exists(branch_name, cwd):
-            return False  # Branch doesn't exist
-
-        with patch('ralph2.runner.branch_exists', side_effect=mock_branch_exists):
+        with patch('ralph2.runner._existing_branch_names', return_value=set()):
             result = generate_unique_branch_name("my-feature", "/mock/repo")
 
         assert result == "feature/my-feature"
@@ -94,10 +91,7 @@ class TestGenerateUniqueBranchName:
 
         existing_branches = {"feature/my-feature", "feature/my-feature-2"}
 
-        def mock_branch_exists(branch_name, cwd):
-            return branch_name in existing_branches
-
-        with patch('ralph2.runner.branch_exists', side_effect=mock_branch_exists):
+        with patch('ralph2.runner._existing_branch_names', return_value=existing_branches):
             result = generate_unique_branch_name("my-feature", "/mock/repo")
 
         assert result == "feature/my-feature-3"
@@ -106,10 +100,7 @@ class TestGenerateUniqueBranchName:
         """Test that explicit branch is used as-is."""
         from ralph2.runner import generate_unique_branch_name
 
-        def mock_branch_exists(branch_name, cwd):
-            return False
-
-        with patch('ralph2.runner.branch_exists', side_effect=mock_branch_exists):
+        with patch('ralph2.runner._existing_branch_names', return_value=set()):
             result = generate_unique_branch_name("my-feature", "/mock/repo", explicit_branch="feature/custom")
 
         assert result == "feature/custom"
@@ -118,10 +109,7 @@ class TestGenerateUniqueBranchName:
         """Test that explicit branch is reused even if it exists."""
         from ralph2.runner import generate_unique_branch_name
 
-        def mock_branch_exists(branch_name, cwd):
-            return branch_name == "feature/custom"
-
-        with patch('ralph2.runner.branch_exists', side_effect=mock_branch_exists):
+        with patch('ralph2.runner._existing_branch_names', return_value={"feature/custom"}):
             result = generate_unique_branch_name("my-feature", "/mock/repo", explicit_branch="feature/custom")
 
         # Should reuse existing branch without error
@@ -131,33 +119,27 @@ class TestGenerateUniqueBranchName:
 class TestBranchExists:
     """Test branch_exists helper function."""
 
-    def test_branch_exists_returns_true_when_exists(self):
+    @pytest.fixture
+    def repo_with_branch(self, git_repo):
+        """The shared git repository plus a feature/my-feature branch."""
+        import subprocess
+
+        subprocess.run(["git", "branch", "feature/my-feature"], cwd=git_repo, check=True)
+        return str(git_repo)
+
+    def test_branch_exists_returns_true_when_exists(self, repo_with_branch):
         """Test branch_exists returns True for existing branch."""
         from ralph2.runner import branch_exists
 
-        def mock_run_git(cmd, **kwargs):
-            result = MagicMock()
-            result.returncode = 0
-            result.stdout = "feature/my-feature\n"
-            return result
-
-        with patch('subprocess.run', side_effect=mock_run_git):
-            result = branch_exists("feature/my-feature", "/mock/repo")
+        result = branch_exists("feature/my-feature", repo_with_branch)
 
         assert result is True
 
-    def test_branch_exists_returns_false_when_not_exists(self):
+    def test_branch_exists_returns_false_when_not_exists(self, repo_with_branch):
         """Test branch_exists returns False for non-existing branch."""
         from ralph2.runner import branch_exists
 
-        def mock_run_git(cmd, **kwargs):
-            result = MagicMock()
-            result.returncode = 1
-            result.stdout = ""
-            return result
-
-        with patch('subprocess.run', side_effect=mock_run_git):
-            result = branch_exists("feature/nonexistent", "/mock/repo")
+        result = branch_exists("feature/nonexistent", repo_with_branch)
 
         assert result is False
 
@@ -3,7 +3,9 @@
 This tests the foundational model/DB changes for milestone branch isolation.
 """
 
+import sqlite3
 import tempfile
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 
@@ -13,6 +15,39 @@ from ralph2.state.db import Ralph2DB
 from ralph2.state.models import Run
 
 
+# runs table as it existed before the milestone_branch column was added
+_LEGACY_RUNS_DDL = """
+    CREATE TABLE runs (
+        id TEXT PRIMARY KEY,
+        spec_path TEXT NOT NULL,
+        spec_content TEXT NOT NULL,
+        status TEXT NOT NULL,
+        config TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        ended_at TEXT,
+        root_work_item_id TEXT
+    )
+"""
+
+# Reused verbatim so sqlite3's statement cache keeps the compiled form
+_SELECT_RUN_BY_ID = "SELECT * FROM runs WHERE id = ?"
+
+
+@pytest.fixture
+def db():
+    """Create a temporary database with named-column row access."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with Ralph2DB(str(Path(tmpdir) / "test.db")) as db:
+            db.conn.row_factory = sqlite3.Row
+            yield db
+
+
+def _create_and_fetch_branch(db: Ralph2DB, run: Run):
+    """Store a run through create_run() and read back its milestone_branch column."""
+    db.create_run(run)
+    return db.conn.execute(_SELECT_RUN_BY_ID, (run.id,)).fetchone()["milestone_branch"]
+
+
 class TestRunModelMilestoneBranch:
     """Tests for milestone_branch field on Run dataclass."""
 
@@ -76,18 +111,12 @@ class TestRunModelMilestoneBranch:
 class TestRalph2DBMilestoneBranchColumn:
     """Tests for milestone_branch column in runs table."""
 
-    def test_runs_table_has_milestone_branch_column(self):
+    def test_runs_table_has_milestone_branch_column(self, db):
         """Test that runs table has milestone_branch column after schema init."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                cursor = db.conn.cursor()
-                cursor.execute("PRAGMA table_info(runs)")
-                columns = [row[1] for row in cursor.fetchall()]
-                assert "milestone_branch" in columns
-            finally:
-                db.close()
+        cursor = db.conn.cursor()
+        cursor.execute("PRAGMA table_info(runs)")
+        columns = [row[1] for row in cursor.fetchall()]
+        assert "milestone_branch" in columns
 
     def test_milestone_branch_column_migration(self):
         """Test that existing databases get milestone_branch column via migration."""
@@ -95,330 +124,230 @@ class TestRalph2DBMilestoneBranchColumn:
             db_path = str(Path(tmpdir) / "test.db")
 
             # Create a database without milestone_branch column (simulate old schema)
-            import sqlite3
             conn = sqlite3.connect(db_path)
-            conn.execute("""
-                CREATE TABLE runs (
-                    id TEXT PRIMARY KEY,
-                    spec_path TEXT NOT NULL,
-                    spec_content TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    config TEXT NOT NULL,
-                    started_at TEXT NOT NULL,
-                    ended_at TEXT,
-                    root_work_item_id TEXT
-                )
-            """)
+            conn.execute(_LEGACY_RUNS_DDL)
             conn.commit()
             conn.close()
 
             # Now open with Ralph2DB - should migrate
-            db = Ralph2DB(db_path)
-            try:
+            with Ralph2DB(db_path) as db:
                 cursor = db.conn.cursor()
                 cursor.execute("PRAGMA table_info(runs)")
                 columns = [row[1] for row in cursor.fetchall()]
                 assert "milestone_branch" in columns
-            finally:
-                db.close()
 
 
 class TestRalph2DBCreateRunWithMilestoneBranch:
     """Tests for create_run() with milestone_branch."""
 
-    def test_create_run_with_milestone_branch(self):
+    def test_create_run_with_milestone_branch(self, db):
         """Test creating a run with milestone_branch stores it correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-create",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/test-create",
-                )
-                db.create_run(run)
-
-                # Verify directly in DB
-                cursor = db.conn.cursor()
-                cursor.execute("SELECT milestone_branch FROM runs WHERE id = ?", (run.id,))
-                row = cursor.fetchone()
-                assert row[0] == "feature/test-create"
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-test-create",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/test-create",
+        )
+        assert _create_and_fetch_branch(db, run) == "feature/test-create"
 
-    def test_create_run_without_milestone_branch(self):
+    def test_create_run_without_milestone_branch(self, db):
         """Test creating a run without milestone_branch stores NULL."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-no-branch",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                )
-                db.create_run(run)
-
-                # Verify directly in DB
-                cursor = db.conn.cursor()
-                cursor.execute("SELECT milestone_branch FROM runs WHERE id = ?", (run.id,))
-                row = cursor.fetchone()
-                assert row[0] is None
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-test-no-branch",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+        )
+        assert _create_and_fetch_branch(db, run) is None
 
 
 class TestRalph2DBGetRunWithMilestoneBranch:
     """Tests for get_run() returning milestone_branch."""
 
-    def test_get_run_returns_milestone_branch(self):
+    def test_get_run_returns_milestone_branch(self, db):
         """Test that get_run returns Run with milestone_branch populated."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-get",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/get-test",
-                )
-                db.create_run(run)
-
-                result = db.get_run(run.id)
-                assert result is not None
-                assert result.milestone_branch == "feature/get-test"
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-test-get",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/get-test",
+        )
+        db.create_run(run)
+
+        result = db.get_run(run.id)
+        assert result is not None
+        assert result.milestone_branch == "feature/get-test"
 
-    def test_get_run_returns_none_milestone_branch(self):
+    def test_get_run_returns_none_milestone_branch(self, db):
         """Test that get_run handles NULL milestone_branch correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-get-null",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                )
-                db.create_run(run)
-
-                result = db.get_run(run.id)
-                assert result is not None
-                assert result.milestone_branch is None
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-test-get-null",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+        )
+        db.create_run(run)
+
+        result = db.get_run(run.id)
+        assert result is not None
+        assert result.milestone_branch is None
 
-    def test_get_latest_run_returns_milestone_branch(self):
+    def test_get_latest_run_returns_milestone_branch(self, db):
         """Test that get_latest_run returns Run with milestone_branch."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-latest",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/latest-test",
-                )
-                db.create_run(run)
-
-                result = db.get_latest_run()
-                assert result is not None
-                assert result.milestone_branch == "feature/latest-test"
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-test-latest",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/latest-test",
+        )
+        db.create_run(run)
 
-    def test_list_runs_returns_milestone_branch(self):
+        result = db.get_latest_run()
+        assert result is not None
+        assert result.milestone_branch == "feature/latest-test"
+
+    def test_list_runs_returns_milestone_branch(self, db):
         """Test that list_runs returns Runs with milestone_branch."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-list",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/list-test",
-                )
-                db.create_run(run)
-
-                results = db.list_runs()
-                assert len(results) == 1
-                assert results[0].milestone_branch == "feature/list-test"
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-test-list",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/list-test",
+        )
+        db.create_run(run)
+
+        results = db.list_runs()
+        assert len(results) == 1
+        assert results[0].milestone_branch == "feature/list-test"
 
 
 class TestRalph2DBUpdateMilestoneBranch:
     """Tests for update_run_milestone_branch() method."""
 
-    def test_update_run_milestone_branch_method_exists(self):
+    def test_update_run_milestone_branch_method_exists(self, db):
         """Test that update_run_milestone_branch method exists."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                assert hasattr(db, "update_run_milestone_branch")
-                assert callable(getattr(db, "update_run_milestone_branch"))
-            finally:
-                db.close()
-
-    def test_update_run_milestone_branch_updates_value(self):
+        assert hasattr(db, "update_run_milestone_branch")
+        assert callable(getattr(db, "update_run_milestone_branch"))
+
+    def test_update_run_milestone_branch_updates_value(self, db):
         """Test that update_run_milestone_branch updates the value."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                # Create a run without milestone_branch
-                run = Run(
-                    id="ralph2-test-update",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                )
-                db.create_run(run)
-
-                # Update the milestone_branch
-                db.update_run_milestone_branch(run.id, "feature/updated-branch")
-
-                # Verify the update
-                result = db.get_run(run.id)
-                assert result.milestone_branch == "feature/updated-branch"
-            finally:
-                db.close()
-
-    def test_update_run_milestone_branch_respects_transactions(self):
+        # Create a run without milestone_branch
+        run = Run(
+            id="ralph2-test-update",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+        )
+        db.create_run(run)
+
+        # Update the milestone_branch
+        db.update_run_milestone_branch(run.id, "feature/updated-branch")
+
+        # Verify the update
+        result = db.get_run(run.id)
+        assert result.milestone_branch == "feature/updated-branch"
+
+    def test_update_run_milestone_branch_respects_transactions(self, db):
         """Test that update_run_milestone_branch respects transaction boundaries."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-txn",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                )
-                db.create_run(run)
-
-                # Update within a transaction
-                with db.transaction():
-                    db.update_run_milestone_branch(run.id, "feature/txn-branch")
-
-                # Verify update persisted
-                result = db.get_run(run.id)
-                assert result.milestone_branch == "feature/txn-branch"
-            finally:
-                db.close()
-
-    def test_update_run_milestone_branch_auto_commits(self):
+        run = Run(
+            id="ralph2-test-txn",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+        )
+        db.create_run(run)
+
+        # Update within a transaction
+        with db.transaction():
+            db.update_run_milestone_branch(run.id, "feature/txn-branch")
+
+        # Verify update persisted
+        result = db.get_run(run.id)
+        assert result.milestone_branch == "feature/txn-branch"
+
+    def test_update_run_milestone_branch_auto_commits(self, db):
         """Test that update_run_milestone_branch auto-commits outside transaction."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-auto",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                )
-                db.create_run(run)
-
-                # Update outside transaction
-                db.update_run_milestone_branch(run.id, "feature/auto-commit")
-
-                # Open a new connection to verify commit
-                db2 = Ralph2DB(db_path)
-                result = db2.get_run(run.id)
-                assert result.milestone_branch == "feature/auto-commit"
-                db2.close()
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-test-auto",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+        )
+        db.create_run(run)
+
+        # Update outside transaction
+        db.update_run_milestone_branch(run.id, "feature/auto-commit")
+
+        # Read through a separate raw connection to verify commit (no schema init)
+        with closing(sqlite3.connect(db.db_path)) as conn:
+            row = conn.execute(
+                "SELECT milestone_branch FROM runs WHERE id = ?", (run.id,)
+            ).fetchone()
+        assert row[0] == "feature/auto-commit"
 
 
 class TestRowToRunWithMilestoneBranch:
     """Tests for _row_to_run helper handling milestone_branch."""
 
-    def test_row_to_run_includes_milestone_branch(self):
+    def test_row_to_run_includes_milestone_branch(self, db):
         """Test that _row_to_run correctly parses milestone_branch."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-row-test",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/row-test",
-                )
-                db.create_run(run)
-
-                # Fetch the row directly and use helper
-                cursor = db.conn.cursor()
-                cursor.execute("SELECT * FROM runs WHERE id = ?", (run.id,))
-                row = cursor.fetchone()
+        run = Run(
+            id="ralph2-row-test",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/row-test",
+        )
+        db.create_run(run)
+
+        # Fetch the row directly and use helper
+        row = db.conn.execute(_SELECT_RUN_BY_ID, (run.id,)).fetchone()
+        assert row["milestone_branch"] == "feature/row-test"
 
-                result = db._row_to_run(row)
-                assert result.milestone_branch == "feature/row-test"
-            finally:
-                db.close()
+        result = db._row_to_run(row)
+        assert result.milestone_branch == "feature/row-test"
 
-    def test_row_to_run_handles_null_milestone_branch(self):
+    def test_row_to_run_handles_null_milestone_branch(self, db):
         """Test that _row_to_run handles NULL milestone_branch."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-row-null",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                )
-                db.create_run(run)
+        run = Run(
+            id="ralph2-row-null",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+        )
+        db.create_run(run)
 
-                cursor = db.conn.cursor()
-                cursor.execute("SELECT * FROM runs WHERE id = ?", (run.id,))
-                row = cursor.fetchone()
+        row = db.conn.execute(_SELECT_RUN_BY_ID, (run.id,)).fetchone()
+        assert row["milestone_branch"] is None
 
-                result = db._row_to_run(row)
-                assert result.milestone_branch is None
-            finally:
-                db.close()
+        result = db._row_to_run(row)
+        assert result.milestone_branch is None
 
 
 class TestBackwardCompatibility:
@@ -430,20 +359,8 @@ class TestBackwardCompatibility:
             db_path = str(Path(tmpdir) / "test.db")
 
             # Create a database and insert a run directly (simulating old data)
-            import sqlite3
             conn = sqlite3.connect(db_path)
-            conn.execute("""
-                CREATE TABLE runs (
-                    id TEXT PRIMARY KEY,
-                    spec_path TEXT NOT NULL,
-                    spec_content TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    config TEXT NOT NULL,
-                    started_at TEXT NOT NULL,
-                    ended_at TEXT,
-                    root_work_item_id TEXT
-                )
-            """)
+            conn.execute(_LEGACY_RUNS_DDL)
             conn.execute("""
                 INSERT INTO runs (id, spec_path, spec_content, status, config, started_at)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -452,13 +369,10 @@ class TestBackwardCompatibility:
             conn.close()
 
             # Now open with Ralph2DB (migration should add column)
-            db = Ralph2DB(db_path)
-            try:
+            with Ralph2DB(db_path) as db:
                 # Should be able to read the old run
                 result = db.get_run("old-run-123")
                 assert result is not None
                 assert result.id == "old-run-123"
                 # milestone_branch should be None for old runs
                 assert result.milestone_branch is None
-            finally:
-                db.close()
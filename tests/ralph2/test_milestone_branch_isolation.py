@@ -12,16 +12,33 @@ These tests cover the complete integration of milestone branch isolation:
 """
 
 import pytest
-import tempfile
 import re
 from datetime import datetime
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 
 from ralph2.state.models import Run
 from ralph2.state.db import Ralph2DB
 
 
+# Stand-ins for subprocess.CompletedProcess; only attribute access is needed
+_OK = SimpleNamespace(returncode=0, stdout="", stderr="")
+_FAIL = SimpleNamespace(returncode=1, stdout="", stderr="error")
+
+
+def _parameter_names(func):
+    """Return a function's parameter names without building an inspect.Signature."""
+    code = func.__code__
+    return code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a fresh database for one test."""
+    with Ralph2DB(str(tmp_path / "test.db")) as db:
+        yield db
+
+
 class TestBranchNameSlugification:
     """Tests for branch name generation and slugification."""
 
@@ -58,6 +75,24 @@ class TestBranchNameSlugification:
         # Should not end with hyphen after truncation
         assert not result.endswith("-")
 
+    def test_slugify_truncation_cut_on_hyphen(self):
+        """Test that a cut landing on a word boundary drops the hyphen."""
+        from ralph2.runner import slugify_spec_title
+
+        assert slugify_spec_title("Alpha Beta Gamma", max_length=11) == "alpha-beta"
+        assert slugify_spec_title("Alpha Beta Gamma", max_length=12) == "alpha-beta-g"
+
+    def test_slugify_is_memoized(self):
+        """Test that repeated titles are served from the slug cache."""
+        from ralph2.runner import slugify_spec_title
+
+        title = "Memoized Spec Title"
+        first = slugify_spec_title(title)
+        hits = slugify_spec_title.cache_info().hits
+
+        assert slugify_spec_title(title) == first == "memoized-spec-title"
+        assert slugify_spec_title.cache_info().hits == hits + 1
+
     def test_slugify_strips_leading_trailing_hyphens(self):
         """Test that leading/trailing hyphens are removed."""
         from ralph2.runner import slugify_spec_title
@@ -66,6 +101,13 @@ class TestBranchNameSlugification:
         assert not result.startswith("-")
         assert not result.endswith("-")
 
+    def test_slugify_handles_tabs_and_non_ascii(self):
+        """Test that any whitespace becomes a hyphen and non-ASCII chars are dropped."""
+        from ralph2.runner import slugify_spec_title
+
+        result = slugify_spec_title("Café\tMenü\n Update")
+        assert result == "caf-men-update"
+
     def test_slugify_handles_empty_string(self):
         """Test handling of empty string."""
         from ralph2.runner import slugify_spec_title
@@ -104,6 +146,13 @@ class TestBranchNameGeneration:
         result = f"feature/{slug}"
         assert result == "feature/spec"
 
+    def test_extract_spec_title_skips_subheadings_and_trims(self):
+        """Test that the first H1 is found past other lines and surrounding whitespace is trimmed."""
+        from ralph2.runner import _extract_spec_title
+
+        spec_content = "Intro\n## Not This\n#NoSpace\n   #   Real Title  \r\n# Second"
+        assert _extract_spec_title(spec_content) == "Real Title"
+
     def test_generate_branch_name_feature_prefix(self):
         """Test that branch names get feature/ prefix."""
         from ralph2.runner import _extract_spec_title, slugify_spec_title
@@ -122,9 +171,8 @@ class TestUniqueBranchNaming:
         """Test branch name when no conflict exists."""
         from ralph2.runner import generate_unique_branch_name
 
-        # Mock git branch check to return "not exists"
-        with patch('ralph2.runner.branch_exists') as mock_exists:
-            mock_exists.return_value = False
+        # Mock the branch listing to report no existing branches
+        with patch('ralph2.runner._existing_branch_names', return_value=set()):
             result = generate_unique_branch_name("test", "/path/to/repo")
             assert result == "feature/test"
 
@@ -132,9 +180,7 @@ class TestUniqueBranchNaming:
         """Test branch name when first name conflicts."""
         from ralph2.runner import generate_unique_branch_name
 
-        with patch('ralph2.runner.branch_exists') as mock_exists:
-            # First call: exists, second: doesn't exist
-            mock_exists.side_effect = [True, False]
+        with patch('ralph2.runner._existing_branch_names', return_value={"feature/test"}):
             result = generate_unique_branch_name("test", "/path/to/repo")
             assert result == "feature/test-2"
 
@@ -142,11 +188,33 @@ class TestUniqueBranchNaming:
         """Test branch name when multiple conflicts exist."""
         from ralph2.runner import generate_unique_branch_name
 
-        with patch('ralph2.runner.branch_exists') as mock_exists:
-            # First 3 exist, 4th doesn't
-            mock_exists.side_effect = [True, True, True, False]
+        existing = {"feature/test", "feature/test-2", "feature/test-3"}
+        with patch('ralph2.runner._existing_branch_names', return_value=existing) as mock_list:
             result = generate_unique_branch_name("test", "/path/to/repo")
             assert result == "feature/test-4"
+            # All candidates come from a single listing
+            mock_list.assert_called_once_with("feature/test", "/path/to/repo")
+
+    def test_unique_branch_name_suffix_limit(self):
+        """Test that exhausting the suffix range raises."""
+        from ralph2.runner import generate_unique_branch_name
+
+        existing = {"feature/test"} | {f"feature/test-{n}" for n in range(2, 101)}
+        with patch('ralph2.runner._existing_branch_names', return_value=existing):
+            with pytest.raises(RuntimeError):
+                generate_unique_branch_name("test", "/path/to/repo")
+
+    def test_existing_branch_names_lists_base_and_suffixes(self, git_repo):
+        """Test that the listing matches the base name and its suffixes only."""
+        import subprocess
+        from ralph2.runner import _existing_branch_names
+
+        for name in ("feature/test", "feature/test-2", "feature/testing", "feature/other"):
+            subprocess.run(["git", "branch", name], cwd=git_repo, check=True)
+
+        assert _existing_branch_names("feature/test", str(git_repo)) == {
+            "feature/test", "feature/test-2"
+        }
 
 
 class TestBranchExistsCheck:
@@ -156,8 +224,7 @@ class TestBranchExistsCheck:
         """Test that branch_exists returns True for existing branch."""
         from ralph2.runner import branch_exists
 
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        with patch('ralph2.git.GitPlumbingSession.query', return_value="0" * 40):
             result = branch_exists("main", "/path/to/repo")
             assert result is True
 
@@ -165,11 +232,49 @@ class TestBranchExistsCheck:
         """Test that branch_exists returns False for non-existing branch."""
         from ralph2.runner import branch_exists
 
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=1)
+        with patch('ralph2.git.GitPlumbingSession.query', return_value=None):
             result = branch_exists("nonexistent", "/path/to/repo")
             assert result is False
 
+    def test_plumbing_session_reuses_one_process(self, git_repo):
+        """Test that repeated lookups share one git process and see new branches."""
+        import subprocess
+        from ralph2.git import GitPlumbingSession
+
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=git_repo, capture_output=True, text=True
+        ).stdout.strip()
+
+        session = GitPlumbingSession(str(git_repo))
+        try:
+            assert session.query("refs/heads/main") == head
+            assert session.query("refs/heads/feature/new") is None
+            pid = session._proc.pid
+
+            subprocess.run(["git", "branch", "feature/new"], cwd=git_repo, check=True)
+
+            assert session.query("refs/heads/feature/new") == head
+            assert session._proc.pid == pid
+        finally:
+            session.close()
+
+    def test_plumbing_session_outside_repo_returns_none(self, tmp_path):
+        """Test that lookups outside a git repository resolve to nothing."""
+        from ralph2.git import GitPlumbingSession
+
+        session = GitPlumbingSession(str(tmp_path))
+        try:
+            assert session.query("refs/heads/main") is None
+        finally:
+            session.close()
+
+    def test_plumbing_session_shared_per_repository(self):
+        """Test that one session is cached per working directory."""
+        from ralph2.git import get_plumbing_session
+
+        assert get_plumbing_session("/repo/a") is get_plumbing_session("/repo/a")
+        assert get_plumbing_session("/repo/a") is not get_plumbing_session("/repo/b")
+
 
 class TestMilestoneBranchCreation:
     """Tests for milestone branch creation in runner."""
@@ -181,7 +286,7 @@ class TestMilestoneBranchCreation:
         with patch('ralph2.runner.branch_exists') as mock_exists:
             mock_exists.return_value = False  # Branch doesn't exist
             with patch('subprocess.run') as mock_run:
-                mock_run.return_value = MagicMock(returncode=0)
+                mock_run.return_value = _OK
                 result = _create_milestone_branch("feature/test", "/path/to/repo")
                 assert result is True
                 # Check that git branch was called with correct args
@@ -211,88 +316,79 @@ class TestMilestoneBranchCreation:
         with patch('ralph2.runner.branch_exists') as mock_exists:
             mock_exists.return_value = False  # Branch doesn't exist
             with patch('subprocess.run') as mock_run:
-                mock_run.return_value = MagicMock(returncode=1, stderr="error")
+                mock_run.return_value = _FAIL
                 result = _create_milestone_branch("feature/test", "/path/to/repo")
                 assert result is False
 
+    def test_create_milestone_branch_real_repo(self, git_repo):
+        """Test creating and then reusing a milestone branch in a real repository."""
+        from ralph2.runner import _create_milestone_branch, branch_exists
+
+        assert _create_milestone_branch("feature/test", str(git_repo)) is True
+        assert branch_exists("feature/test", str(git_repo))
+        # Second call reuses the branch
+        assert _create_milestone_branch("feature/test", str(git_repo)) is True
+
 
 class TestRunnerMilestoneBranchIntegration:
     """Tests for milestone branch integration in runner."""
 
-    def test_runner_stores_milestone_branch_in_run(self):
+    def test_runner_stores_milestone_branch_in_run(self, db):
         """Test that runner stores milestone_branch in Run record."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-test-store",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/test-branch",
-                )
-                db.create_run(run)
-
-                retrieved = db.get_run(run.id)
-                assert retrieved is not None
-                assert retrieved.milestone_branch == "feature/test-branch"
-            finally:
-                db.close()
-
-    def test_runner_reads_milestone_branch_on_resume(self):
+        run = Run(
+            id="ralph2-test-store",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/test-branch",
+        )
+        db.create_run(run)
+
+        retrieved = db.get_run(run.id)
+        assert retrieved is not None
+        assert retrieved.milestone_branch == "feature/test-branch"
+
+    def test_runner_reads_milestone_branch_on_resume(self, db):
         """Test that runner reads milestone_branch from Run on resume."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                # Create a run with milestone_branch
-                run = Run(
-                    id="ralph2-test-resume",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/resume-branch",
-                )
-                db.create_run(run)
-
-                # Simulate resuming - get latest run
-                latest = db.get_latest_run()
-                assert latest is not None
-                assert latest.milestone_branch == "feature/resume-branch"
-            finally:
-                db.close()
-
-
+        # Create a run with milestone_branch
+        run = Run(
+            id="ralph2-test-resume",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/resume-branch",
+        )
+        db.create_run(run)
+
+        # Simulate resuming - get latest run
+        latest = db.get_latest_run()
+        assert latest is not None
+        assert latest.milestone_branch == "feature/resume-branch"
+
+
+@pytest.mark.slow
 class TestCLIBranchOption:
     """Tests for --branch CLI option."""
 
     def test_run_command_has_branch_option(self):
         """Test that run command has --branch option."""
         from ralph2.cli import run
-        import inspect
-
-        # Get the function signature
-        sig = inspect.signature(run)
-        params = sig.parameters
 
-        # Verify --branch parameter exists
-        assert 'branch' in params, "--branch option should be in run command"
+        # Read parameter names straight off the code object
+        assert 'branch' in _parameter_names(run), "--branch option should be in run command"
 
     def test_branch_option_passed_to_runner(self):
         """Test that --branch value is passed to Ralph2Runner."""
         # The CLI passes 'branch' to Ralph2Runner.__init__
         # We verify this by checking the runner accepts the parameter
         from ralph2.runner import Ralph2Runner
-        import inspect
 
-        sig = inspect.signature(Ralph2Runner.__init__)
-        params = sig.parameters
-        assert 'branch' in params, "Ralph2Runner should accept 'branch' parameter"
+        assert 'branch' in _parameter_names(Ralph2Runner.__init__), \
+            "Ralph2Runner should accept 'branch' parameter"
 
 
 class TestWorktreeFromMilestoneBranch:
@@ -303,7 +399,7 @@ class TestWorktreeFromMilestoneBranch:
         from ralph2.git import create_worktree
 
         with patch('ralph2.git._run_git_command') as mock_git:
-            mock_git.return_value = MagicMock(returncode=0, stderr="")
+            mock_git.return_value = _OK
 
             # Create worktree with base_branch
             worktree_path, branch_name = create_worktree(
@@ -313,10 +409,10 @@ class TestWorktreeFromMilestoneBranch:
                 base_branch="feature/milestone"
             )
 
-            # Verify git branch command included base_branch
-            calls = mock_git.call_args_list
-            branch_call = calls[0][0][0]  # First call, first positional arg
-            assert "feature/milestone" in branch_call
+            # Verify the git branch command included base_branch, without
+            # depending on the order the git calls were issued in
+            commands = {tuple(call.args[0]) for call in mock_git.call_args_list}
+            assert ("git", "branch", branch_name, "feature/milestone") in commands
 
 
 class TestMergeToMilestoneBranch:
@@ -327,7 +423,7 @@ class TestMergeToMilestoneBranch:
         from ralph2.git import merge_branch
 
         with patch('ralph2.git._run_git_command') as mock_git:
-            mock_git.return_value = MagicMock(returncode=0, stderr="")
+            mock_git.return_value = _OK
 
             success, error = merge_branch(
                 branch_name="ralph2/work-item",
@@ -337,67 +433,54 @@ class TestMergeToMilestoneBranch:
 
             assert success is True
             # Verify checkout was to milestone branch
-            calls = mock_git.call_args_list
-            checkout_call = calls[0][0][0]
-            assert "feature/milestone" in checkout_call
+            commands = {tuple(call.args[0]) for call in mock_git.call_args_list}
+            assert ("git", "checkout", "feature/milestone") in commands
 
 
 class TestStatusDisplayMilestoneBranch:
     """Tests for status command displaying milestone branch."""
 
-    def test_status_includes_milestone_branch(self):
+    def test_status_includes_milestone_branch(self, db):
         """Test that status command shows milestone branch."""
         # This tests the data availability, CLI output is tested elsewhere
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                run = Run(
-                    id="ralph2-status-test",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                    milestone_branch="feature/status-branch",
-                )
-                db.create_run(run)
-
-                # Verify we can retrieve milestone_branch for status display
-                latest = db.get_latest_run()
-                assert latest.milestone_branch == "feature/status-branch"
-            finally:
-                db.close()
+        run = Run(
+            id="ralph2-status-test",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+            milestone_branch="feature/status-branch",
+        )
+        db.create_run(run)
+
+        # Verify we can retrieve milestone_branch for status display
+        latest = db.get_latest_run()
+        assert latest.milestone_branch == "feature/status-branch"
 
 
 class TestBackwardCompatibilityMilestoneBranch:
     """Tests for backward compatibility with runs without milestone_branch."""
 
-    def test_runs_without_milestone_branch_work(self):
+    def test_runs_without_milestone_branch_work(self, db):
         """Test that runs created without milestone_branch continue to work."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = Ralph2DB(db_path)
-            try:
-                # Create run without milestone_branch
-                run = Run(
-                    id="ralph2-compat",
-                    spec_path="/path/to/spec",
-                    spec_content="# Test",
-                    status="running",
-                    config={},
-                    started_at=datetime.now(),
-                )
-                db.create_run(run)
-
-                retrieved = db.get_run(run.id)
-                assert retrieved is not None
-                assert retrieved.milestone_branch is None
-
-                # Runner should handle None milestone_branch gracefully
-                # (branches from main, merges to main - legacy behavior)
-            finally:
-                db.close()
+        # Create run without milestone_branch
+        run = Run(
+            id="ralph2-compat",
+            spec_path="/path/to/spec",
+            spec_content="# Test",
+            status="running",
+            config={},
+            started_at=datetime.now(),
+        )
+        db.create_run(run)
+
+        retrieved = db.get_run(run.id)
+        assert retrieved is not None
+        assert retrieved.milestone_branch is None
+
+        # Runner should handle None milestone_branch gracefully
+        # (branches from main, merges to main - legacy behavior)
 
     def test_none_milestone_branch_means_main_behavior(self):
         """Test that None milestone_branch uses main for base/target."""
@@ -11,14 +11,35 @@ This module tests the core milestone branch isolation feature:
 """
 
 import subprocess
-import tempfile
+import uuid
 from datetime import datetime
-from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from ralph2.runner import Ralph2Runner, _extract_spec_title
+from ralph2.runner import Ralph2Runner, _extract_spec_title, slugify_to_branch_name
+
+
+@pytest.fixture(scope="session")
+def run_help_result():
+    """Render `ralph2 run --help` once for all option-existence checks."""
+    from typer.testing import CliRunner
+    from ralph2.cli import app
+
+    return CliRunner().invoke(app, ["run", "--help"])
+
+
+@pytest.fixture
+def bare_runner():
+    """A Ralph2Runner with only the attributes the worktree/merge methods read.
+
+    Skips __init__ (spec file, ProjectContext, database) for tests that
+    exercise a single method against mocked git helpers.
+    """
+    runner = object.__new__(Ralph2Runner)
+    runner.project_context = MagicMock(project_root="/path/to/repo")
+    runner.milestone_branch = "feature/test-milestone"
+    return runner
 
 
 class TestSlugifySpecTitle:
@@ -26,15 +47,11 @@ class TestSlugifySpecTitle:
 
     def test_slugify_basic_title(self):
         """Test slugifying a basic spec title."""
-        from ralph2.runner import slugify_to_branch_name
-
         result = slugify_to_branch_name("My Feature Title")
         assert result == "feature/my-feature-title"
 
     def test_slugify_with_special_characters(self):
         """Test slugifying removes special characters."""
-        from ralph2.runner import slugify_to_branch_name
-
         result = slugify_to_branch_name("My Feature: With Special & Characters!")
         # Should only have lowercase letters and hyphens
         assert all(c.islower() or c == '-' or c == '/' or c.isdigit() for c in result)
@@ -42,15 +59,11 @@ class TestSlugifySpecTitle:
 
     def test_slugify_removes_consecutive_hyphens(self):
         """Test slugifying collapses consecutive hyphens."""
-        from ralph2.runner import slugify_to_branch_name
-
         result = slugify_to_branch_name("Title   With   Spaces")
         assert "--" not in result
 
     def test_slugify_max_length(self):
         """Test slugifying respects max 50 char slug length."""
-        from ralph2.runner import slugify_to_branch_name
-
         long_title = "This is a very long feature title that exceeds fifty characters easily"
         result = slugify_to_branch_name(long_title)
         # Slug portion (after "feature/") should be <= 50 chars
@@ -59,22 +72,16 @@ class TestSlugifySpecTitle:
 
     def test_slugify_removes_trailing_hyphens(self):
         """Test slugifying removes trailing hyphens."""
-        from ralph2.runner import slugify_to_branch_name
-
         result = slugify_to_branch_name("Title!")
         assert not result.endswith("-")
 
     def test_slugify_empty_title_returns_default(self):
         """Test slugifying an empty title returns a default."""
-        from ralph2.runner import slugify_to_branch_name
-
         result = slugify_to_branch_name("")
         assert result == "feature/spec"
 
     def test_slugify_numbers_preserved(self):
         """Test slugifying preserves numbers."""
-        from ralph2.runner import slugify_to_branch_name
-
         result = slugify_to_branch_name("Feature 123 Test")
         assert "123" in result
 
@@ -82,18 +89,25 @@ class TestSlugifySpecTitle:
 class TestCreateMilestoneBranch:
     """Tests for creating milestone branch with git."""
 
-    def test_create_milestone_branch_new(self):
+    @pytest.fixture(autouse=True)
+    def mock_git(self):
+        """Patch branch_exists and subprocess.run once for each test in this class."""
+        with patch("ralph2.runner.branch_exists") as mock_exists, \
+             patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            yield mock_exists, mock_run
+
+    def test_create_milestone_branch_new(self, mock_git):
         """Test creating a new milestone branch."""
         from ralph2.runner import create_milestone_branch
 
-        with patch("ralph2.runner.branch_exists") as mock_exists:
-            mock_exists.return_value = False  # Branch doesn't exist
-            with patch("subprocess.run") as mock_run:
-                mock_run.return_value = MagicMock(returncode=0, stderr="")
-                branch = create_milestone_branch(
-                    "feature/test-branch",
-                    cwd="/test/repo"
-                )
+        mock_exists, mock_run = mock_git
+        mock_exists.return_value = False  # Branch doesn't exist
+
+        branch = create_milestone_branch(
+            "feature/test-branch",
+            cwd="/test/repo"
+        )
         assert branch == "feature/test-branch"
         # Verify git branch was called with main as base
         mock_run.assert_called_once()
@@ -103,48 +117,34 @@ class TestCreateMilestoneBranch:
         assert "feature/test-branch" in call_args
         assert "main" in call_args
 
-    def test_create_milestone_branch_exists_auto_suffix(self):
+    def test_create_milestone_branch_exists_auto_suffix(self, mock_git):
         """Test appending -2 suffix when auto-generated branch exists."""
         from ralph2.runner import create_milestone_branch
 
-        def mock_exists_side_effect(branch_name, cwd):
-            # Base branch exists, -2 doesn't
-            if branch_name == "feature/test-branch":
-                return True  # base exists
-            elif branch_name == "feature/test-branch-2":
-                return False  # -2 doesn't exist
-            return False
-
-        with patch("ralph2.runner.branch_exists", side_effect=mock_exists_side_effect):
-            with patch("subprocess.run") as mock_run:
-                mock_run.return_value = MagicMock(returncode=0, stderr="")
-                branch = create_milestone_branch(
-                    "feature/test-branch",
-                    cwd="/test/repo",
-                    allow_suffix=True
-                )
+        mock_exists, _ = mock_git
+        # Base branch exists, -2 doesn't
+        mock_exists.return_value = True
+
+        with patch("ralph2.runner._existing_branch_names", return_value={"feature/test-branch"}):
+            branch = create_milestone_branch(
+                "feature/test-branch",
+                cwd="/test/repo",
+                allow_suffix=True
+            )
         assert branch == "feature/test-branch-2"
 
-    def test_create_milestone_branch_reuse_existing(self):
+    def test_create_milestone_branch_reuse_existing(self, mock_git):
         """Test reusing an existing branch when --branch flag used."""
         from ralph2.runner import create_milestone_branch
 
-        def mock_git(cmd, **kwargs):
-            result = MagicMock()
-            result.stdout = ""
-            result.stderr = ""
-            if "show-ref" in cmd:
-                result.returncode = 0  # Branch exists
-            else:
-                result.returncode = 0
-            return result
-
-        with patch("subprocess.run", side_effect=mock_git):
-            branch = create_milestone_branch(
-                "feature/my-custom-branch",
-                cwd="/test/repo",
-                allow_suffix=False  # User-specified branch, don't add suffix
-            )
+        mock_exists, _ = mock_git
+        mock_exists.return_value = True  # Branch exists
+
+        branch = create_milestone_branch(
+            "feature/my-custom-branch",
+            cwd="/test/repo",
+            allow_suffix=False  # User-specified branch, don't add suffix
+        )
         # Should reuse existing branch without error
         assert branch == "feature/my-custom-branch"
 
@@ -152,62 +152,57 @@ class TestCreateMilestoneBranch:
 class TestRunnerMilestoneBranchIntegration:
     """Tests for milestone branch integration in Ralph2Runner."""
 
-    def test_runner_init_with_branch_option(self):
+    def test_runner_init_with_branch_option(self, tmp_path):
         """Test Ralph2Runner accepts branch parameter."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            spec_path = Path(tmpdir) / "Ralph2file"
-            spec_path.write_text("# Test Spec")
+        spec_path = tmp_path / "Ralph2file"
+        spec_path.write_text("# Test Spec")
 
-            from ralph2.project import ProjectContext
+        from ralph2.project import ProjectContext
 
-            # Create a proper ProjectContext by mocking the find_project_root
-            with patch("ralph2.project.find_project_root", return_value=Path(tmpdir)):
-                ctx = ProjectContext(project_root=Path(tmpdir))
+        # Create a proper ProjectContext by mocking the find_project_root
+        with patch("ralph2.project.find_project_root", return_value=tmp_path):
+            ctx = ProjectContext(project_root=tmp_path)
 
-                runner = Ralph2Runner(
-                    spec_path=str(spec_path),
-                    project_context=ctx,
-                    branch="feature/my-custom-branch"
-                )
+            runner = Ralph2Runner(
+                spec_path=str(spec_path),
+                project_context=ctx,
+                branch="feature/my-custom-branch"
+            )
 
-                assert runner.branch_option == "feature/my-custom-branch"
+            assert runner.branch_option == "feature/my-custom-branch"
 
-    def test_runner_creates_milestone_branch_on_new_run(self):
+    def test_runner_creates_milestone_branch_on_new_run(self, tmp_path):
         """Test runner creates milestone branch when starting new run."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            spec_path = Path(tmpdir) / "Ralph2file"
-            spec_path.write_text("# Test Feature\n\nSome description")
+        spec_path = tmp_path / "Ralph2file"
+        spec_path.write_text("# Test Feature\n\nSome description")
 
-            from ralph2.project import ProjectContext
+        from ralph2.project import ProjectContext
 
-            with patch("ralph2.project.find_project_root", return_value=Path(tmpdir)):
-                ctx = ProjectContext(project_root=Path(tmpdir))
+        with patch("ralph2.project.find_project_root", return_value=tmp_path):
+            ctx = ProjectContext(project_root=tmp_path)
 
-                runner = Ralph2Runner(
-                    spec_path=str(spec_path),
-                    project_context=ctx
-                )
+            runner = Ralph2Runner(
+                spec_path=str(spec_path),
+                project_context=ctx
+            )
 
-                # Mock the branch creation
-                with patch("ralph2.runner.create_milestone_branch") as mock_create:
-                    mock_create.return_value = "feature/test-feature"
+            # Mock the branch creation
+            with patch("ralph2.runner.create_milestone_branch") as mock_create:
+                mock_create.return_value = "feature/test-feature"
 
-                    # The runner should auto-generate branch name from spec title
-                    branch = runner._ensure_milestone_branch()
+                # The runner should auto-generate branch name from spec title
+                branch = runner._ensure_milestone_branch()
 
-                    # Should slugify "Test Feature" from spec
-                    mock_create.assert_called_once()
-                    call_args = mock_create.call_args
-                    # Should contain slugified spec title
-                    assert "feature/" in call_args[0][0]
+                # Should slugify "Test Feature" from spec
+                mock_create.assert_called_once()
+                call_args = mock_create.call_args
+                # Should contain slugified spec title
+                assert "feature/" in call_args[0][0]
 
-    def test_runner_passes_milestone_branch_to_worktree_creation(self):
+    def test_runner_passes_milestone_branch_to_worktree_creation(self, bare_runner):
         """Test runner passes milestone_branch to create_worktree."""
         # This tests acceptance criterion:
         # WHEN executor worktrees are created, THEN they branch from the milestone branch
-        from ralph2.runner import Ralph2Runner
-        from ralph2.git import create_worktree
-
         git_commands = []
 
         def mock_create_worktree(work_item_id, run_id, cwd, base_branch=None):
@@ -219,42 +214,27 @@ class TestRunnerMilestoneBranchIntegration:
 
         with patch("ralph2.runner.create_worktree", side_effect=mock_create_worktree):
             # Test that _create_worktrees passes base_branch
-            with tempfile.TemporaryDirectory() as tmpdir:
-                spec_path = Path(tmpdir) / "Ralph2file"
-                spec_path.write_text("# Test Spec")
+            work_items = [
+                {"work_item_id": "ralph-abc123"},
+                {"work_item_id": "ralph-def456"}
+            ]
 
-                from ralph2.project import ProjectContext
+            bare_runner._create_worktrees(work_items, "run-123")
 
-                with patch("ralph2.project.find_project_root", return_value=Path(tmpdir)):
-                    ctx = ProjectContext(project_root=Path(tmpdir))
-
-                    runner = Ralph2Runner(
-                        spec_path=str(spec_path),
-                        project_context=ctx
-                    )
-                    runner.milestone_branch = "feature/test-milestone"
-
-                    work_items = [
-                        {"work_item_id": "ralph-abc123"},
-                        {"work_item_id": "ralph-def456"}
-                    ]
-
-                    runner._create_worktrees(work_items, "run-123")
-
-                    # Verify base_branch was passed
-                    for cmd in git_commands:
-                        assert cmd['base_branch'] == "feature/test-milestone"
+        # Verify base_branch was passed
+        assert len(git_commands) == 2
+        for cmd in git_commands:
+            assert cmd['base_branch'] == "feature/test-milestone"
 
 
 class TestMergeToMilestoneBranch:
     """Tests for merging to milestone branch instead of main."""
 
-    def test_runner_merges_to_milestone_branch(self):
+    @pytest.mark.asyncio
+    async def test_runner_merges_to_milestone_branch(self, bare_runner):
         """Test runner merges executor work to milestone branch."""
         # This tests acceptance criterion:
         # WHEN executor work is merged, THEN it merges to the milestone branch
-        from ralph2.runner import Ralph2Runner
-
         merge_calls = []
 
         def mock_merge_branch(branch_name, cwd, target_branch="main"):
@@ -265,32 +245,17 @@ class TestMergeToMilestoneBranch:
             return True, ""
 
         with patch("ralph2.runner.merge_branch", side_effect=mock_merge_branch):
-            with tempfile.TemporaryDirectory() as tmpdir:
-                spec_path = Path(tmpdir) / "Ralph2file"
-                spec_path.write_text("# Test Spec")
+            # Simulate completed worktrees
+            completed = [
+                ({"work_item_id": "ralph-abc123"}, "/path/to/wt1", "ralph2/ralph-abc123"),
+            ]
 
-                from ralph2.project import ProjectContext
+            await bare_runner._merge_worktrees_serial(completed)
 
-                with patch("ralph2.project.find_project_root", return_value=Path(tmpdir)):
-                    ctx = ProjectContext(project_root=Path(tmpdir))
-
-                    runner = Ralph2Runner(
-                        spec_path=str(spec_path),
-                        project_context=ctx
-                    )
-                    runner.milestone_branch = "feature/test-milestone"
-
-                    # Simulate completed worktrees
-                    completed = [
-                        ({"work_item_id": "ralph-abc123"}, "/path/to/wt1", "ralph2/ralph-abc123"),
-                    ]
-
-                    import asyncio
-                    asyncio.run(runner._merge_worktrees_serial(completed))
-
-                    # Verify merge target was milestone branch
-                    for call in merge_calls:
-                        assert call['target_branch'] == "feature/test-milestone"
+        # Verify merge target was milestone branch
+        assert len(merge_calls) == 1
+        for call in merge_calls:
+            assert call['target_branch'] == "feature/test-milestone"
 
 
 class TestRunResumeWithMilestoneBranch:
@@ -300,24 +265,17 @@ class TestRunResumeWithMilestoneBranch:
         """Test resuming run reads milestone_branch from Run record."""
         # This tests acceptance criterion:
         # WHEN run is resumed, THEN milestone_branch is read from Run record
-        with tempfile.TemporaryDirectory() as tmpdir:
-            from ralph2.state.db import Ralph2DB
-            from ralph2.state.models import Run
-            from ralph2.project import ProjectContext
-
-            # Create spec file first (needed for ProjectContext)
-            spec_path = Path(tmpdir) / "Ralph2file"
-            spec_path.write_text("# Test Spec")
+        from ralph2.state.db import Ralph2DB
+        from ralph2.state.models import Run
 
-            with patch("ralph2.project.find_project_root", return_value=Path(tmpdir)):
-                ctx = ProjectContext(project_root=Path(tmpdir))
-
-            db = Ralph2DB(str(ctx.db_path))
+        # Shared-cache in-memory database: a second handle sees the first's data
+        db_uri = f"file:resume_{uuid.uuid4().hex}?mode=memory&cache=shared"
 
+        with Ralph2DB(db_uri) as db:
             # Create a run with milestone_branch
             run = Run(
                 id="ralph2-test-resume",
-                spec_path=str(spec_path),
+                spec_path="Ralph2file",
                 spec_content="# Test",
                 status="running",
                 config={},
@@ -325,13 +283,12 @@ class TestRunResumeWithMilestoneBranch:
                 milestone_branch="feature/existing-milestone"
             )
             db.create_run(run)
-            db.close()
 
             # Reopen and verify
-            db2 = Ralph2DB(str(ctx.db_path))
-            resumed_run = db2.get_latest_run()
-            assert resumed_run.milestone_branch == "feature/existing-milestone"
-            db2.close()
+            with Ralph2DB(db_uri) as db2:
+                resumed_run = db2.get_latest_run()
+
+        assert resumed_run.milestone_branch == "feature/existing-milestone"
 
 
 class TestDoneDoesNotMergeToMain:
@@ -349,20 +306,12 @@ class TestDoneDoesNotMergeToMain:
 class TestCLIBranchOption:
     """Tests for CLI --branch option."""
 
-    def test_cli_run_accepts_branch_option(self):
+    def test_cli_run_accepts_branch_option(self, run_help_result):
         """Test that CLI run command accepts --branch option."""
-        from typer.testing import CliRunner
-        from ralph2.cli import app
-
-        runner = CliRunner()
-
-        # Just verify the option is recognized (help should show it)
-        # We invoke with --help on the run subcommand
-        result = runner.invoke(app, ["run", "--help"])
         # --help should show the option if it's defined
-        assert result.exit_code == 0
+        assert run_help_result.exit_code == 0
         # Check that --branch is in the help text
-        assert "--branch" in result.stdout
+        assert "--branch" in run_help_result.stdout
 
     def test_cli_status_shows_milestone_branch(self):
         """Test that status command displays milestone branch."""
@@ -374,66 +323,62 @@ class TestCLIBranchOption:
 class TestFreshRepoHandling:
     """Tests for handling fresh repositories with no commits."""
 
-    def test_repo_has_commits_returns_false_for_empty_repo(self):
+    def test_repo_has_commits_returns_false_for_empty_repo(self, tmp_path):
         """Test repo_has_commits returns False for repo with no commits."""
         from ralph2.runner import repo_has_commits
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Initialize empty repo
-            subprocess.run(["git", "init"], cwd=tmpdir, capture_output=True)
-            assert not repo_has_commits(tmpdir)
+        # Initialize empty repo
+        subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+        assert not repo_has_commits(tmp_path)
 
-    def test_repo_has_commits_returns_true_for_repo_with_commits(self):
+    def test_repo_has_commits_returns_true_for_repo_with_commits(self, tmp_path):
         """Test repo_has_commits returns True for repo with commits."""
         from ralph2.runner import repo_has_commits
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Initialize repo with a commit
-            subprocess.run(["git", "init"], cwd=tmpdir, capture_output=True)
-            subprocess.run(["git", "commit", "--allow-empty", "-m", "Test"], cwd=tmpdir, capture_output=True)
-            assert repo_has_commits(tmpdir)
+        # Initialize repo with a commit
+        subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+        subprocess.run(["git", "commit", "--allow-empty", "-m", "Test"], cwd=tmp_path, capture_output=True)
+        assert repo_has_commits(tmp_path)
 
-    def test_ensure_repo_has_commits_creates_initial_commit(self):
+    def test_ensure_repo_has_commits_creates_initial_commit(self, tmp_path):
         """Test ensure_repo_has_commits creates initial commit on fresh repo."""
         from ralph2.runner import ensure_repo_has_commits, repo_has_commits
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Initialize empty repo
-            subprocess.run(["git", "init"], cwd=tmpdir, capture_output=True)
-            subprocess.run(["git", "config", "user.email", "test@test.com"], cwd=tmpdir, capture_output=True)
-            subprocess.run(["git", "config", "user.name", "Test"], cwd=tmpdir, capture_output=True)
+        # Initialize empty repo
+        subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+        subprocess.run(["git", "config", "user.email", "test@test.com"], cwd=tmp_path, capture_output=True)
+        subprocess.run(["git", "config", "user.name", "Test"], cwd=tmp_path, capture_output=True)
 
-            # Verify empty
-            assert not repo_has_commits(tmpdir)
+        # Verify empty
+        assert not repo_has_commits(tmp_path)
 
-            # Ensure commits
-            result = ensure_repo_has_commits(tmpdir)
-            assert result is True
+        # Ensure commits
+        result = ensure_repo_has_commits(tmp_path)
+        assert result is True
 
-            # Now should have commits
-            assert repo_has_commits(tmpdir)
+        # Now should have commits
+        assert repo_has_commits(tmp_path)
 
-    def test_ensure_repo_has_commits_noop_if_commits_exist(self):
+    def test_ensure_repo_has_commits_noop_if_commits_exist(self, tmp_path):
         """Test ensure_repo_has_commits is a no-op if commits already exist."""
         from ralph2.runner import ensure_repo_has_commits
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Initialize repo with a commit
-            subprocess.run(["git", "init"], cwd=tmpdir, capture_output=True)
-            subprocess.run(["git", "config", "user.email", "test@test.com"], cwd=tmpdir, capture_output=True)
-            subprocess.run(["git", "config", "user.name", "Test"], cwd=tmpdir, capture_output=True)
-            subprocess.run(["git", "commit", "--allow-empty", "-m", "Initial"], cwd=tmpdir, capture_output=True)
+        # Initialize repo with a commit
+        subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+        subprocess.run(["git", "config", "user.email", "test@test.com"], cwd=tmp_path, capture_output=True)
+        subprocess.run(["git", "config", "user.name", "Test"], cwd=tmp_path, capture_output=True)
+        subprocess.run(["git", "commit", "--allow-empty", "-m", "Initial"], cwd=tmp_path, capture_output=True)
 
-            # Get commit count before
-            result = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=tmpdir, capture_output=True, text=True)
-            count_before = int(result.stdout.strip())
+        # Get commit count before
+        result = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=tmp_path, capture_output=True, text=True)
+        count_before = int(result.stdout.strip())
 
-            # Ensure commits (should be no-op)
-            ensure_repo_has_commits(tmpdir)
+        # Ensure commits (should be no-op)
+        ensure_repo_has_commits(tmp_path)
 
-            # Get commit count after
-            result = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=tmpdir, capture_output=True, text=True)
-            count_after = int(result.stdout.strip())
+        # Get commit count after
+        result = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=tmp_path, capture_output=True, text=True)
+        count_after = int(result.stdout.strip())
 
-            # Should not have added a commit
-            assert count_before == count_after
+        # Should not have added a commit
+        assert count_before == count_after
@@ -8,250 +8,255 @@ manages worktree lifecycle instead of individual executors:
 3. Runner orchestrator methods (_create_worktrees, _merge_worktrees_serial, _cleanup_all_worktrees)
 """
 
-import pytest
-from unittest.mock import MagicMock, patch, AsyncMock
 import asyncio
+import copy
+import json
+import subprocess
+from dataclasses import dataclass, replace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from ralph2.agents.executor import run_executor
+from ralph2.git import (
+    abort_merge,
+    create_worktree,
+    merge_branch_to_main,
+    remove_worktree,
+)
+from ralph2.runner import Ralph2Runner, IterationContext
+
+
+@dataclass(frozen=True, slots=True)
+class FakeExecResult:
+    """Stand-in for the executor agent's structured result."""
+    status: str = "Completed"
+    what_was_done: str = "Work done"
+    blockers: Any = None
+    notes: Any = None
+    efficiency_notes: Any = None
+    work_committed: bool = True
+    traces_updated: bool = True
+
+
+_DEFAULT_EXEC_RESULT = FakeExecResult()
+
+# What run_executor returns for a completed work item; copy before handing out
+_DEFAULT_EXECUTOR_OUTPUT = {
+    "status": "Completed",
+    "summary": "Work done",
+    "full_output": "",
+    "messages": [],
+    "result": _DEFAULT_EXEC_RESULT,
+}
+
+
+@pytest.fixture(scope="module")
+def _runner_proto():
+    """Ralph2Runner skeleton with only the attributes the orchestrator methods read."""
+    runner = Ralph2Runner.__new__(Ralph2Runner)
+    runner.project_context = SimpleNamespace(
+        project_root="/mock/repo", outputs_dir=Path("/mock/outputs")
+    )
+    runner._milestone_branch = None  # No milestone branch set
+    runner.spec_content = "test spec"
+    runner.output_dir = runner.project_context.outputs_dir
+    return runner
+
+
+@pytest.fixture
+def runner(_runner_proto):
+    """Per-test copy of the runner skeleton; tests set db and other mocks as needed."""
+    return copy.copy(_runner_proto)
 
 
 class TestStandaloneGitFunctions:
     """Test the standalone git functions for orchestrator use."""
 
-    def test_create_worktree_success(self):
+    def test_create_worktree_success(self, git_cmds):
         """Test create_worktree creates branch and worktree."""
-        from ralph2.git import create_worktree
-
-        git_commands = []
-
-        def mock_subprocess_run(cmd, *args, **kwargs):
-            git_commands.append(cmd)
-            result = MagicMock()
-            result.returncode = 0
-            result.stdout = ""
-            result.stderr = ""
-            return result
-
-        with patch('ralph2.git._run_git_command', side_effect=mock_subprocess_run):
-            worktree_path, branch_name = create_worktree(
-                work_item_id="ralph-test1",
-                run_id="run-abc123",
-                cwd="/mock/repo"
-            )
+        worktree_path, branch_name = create_worktree(
+            work_item_id="ralph-test1",
+            run_id="run-abc123",
+            cwd="/mock/repo"
+        )
 
         # Verify branch was created
-        branch_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd)]
-        assert len(branch_cmds) > 0, "Should create branch"
-        assert 'ralph2/ralph-test1' in ' '.join(branch_cmds[0])
+        assert git_cmds.has("branch", "ralph2/ralph-test1"), "Should create branch"
 
         # Verify worktree was created
-        worktree_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd)]
-        assert len(worktree_cmds) > 0, "Should create worktree"
+        assert git_cmds.has("worktree", "add"), "Should create worktree"
 
         assert branch_name == "ralph2/ralph-test1"
         assert "ralph-test1" in worktree_path
         assert "run-abc123" in worktree_path
 
-    def test_create_worktree_cleans_up_branch_on_failure(self):
+    def test_create_worktree_cleans_up_branch_on_failure(self, git_cmds):
         """Test create_worktree cleans up branch if worktree creation fails."""
-        from ralph2.git import create_worktree
-
-        git_commands = []
-
-        def mock_subprocess_run(cmd, *args, **kwargs):
-            git_commands.append(cmd)
-            result = MagicMock()
-            # Branch creation succeeds
-            if 'branch' in ' '.join(cmd) and '-D' not in cmd:
-                result.returncode = 0
-            # Worktree creation fails
-            elif 'worktree' in ' '.join(cmd) and 'add' in ' '.join(cmd):
-                result.returncode = 1
-                result.stderr = "worktree failed"
-            else:
-                result.returncode = 0
-            result.stdout = ""
-            if not hasattr(result, 'stderr'):
-                result.stderr = ""
-            return result
-
-        with patch('ralph2.git._run_git_command', side_effect=mock_subprocess_run):
-            with patch('ralph2.git._warn'):  # Suppress warning output
-                with pytest.raises(RuntimeError, match="Failed to create worktree"):
-                    create_worktree(
-                        work_item_id="ralph-test1",
-                        run_id="run-abc123",
-                        cwd="/mock/repo"
-                    )
+        def plan(cmd):
+            # Worktree creation fails; everything else succeeds
+            if cmd[1:3] == ["worktree", "add"]:
+                return 1, "", "worktree failed"
+            return 0, "", ""
+
+        git_cmds.plan = plan
+        with patch('ralph2.git._warn'):  # Suppress warning output
+            with pytest.raises(RuntimeError, match="Failed to create worktree"):
+                create_worktree(
+                    work_item_id="ralph-test1",
+                    run_id="run-abc123",
+                    cwd="/mock/repo"
+                )
 
         # Verify branch was cleaned up
-        branch_delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
-        assert len(branch_delete_cmds) > 0, "Should delete branch on worktree failure"
+        assert git_cmds.has("branch", "-D"), "Should delete branch on worktree failure"
 
-    def test_merge_branch_to_main_success(self):
+    def test_merge_branch_to_main_success(self, git_cmds):
         """Test merge_branch_to_main successfully merges."""
-        from ralph2.git import merge_branch_to_main
-
-        git_commands = []
-
-        def mock_subprocess_run(cmd, *args, **kwargs):
-            git_commands.append(cmd)
-            result = MagicMock()
-            result.returncode = 0
-            result.stdout = ""
-            result.stderr = ""
-            return result
-
-        with patch('ralph2.git._run_git_command', side_effect=mock_subprocess_run):
-            success, error = merge_branch_to_main(
-                branch_name="ralph2/ralph-test1",
-                cwd="/mock/repo"
-            )
+        success, error = merge_branch_to_main(
+            branch_name="ralph2/ralph-test1",
+            cwd="/mock/repo"
+        )
 
         assert success is True
         assert error == ""
 
         # Verify checkout main was called
-        checkout_cmds = [cmd for cmd in git_commands if 'checkout' in ' '.join(cmd) and 'main' in ' '.join(cmd)]
-        assert len(checkout_cmds) > 0, "Should checkout main"
+        assert git_cmds.has("checkout", "main"), "Should checkout main"
 
         # Verify merge was called
-        merge_cmds = [cmd for cmd in git_commands if 'merge' in ' '.join(cmd)]
-        assert len(merge_cmds) > 0, "Should merge branch"
+        assert git_cmds.has("merge", "ralph2/ralph-test1"), "Should merge branch"
 
-    def test_merge_branch_to_main_conflict(self):
+    def test_merge_branch_to_main_conflict(self, git_cmds):
         """Test merge_branch_to_main handles merge conflict."""
-        from ralph2.git import merge_branch_to_main
-
-        def mock_subprocess_run(cmd, *args, **kwargs):
-            result = MagicMock()
-            if 'checkout' in ' '.join(cmd):
-                result.returncode = 0
-            elif 'merge' in ' '.join(cmd):
-                result.returncode = 1
-                result.stderr = "CONFLICT in file.py"
-            elif 'status' in ' '.join(cmd):
-                result.returncode = 0
-                result.stdout = "UU file.py"
-            else:
-                result.returncode = 0
-            result.stdout = getattr(result, 'stdout', "")
-            result.stderr = getattr(result, 'stderr', "")
-            return result
-
-        with patch('ralph2.git._run_git_command', side_effect=mock_subprocess_run):
-            success, error = merge_branch_to_main(
-                branch_name="ralph2/ralph-test1",
-                cwd="/mock/repo"
-            )
+        def plan(cmd):
+            if cmd[1] == "merge":
+                return 1, "", "CONFLICT in file.py"
+            if cmd[1] == "diff":
+                return 0, "file.py\n", ""
+            return 0, "", ""
+
+        git_cmds.plan = plan
+        success, error = merge_branch_to_main(
+            branch_name="ralph2/ralph-test1",
+            cwd="/mock/repo"
+        )
 
         assert success is False
-        assert "conflict" in error.lower() or "file.py" in error.lower()
-
-    def test_remove_worktree_success(self):
-        """Test remove_worktree removes worktree and branch."""
-        from ralph2.git import remove_worktree
-
-        git_commands = []
+        assert error == "Merge conflict in files: file.py"
+
+    def test_merge_branch_reports_conflicts_in_real_repo(self, tmp_path):
+        """Test conflicting paths are reported from a real merge."""
+        def git(*args):
+            subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+        git("init", "-q", "-b", "main")
+        # merge_branch commits too, so the identity has to live in the repo config
+        git("config", "user.email", "t@t")
+        git("config", "user.name", "t")
+        (tmp_path / "file.py").write_text("base\n")
+        (tmp_path / "untracked.txt").write_text("noise\n")
+        git("add", "file.py")
+        git("commit", "-q", "-m", "init")
+        git("checkout", "-q", "-b", "ralph2/ralph-test1")
+        (tmp_path / "file.py").write_text("theirs\n")
+        git("commit", "-q", "-am", "theirs")
+        git("checkout", "-q", "main")
+        (tmp_path / "file.py").write_text("ours\n")
+        git("commit", "-q", "-am", "ours")
+
+        success, error = merge_branch_to_main("ralph2/ralph-test1", str(tmp_path))
 
-        def mock_subprocess_run(cmd, *args, **kwargs):
-            git_commands.append(cmd)
-            result = MagicMock()
-            result.returncode = 0
-            result.stdout = ""
-            result.stderr = ""
-            return result
+        assert success is False
+        assert error == "Merge conflict in files: file.py"
+        assert abort_merge(str(tmp_path)) is True
 
-        with patch('ralph2.git._run_git_command', side_effect=mock_subprocess_run):
-            success = remove_worktree(
-                worktree_path="/mock/worktree/path",
-                branch_name="ralph2/ralph-test1",
-                cwd="/mock/repo"
-            )
+    def test_remove_worktree_success(self, git_cmds):
+        """Test remove_worktree removes worktree and branch."""
+        success = remove_worktree(
+            worktree_path="/mock/worktree/path",
+            branch_name="ralph2/ralph-test1",
+            cwd="/mock/repo"
+        )
 
         assert success is True
 
         # Verify worktree remove was called
-        worktree_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
-        assert len(worktree_cmds) > 0, "Should remove worktree"
+        assert git_cmds.has("worktree", "remove"), "Should remove worktree"
 
         # Verify branch delete was called
-        branch_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
-        assert len(branch_cmds) > 0, "Should delete branch"
+        assert git_cmds.has("branch", "-D"), "Should delete branch"
 
-    def test_remove_worktree_logs_failures(self):
+    def test_remove_worktree_logs_failures(self, git_cmds):
         """Test remove_worktree logs but doesn't raise on failure."""
-        from ralph2.git import remove_worktree
-
-        def mock_subprocess_run(cmd, *args, **kwargs):
-            result = MagicMock()
-            result.returncode = 1
-            result.stdout = ""
-            result.stderr = "error"
-            return result
-
-        with patch('ralph2.git._run_git_command', side_effect=mock_subprocess_run):
-            with patch('ralph2.git._warn') as mock_warn:
-                success = remove_worktree(
-                    worktree_path="/mock/worktree/path",
-                    branch_name="ralph2/ralph-test1",
-                    cwd="/mock/repo"
-                )
+        git_cmds.plan = lambda cmd: (1, "", "error")
+        with patch('ralph2.git._warn') as mock_warn:
+            success = remove_worktree(
+                worktree_path="/mock/worktree/path",
+                branch_name="ralph2/ralph-test1",
+                cwd="/mock/repo"
+            )
 
         assert success is False
         # Should have logged warnings for both failures
         assert mock_warn.call_count >= 1
 
-    def test_abort_merge(self):
-        """Test abort_merge aborts an in-progress merge."""
-        from ralph2.git import abort_merge
+    @pytest.mark.parametrize("head, expect_checkout", [
+        ("ref: refs/heads/main\n", False),
+        ("ref: refs/heads/feature/other\n", True),
+        ("0123456789abcdef0123456789abcdef01234567\n", True),  # detached HEAD
+    ])
+    def test_merge_branch_skips_checkout_when_on_target(self, git_cmds, tmp_path, head, expect_checkout):
+        """Test merge_branch only checks out the target when HEAD is elsewhere."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text(head)
+        success, _ = merge_branch_to_main("ralph2/ralph-test1", str(tmp_path))
 
-        def mock_subprocess_run(cmd, *args, **kwargs):
-            result = MagicMock()
-            result.returncode = 0
-            return result
+        assert success is True
+        assert (("git", "checkout", "main") in git_cmds.calls) is expect_checkout
+        assert git_cmds.has("merge")
 
-        with patch('ralph2.git._run_git_command', side_effect=mock_subprocess_run) as mock_run:
-            success = abort_merge("/mock/repo")
+    def test_abort_merge(self, git_cmds):
+        """Test abort_merge aborts an in-progress merge."""
+        success = abort_merge("/mock/repo")
 
         assert success is True
         # Verify abort was called with correct args
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert 'merge' in call_args
-        assert '--abort' in call_args
+        assert git_cmds.calls == [("git", "merge", "--abort")]
 
 
 class TestExecutorOrchestratorMode:
     """Test executor behavior when worktree_path is provided (orchestrator mode)."""
 
+    @staticmethod
+    def _fake_agent(result=_DEFAULT_EXEC_RESULT, captured_options=None):
+        """Plain async stand-in for _run_executor_agent returning a fixed result."""
+        async def run_agent(prompt, options):
+            if captured_options is not None:
+                captured_options.append(options)
+            return (result, "output", [])
+        return run_agent
+
     @pytest.mark.asyncio
-    async def test_executor_uses_provided_worktree_path(self):
+    async def test_executor_uses_provided_worktree_path(self, monkeypatch):
         """Test executor uses worktree_path directly when provided."""
-        from ralph2.agents.executor import run_executor
-
         captured_options = []
+        monkeypatch.setattr(
+            "ralph2.agents.executor._run_executor_agent",
+            self._fake_agent(captured_options=captured_options)
+        )
 
-        mock_result = MagicMock()
-        mock_result.status = "Completed"
-        mock_result.what_was_done = "Work done"
-        mock_result.blockers = None
-        mock_result.notes = None
-        mock_result.efficiency_notes = None
-        mock_result.work_committed = True
-        mock_result.traces_updated = True
-
-        async def capturing_run_agent(prompt, options):
-            captured_options.append(options)
-            return (mock_result, "output", [])
-
-        with patch('ralph2.agents.executor._run_executor_agent', side_effect=capturing_run_agent):
-            result = await run_executor(
-                iteration_intent="Test task",
-                spec_content="Test spec",
-                memory="",
-                work_item_id="ralph-test1",
-                run_id="run-abc123",
-                worktree_path="/provided/worktree/path"  # Orchestrator-provided
-            )
+        result = await run_executor(
+            iteration_intent="Test task",
+            spec_content="Test spec",
+            memory="",
+            work_item_id="ralph-test1",
+            run_id="run-abc123",
+            worktree_path="/provided/worktree/path"  # Orchestrator-provided
+        )
 
         # Agent should have been called with cwd set to provided path
         assert len(captured_options) > 0
@@ -259,106 +264,72 @@ class TestExecutorOrchestratorMode:
         assert agent_options.cwd == "/provided/worktree/path"
 
     @pytest.mark.asyncio
-    async def test_executor_does_not_create_branch_when_worktree_provided(self):
+    async def test_executor_does_not_create_branch_when_worktree_provided(self, monkeypatch):
         """Test executor doesn't create branch/worktree when worktree_path is provided."""
-        from ralph2.agents.executor import run_executor
-
-        mock_result = MagicMock()
-        mock_result.status = "Completed"
-        mock_result.what_was_done = "Work done"
-        mock_result.blockers = None
-        mock_result.notes = None
-        mock_result.efficiency_notes = None
-        mock_result.work_committed = True
-        mock_result.traces_updated = True
-
-        with patch('ralph2.agents.executor.GitBranchManager') as mock_gbm:
-            with patch('ralph2.agents.executor._run_executor_agent', new_callable=AsyncMock) as mock_agent:
-                mock_agent.return_value = (mock_result, "output", [])
-
-                result = await run_executor(
-                    iteration_intent="Test task",
-                    spec_content="Test spec",
-                    memory="",
-                    work_item_id="ralph-test1",
-                    run_id="run-abc123",
-                    worktree_path="/provided/worktree"
-                )
+        gbm_calls = []
+        monkeypatch.setattr(
+            "ralph2.agents.executor.GitBranchManager",
+            lambda *args, **kwargs: gbm_calls.append((args, kwargs))
+        )
+        monkeypatch.setattr("ralph2.agents.executor._run_executor_agent", self._fake_agent())
+
+        result = await run_executor(
+            iteration_intent="Test task",
+            spec_content="Test spec",
+            memory="",
+            work_item_id="ralph-test1",
+            run_id="run-abc123",
+            worktree_path="/provided/worktree"
+        )
 
         # GitBranchManager should NOT be called when worktree_path is provided
-        mock_gbm.assert_not_called()
+        assert gbm_calls == []
 
     @pytest.mark.asyncio
-    async def test_executor_does_not_merge_when_worktree_provided(self):
+    async def test_executor_does_not_merge_when_worktree_provided(self, monkeypatch):
         """Test executor skips merge when worktree_path is provided (orchestrator merges)."""
-        from ralph2.agents.executor import run_executor
-
         git_commands = []
 
-        def mock_subprocess_run(cmd, *args, **kwargs):
+        def fake_subprocess_run(cmd, *args, **kwargs):
             git_commands.append(cmd)
-            result = MagicMock()
-            result.returncode = 0
-            result.stdout = ""
-            result.stderr = ""
-            return result
-
-        mock_result = MagicMock()
-        mock_result.status = "Completed"
-        mock_result.what_was_done = "Work done"
-        mock_result.blockers = None
-        mock_result.notes = None
-        mock_result.efficiency_notes = None
-        mock_result.work_committed = True
-        mock_result.traces_updated = True
-
-        with patch('subprocess.run', side_effect=mock_subprocess_run):
-            with patch('ralph2.agents.executor._run_executor_agent', new_callable=AsyncMock) as mock_agent:
-                mock_agent.return_value = (mock_result, "output", [])
-
-                result = await run_executor(
-                    iteration_intent="Test task",
-                    spec_content="Test spec",
-                    memory="",
-                    work_item_id="ralph-test1",
-                    run_id="run-abc123",
-                    worktree_path="/provided/worktree"
-                )
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        monkeypatch.setattr("subprocess.run", fake_subprocess_run)
+        monkeypatch.setattr("ralph2.agents.executor._run_executor_agent", self._fake_agent())
+
+        result = await run_executor(
+            iteration_intent="Test task",
+            spec_content="Test spec",
+            memory="",
+            work_item_id="ralph-test1",
+            run_id="run-abc123",
+            worktree_path="/provided/worktree"
+        )
 
         # No merge commands should be issued
-        merge_cmds = [cmd for cmd in git_commands if 'merge' in ' '.join(cmd)]
+        merge_cmds = [cmd for cmd in git_commands if 'merge' in cmd]
         assert len(merge_cmds) == 0, f"Should NOT merge when worktree_path provided, found: {merge_cmds}"
 
         # No worktree remove commands should be issued
-        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
+        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'remove' in cmd]
         assert len(worktree_remove_cmds) == 0, "Should NOT cleanup when worktree_path provided"
 
     @pytest.mark.asyncio
-    async def test_executor_still_verifies_commit_in_orchestrator_mode(self):
+    async def test_executor_still_verifies_commit_in_orchestrator_mode(self, monkeypatch):
         """Test executor still verifies commit even in orchestrator mode."""
-        from ralph2.agents.executor import run_executor
-
-        mock_result = MagicMock()
-        mock_result.status = "Completed"
-        mock_result.what_was_done = "Work done"
-        mock_result.blockers = None
-        mock_result.notes = None
-        mock_result.efficiency_notes = None
-        mock_result.work_committed = False  # Agent says not committed
-        mock_result.traces_updated = True
-
-        with patch('ralph2.agents.executor._run_executor_agent', new_callable=AsyncMock) as mock_agent:
-            mock_agent.return_value = (mock_result, "output", [])
-
-            with patch('ralph2.agents.executor._check_uncommitted_changes', return_value=False):
-                result = await run_executor(
-                    iteration_intent="Test task",
-                    spec_content="Test spec",
-                    memory="",
-                    work_item_id="ralph-test1",
-                    run_id="run-abc123",
-                    worktree_path="/provided/worktree"
-                )
+        # Agent says not committed
+        not_committed = replace(_DEFAULT_EXEC_RESULT, work_committed=False)
+        monkeypatch.setattr("ralph2.agents.executor._run_executor_agent", self._fake_agent(not_committed))
+        monkeypatch.setattr("ralph2.agents.executor._check_uncommitted_changes", lambda *args: False)
+
+        result = await run_executor(
+            iteration_intent="Test task",
+            spec_content="Test spec",
+            memory="",
+            work_item_id="ralph-test1",
+            run_id="run-abc123",
+            worktree_path="/provided/worktree"
+        )
 
         # Should complete successfully
         assert result["status"] == "Completed"
@@ -367,10 +338,8 @@ class TestExecutorOrchestratorMode:
 class TestRunnerOrchestratorMethods:
     """Test runner orchestrator methods for worktree lifecycle management."""
 
-    def test_runner_create_worktrees_creates_all(self):
+    def test_runner_create_worktrees_creates_all(self, runner):
         """Test _create_worktrees creates worktrees for all work items."""
-        from ralph2.runner import Ralph2Runner
-
         work_items = [
             {"work_item_id": "ralph-task1"},
             {"work_item_id": "ralph-task2"},
@@ -385,12 +354,6 @@ class TestRunnerOrchestratorMethods:
             created_worktrees.append((work_item_id, path, branch))
             return path, branch
 
-        # Create runner with mocked project_context
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-        runner._milestone_branch = None  # No milestone branch set
-
         with patch('ralph2.runner.create_worktree', side_effect=mock_create_worktree):
             result = runner._create_worktrees(work_items, "run-abc123")
 
@@ -403,10 +366,8 @@ class TestRunnerOrchestratorMethods:
         assert "ralph-task2" in created_ids
         assert "ralph-task3" in created_ids
 
-    def test_runner_create_worktrees_handles_failures(self):
+    def test_runner_create_worktrees_handles_failures(self, runner):
         """Test _create_worktrees continues even if some fail."""
-        from ralph2.runner import Ralph2Runner
-
         work_items = [
             {"work_item_id": "ralph-task1"},
             {"work_item_id": "ralph-task2"},  # This one will fail
@@ -421,11 +382,6 @@ class TestRunnerOrchestratorMethods:
                 raise RuntimeError("Failed to create worktree")
             return f"/mock/worktree/{work_item_id}", f"ralph2/{work_item_id}"
 
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-        runner._milestone_branch = None  # No milestone branch set
-
         with patch('ralph2.runner.create_worktree', side_effect=mock_create_worktree):
             result = runner._create_worktrees(work_items, "run-abc123")
 
@@ -440,10 +396,8 @@ class TestRunnerOrchestratorMethods:
         assert "ralph-task2" not in result_ids
 
     @pytest.mark.asyncio
-    async def test_runner_merge_worktrees_serial_merges_one_at_a_time(self):
+    async def test_runner_merge_worktrees_serial_merges_one_at_a_time(self, runner):
         """Test _merge_worktrees_serial merges worktrees serially."""
-        from ralph2.runner import Ralph2Runner
-
         completed = [
             ({"work_item_id": "ralph-task1"}, "/wt1", "ralph2/ralph-task1"),
             ({"work_item_id": "ralph-task2"}, "/wt2", "ralph2/ralph-task2"),
@@ -455,11 +409,6 @@ class TestRunnerOrchestratorMethods:
             merge_order.append(branch_name)
             return True, ""
 
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-        runner._milestone_branch = None  # No milestone branch, will merge to main
-
         with patch('ralph2.runner.merge_branch', side_effect=mock_merge):
             failed = await runner._merge_worktrees_serial(completed)
 
@@ -470,10 +419,8 @@ class TestRunnerOrchestratorMethods:
         assert merge_order[1] == "ralph2/ralph-task2"
 
     @pytest.mark.asyncio
-    async def test_runner_merge_worktrees_serial_aborts_on_conflict(self):
+    async def test_runner_merge_worktrees_serial_aborts_on_conflict(self, runner):
         """Test _merge_worktrees_serial aborts merge on conflict."""
-        from ralph2.runner import Ralph2Runner
-
         completed = [
             ({"work_item_id": "ralph-task1"}, "/wt1", "ralph2/ralph-task1"),
         ]
@@ -487,11 +434,6 @@ class TestRunnerOrchestratorMethods:
             abort_called[0] = True
             return True
 
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-        runner._milestone_branch = None  # No milestone branch, will merge to main
-
         with patch('ralph2.runner.merge_branch', side_effect=mock_merge):
             with patch('ralph2.runner.abort_merge', side_effect=mock_abort):
                 failed = await runner._merge_worktrees_serial(completed)
@@ -500,10 +442,8 @@ class TestRunnerOrchestratorMethods:
         assert failed[0][0] == "ralph-task1"
         assert abort_called[0] is True
 
-    def test_runner_cleanup_all_worktrees_cleans_all(self):
+    def test_runner_cleanup_all_worktrees_cleans_all(self, runner):
         """Test _cleanup_all_worktrees cleans up all worktrees."""
-        from ralph2.runner import Ralph2Runner
-
         worktree_info = [
             ({"work_item_id": "ralph-task1"}, "/wt1", "ralph2/ralph-task1"),
             ({"work_item_id": "ralph-task2"}, "/wt2", "ralph2/ralph-task2"),
@@ -516,19 +456,13 @@ class TestRunnerOrchestratorMethods:
             cleaned.append((worktree_path, branch_name))
             return True
 
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-
         with patch('ralph2.runner.remove_worktree', side_effect=mock_remove):
             runner._cleanup_all_worktrees(worktree_info)
 
         assert len(cleaned) == 3
 
-    def test_runner_cleanup_all_worktrees_continues_on_failure(self):
+    def test_runner_cleanup_all_worktrees_continues_on_failure(self, runner):
         """Test _cleanup_all_worktrees continues even if some fail."""
-        from ralph2.runner import Ralph2Runner
-
         worktree_info = [
             ({"work_item_id": "ralph-task1"}, "/wt1", "ralph2/ralph-task1"),
             ({"work_item_id": "ralph-task2"}, "/wt2", "ralph2/ralph-task2"),  # Will fail
@@ -543,10 +477,6 @@ class TestRunnerOrchestratorMethods:
                 return False  # Failure
             return True
 
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-
         with patch('ralph2.runner.remove_worktree', side_effect=mock_remove):
             # Should not raise even though one cleanup fails
             runner._cleanup_all_worktrees(worktree_info)
@@ -559,33 +489,15 @@ class TestRunnerParallelExecutors:
     """Test the refactored _run_parallel_executors method."""
 
     @pytest.mark.asyncio
-    async def test_serial_executors_runs_sequentially(self):
+    async def test_serial_executors_runs_sequentially(self, runner):
         """Test _run_serial_executors runs executors one at a time."""
-        from ralph2.runner import Ralph2Runner, IterationContext
-        from pathlib import Path
-
         execution_order = []
 
-        mock_result = {
-            "status": "Completed",
-            "summary": "Work done",
-            "full_output": "",
-            "messages": [],
-            "result": MagicMock(status="Completed"),
-        }
-
         async def mock_run_executor(**kwargs):
             execution_order.append(kwargs.get("work_item_id"))
-            return mock_result
-
-        # Create runner with mocked project_context
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-        runner.project_context.outputs_dir = Path("/mock/outputs")
-        runner.spec_content = "test spec"
+            return dict(_DEFAULT_EXECUTOR_OUTPUT)
+
         runner.db = MagicMock()
-        runner.output_dir = runner.project_context.outputs_dir
         runner._save_agent_messages = MagicMock(return_value="/mock/output.jsonl")
 
         iter_ctx = IterationContext(
@@ -610,36 +522,18 @@ class TestRunnerParallelExecutors:
         assert execution_order == ["ralph-task1", "ralph-task2", "ralph-task3"]
 
     @pytest.mark.asyncio
-    async def test_serial_executors_continues_after_error(self):
+    async def test_serial_executors_continues_after_error(self, runner):
         """Test serial executors continue running after one fails."""
-        from ralph2.runner import Ralph2Runner, IterationContext
-        from pathlib import Path
-
         execution_order = []
 
-        mock_result = {
-            "status": "Completed",
-            "summary": "Work done",
-            "full_output": "",
-            "messages": [],
-            "result": MagicMock(status="Completed"),
-        }
-
         async def mock_run_executor(**kwargs):
             work_item_id = kwargs.get("work_item_id")
             execution_order.append(work_item_id)
             if work_item_id == "ralph-task2":
                 raise Exception("Executor crashed")
-            return mock_result
-
-        # Create runner with mocked project_context
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-        runner.project_context.outputs_dir = Path("/mock/outputs")
-        runner.spec_content = "test spec"
+            return dict(_DEFAULT_EXECUTOR_OUTPUT)
+
         runner.db = MagicMock()
-        runner.output_dir = runner.project_context.outputs_dir
         runner._save_agent_messages = MagicMock(return_value="/mock/output.jsonl")
 
         iter_ctx = IterationContext(
@@ -665,33 +559,15 @@ class TestRunnerParallelExecutors:
         assert execution_order == ["ralph-task1", "ralph-task2", "ralph-task3"]
 
     @pytest.mark.asyncio
-    async def test_serial_executors_no_worktree_path(self):
+    async def test_serial_executors_no_worktree_path(self, runner):
         """Test serial executors do NOT receive worktree_path parameter."""
-        from ralph2.runner import Ralph2Runner, IterationContext
-        from pathlib import Path
-
         executor_calls = []
 
-        mock_result = {
-            "status": "Completed",
-            "summary": "Work done",
-            "full_output": "",
-            "messages": [],
-            "result": MagicMock(status="Completed"),
-        }
-
         async def mock_run_executor(**kwargs):
             executor_calls.append(kwargs)
-            return mock_result
-
-        # Create runner with mocked project_context
-        runner = Ralph2Runner.__new__(Ralph2Runner)
-        runner.project_context = MagicMock()
-        runner.project_context.project_root = "/mock/repo"
-        runner.project_context.outputs_dir = Path("/mock/outputs")
-        runner.spec_content = "test spec"
+            return dict(_DEFAULT_EXECUTOR_OUTPUT)
+
         runner.db = MagicMock()
-        runner.output_dir = runner.project_context.outputs_dir
         runner._save_agent_messages = MagicMock(return_value="/mock/output.jsonl")
 
         iter_ctx = IterationContext(
@@ -713,3 +589,27 @@ class TestRunnerParallelExecutors:
         # Verify worktree_path was NOT passed (serial execution doesn't use worktrees)
         assert len(executor_calls) == 1
         assert executor_calls[0].get("worktree_path") is None
+
+
+class TestSaveAgentMessages:
+    """Test agent message persistence."""
+
+    def test_save_agent_messages_writes_one_json_line_per_message(self, runner, tmp_path):
+        """Test the JSONL output matches json.dump of each message."""
+        runner.output_dir = tmp_path
+        messages = [{"type": "text", "content": "héllo"}, {"type": "tool", "input": {"n": 1}}, []]
+
+        path = runner._save_agent_messages(3, "executor", messages)
+
+        assert path == str(tmp_path / "iteration_3_executor.jsonl")
+        lines = Path(path).read_text().splitlines()
+        assert [json.loads(line) for line in lines] == messages
+        assert lines[0] == json.dumps(messages[0])
+
+    def test_save_agent_messages_empty(self, runner, tmp_path):
+        """Test saving no messages leaves an empty file."""
+        runner.output_dir = tmp_path
+
+        path = runner._save_agent_messages(1, "planner", [])
+
+        assert Path(path).read_text() == ""
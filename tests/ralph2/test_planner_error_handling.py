@@ -1,95 +1,85 @@
 """Tests for planner error handling.
 
 Verifies that:
-1. Recoverable errors are retried with exponential backoff
+1. Recoverable errors are retried with jittered exponential backoff
 2. Fatal errors fail immediately without retry
 3. Error classification correctly distinguishes recoverable from fatal
 4. Pre-iteration health checks clean stale worktrees
 """
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 
-from ralph2.runner import Ralph2Runner
+from ralph2.runner import Ralph2Runner, classify_error, retry_delays
 from ralph2.project import ProjectContext
 
 
 class TestErrorClassification:
     """Test error classification logic."""
 
-    @pytest.fixture
-    def runner(self, tmp_path):
-        """Create a runner for testing."""
-        spec_file = tmp_path / "Ralph2file"
-        spec_file.write_text("# Test Spec\n\nTest specification.")
-        ctx = ProjectContext(project_root=tmp_path)
-        return Ralph2Runner(str(spec_file), ctx)
-
-    def test_rate_limit_error_is_recoverable(self, runner):
-        """Rate limit errors should be recoverable."""
-        error = Exception("Rate limit exceeded: 429 Too Many Requests")
-        assert runner._is_recoverable_error(error) is True
-        runner.close()
-
-    def test_overloaded_error_is_recoverable(self, runner):
-        """Overloaded service errors should be recoverable."""
-        error = Exception("Service overloaded, please try again")
-        assert runner._is_recoverable_error(error) is True
-        runner.close()
-
-    def test_timeout_error_is_recoverable(self, runner):
-        """Timeout errors should be recoverable."""
-        error = Exception("Request timeout after 30 seconds")
-        assert runner._is_recoverable_error(error) is True
-        runner.close()
-
-    def test_connection_error_is_recoverable(self, runner):
-        """Connection errors should be recoverable."""
-        error = Exception("Connection refused to api.anthropic.com")
-        assert runner._is_recoverable_error(error) is True
-        runner.close()
-
-    def test_503_error_is_recoverable(self, runner):
-        """503 Service Unavailable errors should be recoverable."""
-        error = Exception("HTTP 503 Service Unavailable")
-        assert runner._is_recoverable_error(error) is True
-        runner.close()
-
-    def test_api_key_error_is_fatal(self, runner):
-        """API key errors should be fatal."""
-        error = Exception("Invalid API key provided")
-        assert runner._is_recoverable_error(error) is False
-        runner.close()
-
-    def test_authentication_error_is_fatal(self, runner):
-        """Authentication errors should be fatal."""
-        error = Exception("Authentication failed: invalid credentials")
-        assert runner._is_recoverable_error(error) is False
-        runner.close()
-
-    def test_401_error_is_fatal(self, runner):
-        """401 Unauthorized errors should be fatal."""
-        error = Exception("HTTP 401 Unauthorized")
-        assert runner._is_recoverable_error(error) is False
-        runner.close()
-
-    def test_permission_denied_is_fatal(self, runner):
-        """Permission denied errors should be fatal."""
-        error = Exception("Permission denied: cannot access resource")
-        assert runner._is_recoverable_error(error) is False
-        runner.close()
-
-    def test_file_not_found_is_fatal(self, runner):
-        """File not found errors should be fatal."""
-        error = Exception("File not found: /path/to/spec")
-        assert runner._is_recoverable_error(error) is False
-        runner.close()
-
-    def test_unknown_error_defaults_to_recoverable(self, runner):
-        """Unknown errors should default to recoverable (safer for retry)."""
-        error = Exception("Some weird error that doesn't match any pattern")
-        assert runner._is_recoverable_error(error) is True
-        runner.close()
+    @pytest.mark.parametrize("message, recoverable", [
+        pytest.param("Rate limit exceeded: 429 Too Many Requests", True, id="rate_limit_error_is_recoverable"),
+        pytest.param("Service overloaded, please try again", True, id="overloaded_error_is_recoverable"),
+        pytest.param("Request timeout after 30 seconds", True, id="timeout_error_is_recoverable"),
+        pytest.param("Connection refused to api.anthropic.com", True, id="connection_error_is_recoverable"),
+        pytest.param("HTTP 503 Service Unavailable", True, id="503_error_is_recoverable"),
+        pytest.param("Invalid API key provided", False, id="api_key_error_is_fatal"),
+        pytest.param("Authentication failed: invalid credentials", False, id="authentication_error_is_fatal"),
+        pytest.param("HTTP 401 Unauthorized", False, id="401_error_is_fatal"),
+        pytest.param("Permission denied: cannot access resource", False, id="permission_denied_is_fatal"),
+        pytest.param("File not found: /path/to/spec", False, id="file_not_found_is_fatal"),
+        pytest.param("Some weird error that doesn't match any pattern", True, id="unknown_error_defaults_to_recoverable"),
+    ])
+    def test_classification(self, message, recoverable):
+        """Transient failures are retried; auth, permission and missing-file errors are fatal.
+
+        Unknown errors default to recoverable (safer for retry).
+        """
+        assert classify_error(Exception(message)) is recoverable
+
+    def test_fatal_pattern_wins_over_recoverable_pattern(self):
+        """A fatal pattern makes the error fatal even if it also looks transient."""
+        error = Exception("Connection reset while checking API KEY: 401")
+        assert classify_error(error) is False
+
+    def test_fatal_patterns_are_case_insensitive(self):
+        """Fatal patterns match regardless of case."""
+        assert classify_error(Exception("UNAUTHORIZED")) is False
+        assert classify_error(Exception("No Such File or directory: spec.md")) is False
+
+    @pytest.mark.parametrize("error, recoverable", [
+        pytest.param(TimeoutError(), True, id="timeout_type_is_recoverable"),
+        pytest.param(asyncio.TimeoutError(), True, id="asyncio_timeout_type_is_recoverable"),
+        pytest.param(ConnectionResetError("Permission denied by peer"), True, id="connection_type_wins_over_message"),
+        pytest.param(PermissionError("retry later"), False, id="permission_type_is_fatal"),
+        pytest.param(FileNotFoundError("Connection timeout"), False, id="file_not_found_type_wins_over_message"),
+        pytest.param(type("ApiTimeout", (TimeoutError,), {})("401"), True, id="subclass_uses_nearest_listed_base"),
+    ])
+    def test_classification_by_type(self, error, recoverable):
+        """Known exception types are classified before the message is inspected."""
+        assert classify_error(error) is recoverable
+
+    def test_runner_delegates_to_classify_error(self):
+        """Ralph2Runner._is_recoverable_error uses the module-level classifier."""
+        runner = Ralph2Runner.__new__(Ralph2Runner)
+        with patch('ralph2.runner.classify_error', return_value=False) as classify:
+            assert runner._is_recoverable_error(Exception("Rate limit exceeded")) is False
+        classify.assert_called_once()
+
+
+def _planner_ctx():
+    """Plain stand-in for the IterationContext fields the planner retry reads."""
+    return SimpleNamespace(
+        run_id="test-run-id",
+        iteration_number=1,
+        memory="",
+        last_executor_summary=None,
+        last_verifier_assessment=None,
+        last_specialist_feedback=None,
+    )
 
 
 class TestPlannerRetry:
@@ -103,12 +93,17 @@ class TestPlannerRetry:
         ctx = ProjectContext(project_root=tmp_path)
         return ctx, str(spec_file)
 
-    @pytest.mark.asyncio
-    async def test_planner_retries_on_recoverable_error(self, temp_project):
-        """Test that planner retries on recoverable errors."""
+    @pytest.fixture
+    def runner(self, temp_project):
+        """Create a runner for one test; each test patches run_planner."""
         ctx, spec_file = temp_project
         runner = Ralph2Runner(spec_file, ctx)
+        yield runner
+        runner.close()
 
+    @pytest.mark.asyncio
+    async def test_planner_retries_on_recoverable_error(self, runner):
+        """Test that planner retries on recoverable errors."""
         call_count = [0]
 
         async def mock_planner(**kwargs):
@@ -121,12 +116,7 @@ class TestPlannerRetry:
                 "messages": []
             }
 
-        mock_ctx = MagicMock()
-        mock_ctx.run_id = "test-run-id"
-        mock_ctx.iteration_number = 1
-        mock_ctx.last_executor_summary = None
-        mock_ctx.last_verifier_assessment = None
-        mock_ctx.last_specialist_feedback = None
+        mock_ctx = _planner_ctx()
 
         with patch('ralph2.runner.run_planner', side_effect=mock_planner):
             with patch('asyncio.sleep', new_callable=AsyncMock):
@@ -138,26 +128,16 @@ class TestPlannerRetry:
         assert result is not None
         assert error is None
 
-        runner.close()
-
     @pytest.mark.asyncio
-    async def test_planner_fails_immediately_on_fatal_error(self, temp_project):
+    async def test_planner_fails_immediately_on_fatal_error(self, runner):
         """Test that planner fails immediately on fatal errors without retry."""
-        ctx, spec_file = temp_project
-        runner = Ralph2Runner(spec_file, ctx)
-
         call_count = [0]
 
         async def mock_planner(**kwargs):
             call_count[0] += 1
             raise Exception("Invalid API key")
 
-        mock_ctx = MagicMock()
-        mock_ctx.run_id = "test-run-id"
-        mock_ctx.iteration_number = 1
-        mock_ctx.last_executor_summary = None
-        mock_ctx.last_verifier_assessment = None
-        mock_ctx.last_specialist_feedback = None
+        mock_ctx = _planner_ctx()
 
         with patch('ralph2.runner.run_planner', side_effect=mock_planner):
             with patch.object(runner, '_build_iteration_history', return_value=[]):
@@ -169,26 +149,16 @@ class TestPlannerRetry:
         assert error is not None
         assert "API key" in str(error)
 
-        runner.close()
-
     @pytest.mark.asyncio
-    async def test_planner_returns_error_after_max_retries(self, temp_project):
+    async def test_planner_returns_error_after_max_retries(self, runner):
         """Test that planner returns error after exhausting all retries."""
-        ctx, spec_file = temp_project
-        runner = Ralph2Runner(spec_file, ctx)
-
         call_count = [0]
 
         async def always_fail(**kwargs):
             call_count[0] += 1
             raise Exception("Connection timeout")
 
-        mock_ctx = MagicMock()
-        mock_ctx.run_id = "test-run-id"
-        mock_ctx.iteration_number = 1
-        mock_ctx.last_executor_summary = None
-        mock_ctx.last_verifier_assessment = None
-        mock_ctx.last_specialist_feedback = None
+        mock_ctx = _planner_ctx()
 
         with patch('ralph2.runner.run_planner', side_effect=always_fail):
             with patch('asyncio.sleep', new_callable=AsyncMock):
@@ -200,14 +170,9 @@ class TestPlannerRetry:
         assert result is None
         assert error is not None
 
-        runner.close()
-
     @pytest.mark.asyncio
-    async def test_planner_succeeds_on_first_try(self, temp_project):
+    async def test_planner_succeeds_on_first_try(self, runner):
         """Test that planner returns immediately on first successful call."""
-        ctx, spec_file = temp_project
-        runner = Ralph2Runner(spec_file, ctx)
-
         call_count = [0]
 
         async def succeed_immediately(**kwargs):
@@ -218,12 +183,7 @@ class TestPlannerRetry:
                 "messages": []
             }
 
-        mock_ctx = MagicMock()
-        mock_ctx.run_id = "test-run-id"
-        mock_ctx.iteration_number = 1
-        mock_ctx.last_executor_summary = None
-        mock_ctx.last_verifier_assessment = None
-        mock_ctx.last_specialist_feedback = None
+        mock_ctx = _planner_ctx()
 
         with patch('ralph2.runner.run_planner', side_effect=succeed_immediately):
             with patch.object(runner, '_build_iteration_history', return_value=[]):
@@ -234,7 +194,45 @@ class TestPlannerRetry:
         assert result is not None
         assert error is None
 
-        runner.close()
+    @pytest.mark.asyncio
+    async def test_planner_sleeps_follow_precomputed_schedule(self, runner):
+        """Test that retry waits come from the runner's precomputed delays."""
+        async def always_fail(**kwargs):
+            raise Exception("Connection timeout")
+
+        mock_ctx = _planner_ctx()
+
+        with patch('ralph2.runner.run_planner', side_effect=always_fail):
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                with patch.object(runner, '_build_iteration_history', return_value=[]):
+                    await runner._run_planner_with_retry(mock_ctx, [], max_retries=4)
+
+        waits = [call.args[0] for call in mock_sleep.await_args_list]
+        schedule = runner._retry_delays
+        assert waits == [schedule[0], schedule[1], schedule[-1]]
+
+
+class TestRetryDelays:
+    """Test the decorrelated-jitter backoff schedule."""
+
+    def test_delays_stay_between_base_and_cap(self):
+        """Test that every delay is within [base, cap]."""
+        delays = retry_delays(50, base=1.0, cap=8.0)
+
+        assert len(delays) == 50
+        assert all(1.0 <= d <= 8.0 for d in delays)
+
+    def test_each_delay_bounded_by_three_times_previous(self):
+        """Test that a delay never exceeds three times the one before it."""
+        delays = retry_delays(20, base=0.5, cap=100.0)
+
+        assert delays[0] <= 1.5
+        for previous, current in zip(delays, delays[1:]):
+            assert current <= previous * 3
+
+    def test_zero_count_is_empty(self):
+        """Test that no delays are produced for a count of zero."""
+        assert retry_delays(0) == []
 
 
 class TestPreIterationHealthCheck:
@@ -248,20 +246,31 @@ class TestPreIterationHealthCheck:
         ctx = ProjectContext(project_root=tmp_path)
         return ctx, str(spec_file)
 
-    @pytest.mark.asyncio
-    async def test_planner_phase_cleans_stale_worktrees(self, temp_project):
-        """Test that planner phase runs cleanup before starting."""
+    @pytest.fixture
+    def runner(self, temp_project):
+        """Create a runner for one test."""
         ctx, spec_file = temp_project
         runner = Ralph2Runner(spec_file, ctx)
+        yield runner
+        runner.close()
+
+    @pytest.fixture
+    def stubbed_runner(self, runner, monkeypatch):
+        """Runner whose planner-output persistence is a no-op."""
+        monkeypatch.setattr(runner.db, "create_agent_output", lambda *a, **k: None)
+        monkeypatch.setattr(runner, "_save_agent_messages", lambda *a, **k: "/tmp/test")
+        return runner
 
+    @pytest.mark.asyncio
+    async def test_planner_phase_cleans_stale_worktrees(self, stubbed_runner, monkeypatch):
+        """Test that planner phase runs cleanup before starting."""
         cleanup_called = [False]
-        original_cleanup = runner._cleanup_abandoned_branches
 
         def tracking_cleanup():
             cleanup_called[0] = True
             # Don't actually run cleanup in test
 
-        runner._cleanup_abandoned_branches = tracking_cleanup
+        monkeypatch.setattr(stubbed_runner, "_cleanup_abandoned_branches", tracking_cleanup)
 
         mock_ctx = MagicMock()
         mock_ctx.iteration_id = 1
@@ -277,12 +286,52 @@ class TestPreIterationHealthCheck:
                 "messages": []
             }
 
-        with patch('ralph2.runner.run_planner', side_effect=mock_planner):
-            with patch.object(runner.db, 'create_agent_output'):
-                with patch.object(runner, '_save_agent_messages', return_value='/tmp/test'):
-                    await runner._run_planner_phase(mock_ctx, [])
+        monkeypatch.setattr("ralph2.runner.run_planner", mock_planner)
+        await stubbed_runner._run_planner_phase(mock_ctx, [])
 
         # Cleanup should have been called at the start of the phase
         assert cleanup_called[0], "Pre-iteration cleanup should be called"
 
-        runner.close()
+    def test_cleanup_skips_worktree_listing_without_linked_worktrees(self, temp_project, runner, monkeypatch):
+        """Test that `git worktree list` isn't spawned when .git/worktrees is empty."""
+        ctx, _ = temp_project
+        (ctx.project_root / ".git" / "worktrees").mkdir(parents=True, exist_ok=True)
+
+        calls = []
+
+        def fake_list_git(args, cwd):
+            calls.append(tuple(args))
+            return MagicMock(returncode=0, stdout="")
+
+        monkeypatch.setattr(runner, '_list_git', fake_list_git)
+        runner._cleanup_abandoned_branches()
+
+        assert calls == [("branch", "--list", "ralph2/*")]
+
+    def test_cleanup_lists_worktrees_when_some_are_registered(self, temp_project, runner, monkeypatch):
+        """Test that worktree cleanup still runs when a linked worktree is registered."""
+        ctx, _ = temp_project
+        registered = ctx.project_root / ".git" / "worktrees" / "ralph2-executor-x"
+        registered.mkdir(parents=True, exist_ok=True)
+
+        calls = []
+
+        def fake_list_git(args, cwd):
+            calls.append(tuple(args))
+            return MagicMock(returncode=0, stdout="")
+
+        monkeypatch.setattr(runner, '_list_git', fake_list_git)
+        try:
+            runner._cleanup_abandoned_branches()
+        finally:
+            registered.rmdir()
+
+        assert ("worktree", "list", "--porcelain") in calls
+        assert ("branch", "--list", "ralph2/*") in calls
+
+    def test_has_linked_worktrees_without_git_dir_defers_to_git(self, tmp_path):
+        """Test that a missing/non-directory .git answers True so git decides."""
+        assert Ralph2Runner._has_linked_worktrees(tmp_path) is True
+
+        (tmp_path / ".git").mkdir()
+        assert Ralph2Runner._has_linked_worktrees(tmp_path) is False
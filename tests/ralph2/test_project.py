@@ -1,15 +1,15 @@
 """Unit tests for project.py - Project identification and path management."""
 
 import pytest
-import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-import uuid
+import re
 
 from ralph2.project import (
     RALPH2_ID_FILENAME,
     RALPH2_HOME,
     RALPH2_PROJECTS_DIR,
+    clear_project_root_cache,
     find_project_root,
     get_project_id,
     get_project_state_dir,
@@ -24,6 +24,16 @@ from ralph2.project import (
 )
 
 
+# Canonical lowercase UUID v4 string
+UUID4_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}")
+
+
+@pytest.fixture
+def projects_dir(ralph2_home):
+    """Projects directory under the per-test RALPH2_HOME (see conftest.py)."""
+    return ralph2_home / "projects"
+
+
 class TestConstants:
     """Tests for module constants."""
 
@@ -43,98 +53,134 @@ class TestConstants:
 class TestFindProjectRoot:
     """Tests for find_project_root function."""
 
-    def test_find_project_root_with_ralph2file_in_current_dir(self):
+    def test_find_project_root_with_ralph2file_in_current_dir(self, tmp_path):
         """Test finding project root when Ralph2file is in current directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir).resolve()
-            (project_root / "Ralph2file").write_text("# Test Spec")
+        project_root = tmp_path.resolve()
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            result = find_project_root(project_root)
+        result = find_project_root(project_root)
 
-            assert result.resolve() == project_root.resolve()
+        assert result.resolve() == project_root.resolve()
 
-    def test_find_project_root_in_parent_directory(self):
+    def test_find_project_root_in_parent_directory(self, tmp_path):
         """Test finding project root in parent directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir).resolve()
-            (project_root / "Ralph2file").write_text("# Test Spec")
+        project_root = tmp_path.resolve()
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            # Create nested directory
-            nested = project_root / "src" / "components"
-            nested.mkdir(parents=True)
+        # Create nested directory
+        nested = project_root / "src" / "components"
+        nested.mkdir(parents=True)
 
-            result = find_project_root(nested)
+        result = find_project_root(nested)
 
-            assert result.resolve() == project_root.resolve()
+        assert result.resolve() == project_root.resolve()
 
-    def test_find_project_root_returns_none_when_not_found(self):
+    def test_find_project_root_returns_none_when_not_found(self, tmp_path):
         """Test returns None when no Ralph2file found."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            empty_dir = Path(tmpdir)
+        empty_dir = tmp_path
 
-            result = find_project_root(empty_dir)
+        result = find_project_root(empty_dir)
 
-            assert result is None
+        assert result is None
 
-    def test_find_project_root_uses_cwd_when_no_start_path(self):
+    def test_find_project_root_uses_cwd_when_no_start_path(self, tmp_path):
         """Test uses current working directory when no start path provided."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir).resolve()
-            (project_root / "Ralph2file").write_text("# Test Spec")
+        project_root = tmp_path.resolve()
+        (project_root / "Ralph2file").write_text("# Test Spec")
+
+        with patch('pathlib.Path.cwd', return_value=project_root):
+            result = find_project_root()
+
+            assert result.resolve() == project_root.resolve()
+
+    def test_find_project_root_reuses_cached_root(self, tmp_path):
+        """Test a repeat lookup checks only the cached root's Ralph2file."""
+        project_root = tmp_path.resolve()
+        (project_root / "Ralph2file").write_text("# Test Spec")
+        nested = project_root / "a" / "b" / "c"
+        nested.mkdir(parents=True)
+        assert find_project_root(nested) == project_root
+
+        with patch.object(Path, 'exists', autospec=True, side_effect=Path.exists) as exists:
+            assert find_project_root(nested) == project_root
+
+        assert [call.args[0] for call in exists.call_args_list] == [project_root / "Ralph2file"]
 
-            with patch('pathlib.Path.cwd', return_value=project_root):
-                result = find_project_root()
+    def test_find_project_root_rewalks_when_cached_spec_removed(self, tmp_path):
+        """Test a cached root whose Ralph2file disappeared is not returned."""
+        outer = tmp_path.resolve()
+        inner = outer / "inner"
+        inner.mkdir()
+        (outer / "Ralph2file").write_text("# Outer")
+        (inner / "Ralph2file").write_text("# Inner")
+        assert find_project_root(inner) == inner
 
-                assert result.resolve() == project_root.resolve()
+        (inner / "Ralph2file").unlink()
+
+        assert find_project_root(inner) == outer
+
+    def test_find_project_root_does_not_cache_misses(self, tmp_path):
+        """Test a Ralph2file created after a failed lookup is found."""
+        project_root = tmp_path.resolve()
+        assert find_project_root(project_root) is None
+
+        (project_root / "Ralph2file").write_text("# Test Spec")
+
+        assert find_project_root(project_root) == project_root
+
+    def test_clear_project_root_cache(self, tmp_path):
+        """Test clearing the cache forces a fresh walk."""
+        outer = tmp_path.resolve()
+        inner = outer / "inner"
+        inner.mkdir()
+        (outer / "Ralph2file").write_text("# Outer")
+        assert find_project_root(inner) == outer
+
+        # A closer Ralph2file is only seen once the cache is cleared
+        (inner / "Ralph2file").write_text("# Inner")
+        assert find_project_root(inner) == outer
+        clear_project_root_cache()
+        assert find_project_root(inner) == inner
 
 
 class TestGetProjectId:
     """Tests for get_project_id function."""
 
-    def test_get_project_id_creates_new_id(self):
+    def test_get_project_id_creates_new_id(self, tmp_path):
         """Test creating new project ID when none exists."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
+        project_root = tmp_path
 
-            project_id = get_project_id(project_root)
+        project_id = get_project_id(project_root)
 
-            # Should be a valid UUID format
-            try:
-                uuid.UUID(project_id)
-            except ValueError:
-                pytest.fail(f"Invalid UUID format: {project_id}")
+        # Should be a valid UUID format
+        assert UUID4_RE.fullmatch(project_id), f"Invalid UUID format: {project_id}"
 
-            # Should write the ID to file
-            id_file = project_root / RALPH2_ID_FILENAME
-            assert id_file.exists()
-            assert id_file.read_text().strip() == project_id
+        # Should write the ID to file
+        id_file = project_root / RALPH2_ID_FILENAME
+        assert id_file.exists()
+        assert id_file.read_text().strip() == project_id
 
-    def test_get_project_id_reads_existing_id(self):
+    def test_get_project_id_reads_existing_id(self, tmp_path):
         """Test reading existing project ID."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            expected_id = "existing-uuid-12345"
-            (project_root / RALPH2_ID_FILENAME).write_text(expected_id + "\n")
+        project_root = tmp_path
+        expected_id = "existing-uuid-12345"
+        (project_root / RALPH2_ID_FILENAME).write_text(expected_id + "\n")
 
-            project_id = get_project_id(project_root)
+        project_id = get_project_id(project_root)
 
-            assert project_id == expected_id
+        assert project_id == expected_id
 
-    def test_get_project_id_regenerates_if_empty(self):
+    def test_get_project_id_regenerates_if_empty(self, tmp_path):
         """Test regenerating ID if file is empty."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / RALPH2_ID_FILENAME).write_text("")
+        project_root = tmp_path
+        (project_root / RALPH2_ID_FILENAME).write_text("")
 
-            project_id = get_project_id(project_root)
+        project_id = get_project_id(project_root)
 
-            # Should have generated a new valid UUID
-            try:
-                uuid.UUID(project_id)
-            except ValueError:
-                pytest.fail(f"Invalid UUID format: {project_id}")
+        # Should have generated a new valid UUID
+        assert UUID4_RE.fullmatch(project_id), f"Invalid UUID format: {project_id}"
 
-    def test_get_project_id_uses_atomic_write(self):
+    def test_get_project_id_uses_atomic_write(self, tmp_path):
         """Test that get_project_id uses atomic write (temp file + rename).
 
         This ensures concurrent processes don't corrupt the ID file.
@@ -142,36 +188,34 @@ class TestGetProjectId:
         interrupted mid-write, either the old file exists completely or
         the new file exists completely.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            id_path = project_root / RALPH2_ID_FILENAME
+        project_root = tmp_path
+        id_path = project_root / RALPH2_ID_FILENAME
 
-            # Generate a new project ID
-            project_id = get_project_id(project_root)
+        # Generate a new project ID
+        project_id = get_project_id(project_root)
 
-            # The file should exist with complete content (no partial writes)
-            assert id_path.exists()
-            content = id_path.read_text()
-            # Should have the UUID followed by newline
-            assert content.strip() == project_id
-            # Verify it's a valid UUID
-            uuid.UUID(project_id)
+        # The file should exist with complete content (no partial writes)
+        assert id_path.exists()
+        content = id_path.read_text()
+        # Should have the UUID followed by newline
+        assert content.strip() == project_id
+        # Verify it's a valid UUID
+        assert UUID4_RE.fullmatch(project_id)
 
-    def test_get_project_id_atomic_write_no_temp_files_left(self):
+    def test_get_project_id_atomic_write_no_temp_files_left(self, tmp_path):
         """Test that atomic write doesn't leave temp files behind."""
         import os
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
+        project_root = tmp_path
 
-            # Generate a new project ID
-            get_project_id(project_root)
+        # Generate a new project ID
+        get_project_id(project_root)
 
-            # Should only have the .ralph2-id file, no temp files
-            files = list(project_root.iterdir())
-            assert len(files) == 1
-            assert files[0].name == RALPH2_ID_FILENAME
+        # Should only have the .ralph2-id file, no temp files
+        files = list(project_root.iterdir())
+        assert len(files) == 1
+        assert files[0].name == RALPH2_ID_FILENAME
 
-    def test_get_project_id_uses_atomic_write_pattern(self):
+    def test_get_project_id_uses_atomic_write_pattern(self, tmp_path):
         """Test that atomic write uses temp file + link/rename pattern.
 
         This test mocks os.link to verify atomic file creation is used.
@@ -179,267 +223,236 @@ class TestGetProjectId:
         because it will fail if the target already exists.
         """
         import os
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            id_path = project_root / RALPH2_ID_FILENAME
+        project_root = tmp_path
+        id_path = project_root / RALPH2_ID_FILENAME
 
-            # Track if os.link was called (preferred atomic pattern)
-            original_link = os.link
-            link_called = []
+        # Track if os.link was called (preferred atomic pattern)
+        original_link = os.link
+        link_called = []
 
-            def mock_link(src, dst):
-                link_called.append((src, dst))
-                return original_link(src, dst)
+        def mock_link(src, dst):
+            link_called.append((src, dst))
+            return original_link(src, dst)
 
-            with patch('os.link', side_effect=mock_link):
-                project_id = get_project_id(project_root)
+        with patch('os.link', side_effect=mock_link):
+            project_id = get_project_id(project_root)
 
-            # os.link should have been called with temp file -> target
-            assert len(link_called) == 1, "os.link should be called once for atomic file creation"
-            src, dst = link_called[0]
-            assert str(dst) == str(id_path), f"Target should be {id_path}, got {dst}"
-            # Source should be a temp file in same directory
-            assert str(project_root) in str(src), "Temp file should be in same directory"
+        # os.link should have been called with temp file -> target
+        assert len(link_called) == 1, "os.link should be called once for atomic file creation"
+        src, dst = link_called[0]
+        assert str(dst) == str(id_path), f"Target should be {id_path}, got {dst}"
+        # Source should be a temp file in same directory
+        assert str(project_root) in str(src), "Temp file should be in same directory"
 
 
 class TestGetProjectStateDir:
     """Tests for get_project_state_dir function."""
 
-    def test_get_project_state_dir_creates_directory(self):
+    def test_get_project_state_dir_creates_directory(self, projects_dir):
         """Test that state directory is created."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Mock RALPH2_PROJECTS_DIR to be in temp directory
-            mock_projects_dir = Path(tmpdir) / "projects"
-
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-123"
-                state_dir = get_project_state_dir(project_id)
+        project_id = "test-uuid-123"
+        state_dir = get_project_state_dir(project_id)
 
-                assert state_dir == mock_projects_dir / project_id
-                assert state_dir.exists()
+        assert state_dir == projects_dir / project_id
+        assert state_dir.exists()
 
     def test_get_project_state_dir_is_idempotent(self):
         """Test that calling multiple times returns same path."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
+        project_id = "test-uuid-456"
+        state_dir1 = get_project_state_dir(project_id)
+        state_dir2 = get_project_state_dir(project_id)
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-456"
-                state_dir1 = get_project_state_dir(project_id)
-                state_dir2 = get_project_state_dir(project_id)
+        assert state_dir1 == state_dir2
 
-                assert state_dir1 == state_dir2
+    def test_get_project_state_dir_creates_directory_once(self):
+        """Test repeat calls skip the mkdir for a directory already created."""
+        get_project_state_dir("test-uuid-once")
+
+        with patch.object(Path, 'mkdir') as mkdir:
+            get_project_state_dir("test-uuid-once")
+            get_project_outputs_dir("test-uuid-once")
+            get_project_outputs_dir("test-uuid-once")
+
+        # Only the first outputs_dir request needs a mkdir
+        assert mkdir.call_count == 1
+
+    def test_get_project_state_dir_defaults_to_home_without_env(self, tmp_path, monkeypatch):
+        """Test RALPH2_PROJECTS_DIR is used when RALPH2_HOME is not set."""
+        monkeypatch.delenv("RALPH2_HOME")
+        monkeypatch.setattr('ralph2.project.RALPH2_PROJECTS_DIR', tmp_path / "default")
+
+        state_dir = get_project_state_dir("test-uuid-default")
+
+        assert state_dir == tmp_path / "default" / "test-uuid-default"
 
 
 class TestGetProjectDbPath:
     """Tests for get_project_db_path function."""
 
-    def test_get_project_db_path_returns_correct_path(self):
+    def test_get_project_db_path_returns_correct_path(self, projects_dir):
         """Test correct database path is returned."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
-
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-789"
-                db_path = get_project_db_path(project_id)
+        project_id = "test-uuid-789"
+        db_path = get_project_db_path(project_id)
 
-                assert db_path == mock_projects_dir / project_id / "ralph2.db"
+        assert db_path == projects_dir / project_id / "ralph2.db"
 
 
 class TestGetProjectOutputsDir:
     """Tests for get_project_outputs_dir function."""
 
-    def test_get_project_outputs_dir_creates_directory(self):
+    def test_get_project_outputs_dir_creates_directory(self, projects_dir):
         """Test that outputs directory is created."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
+        project_id = "test-uuid-outputs"
+        outputs_dir = get_project_outputs_dir(project_id)
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-outputs"
-                outputs_dir = get_project_outputs_dir(project_id)
-
-                assert outputs_dir == mock_projects_dir / project_id / "outputs"
-                assert outputs_dir.exists()
+        assert outputs_dir == projects_dir / project_id / "outputs"
+        assert outputs_dir.exists()
 
 
 class TestGetProjectSummariesDir:
     """Tests for get_project_summaries_dir function."""
 
-    def test_get_project_summaries_dir_creates_directory(self):
+    def test_get_project_summaries_dir_creates_directory(self, projects_dir):
         """Test that summaries directory is created."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
-
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-summaries"
-                summaries_dir = get_project_summaries_dir(project_id)
+        project_id = "test-uuid-summaries"
+        summaries_dir = get_project_summaries_dir(project_id)
 
-                assert summaries_dir == mock_projects_dir / project_id / "summaries"
-                assert summaries_dir.exists()
+        assert summaries_dir == projects_dir / project_id / "summaries"
+        assert summaries_dir.exists()
 
 
 class TestGetMemoryPath:
     """Tests for get_memory_path function."""
 
-    def test_get_memory_path_returns_correct_path(self):
+    def test_get_memory_path_returns_correct_path(self, projects_dir):
         """Test correct memory file path is returned."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
-
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-memory"
-                memory_path = get_memory_path(project_id)
+        project_id = "test-uuid-memory"
+        memory_path = get_memory_path(project_id)
 
-                assert memory_path == mock_projects_dir / project_id / "memory.md"
+        assert memory_path == projects_dir / project_id / "memory.md"
 
 
 class TestReadWriteMemory:
     """Tests for read_memory and write_memory functions."""
 
-    def test_read_memory_returns_empty_string_when_no_file(self):
+    def test_read_memory_returns_empty_string_when_no_file(self, projects_dir):
         """Test reading memory returns empty string when file doesn't exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
+        project_id = "test-uuid-no-memory"
+        # Create state dir but not memory file
+        (projects_dir / project_id).mkdir(parents=True)
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-no-memory"
-                # Create state dir but not memory file
-                (mock_projects_dir / project_id).mkdir(parents=True)
+        content = read_memory(project_id)
 
-                content = read_memory(project_id)
+        assert content == ""
 
-                assert content == ""
-
-    def test_read_memory_returns_file_content(self):
+    def test_read_memory_returns_file_content(self, projects_dir):
         """Test reading memory returns file content."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
-
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-with-memory"
-                state_dir = mock_projects_dir / project_id
-                state_dir.mkdir(parents=True)
-                (state_dir / "memory.md").write_text("# Memory Content\nSome notes.")
+        project_id = "test-uuid-with-memory"
+        state_dir = projects_dir / project_id
+        state_dir.mkdir(parents=True)
+        (state_dir / "memory.md").write_text("# Memory Content\nSome notes.")
 
-                content = read_memory(project_id)
+        content = read_memory(project_id)
 
-                assert "# Memory Content" in content
-                assert "Some notes." in content
+        assert "# Memory Content" in content
+        assert "Some notes." in content
 
-    def test_write_memory_creates_file(self):
+    def test_write_memory_creates_file(self, projects_dir):
         """Test writing memory creates file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
-
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-write-memory"
+        project_id = "test-uuid-write-memory"
 
-                write_memory(project_id, "# New Memory\nNew content.")
+        write_memory(project_id, "# New Memory\nNew content.")
 
-                memory_path = mock_projects_dir / project_id / "memory.md"
-                assert memory_path.exists()
-                assert "# New Memory" in memory_path.read_text()
+        memory_path = projects_dir / project_id / "memory.md"
+        assert memory_path.exists()
+        assert "# New Memory" in memory_path.read_text()
 
-    def test_write_memory_overwrites_existing(self):
+    def test_write_memory_overwrites_existing(self, projects_dir):
         """Test writing memory overwrites existing content."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mock_projects_dir = Path(tmpdir) / "projects"
+        project_id = "test-uuid-overwrite"
+        state_dir = projects_dir / project_id
+        state_dir.mkdir(parents=True)
+        (state_dir / "memory.md").write_text("Old content")
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                project_id = "test-uuid-overwrite"
-                state_dir = mock_projects_dir / project_id
-                state_dir.mkdir(parents=True)
-                (state_dir / "memory.md").write_text("Old content")
+        write_memory(project_id, "New content")
 
-                write_memory(project_id, "New content")
-
-                assert read_memory(project_id) == "New content"
+        assert read_memory(project_id) == "New content"
 
 
 class TestEnsureRalph2IdInGitignore:
     """Tests for ensure_ralph2_id_in_gitignore function."""
 
-    def test_adds_to_empty_gitignore(self):
+    def test_adds_to_empty_gitignore(self, tmp_path):
         """Test adding .ralph2-id to empty gitignore."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            gitignore = project_root / ".gitignore"
-            gitignore.write_text("")
+        project_root = tmp_path
+        gitignore = project_root / ".gitignore"
+        gitignore.write_text("")
 
-            result = ensure_ralph2_id_in_gitignore(project_root)
+        result = ensure_ralph2_id_in_gitignore(project_root)
 
-            assert result is True
-            assert RALPH2_ID_FILENAME in gitignore.read_text()
+        assert result is True
+        assert RALPH2_ID_FILENAME in gitignore.read_text()
 
-    def test_adds_to_nonexistent_gitignore(self):
+    def test_adds_to_nonexistent_gitignore(self, tmp_path):
         """Test adding .ralph2-id when gitignore doesn't exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
+        project_root = tmp_path
 
-            result = ensure_ralph2_id_in_gitignore(project_root)
+        result = ensure_ralph2_id_in_gitignore(project_root)
 
-            assert result is True
-            gitignore = project_root / ".gitignore"
-            assert gitignore.exists()
-            assert RALPH2_ID_FILENAME in gitignore.read_text()
+        assert result is True
+        gitignore = project_root / ".gitignore"
+        assert gitignore.exists()
+        assert RALPH2_ID_FILENAME in gitignore.read_text()
 
-    def test_does_not_duplicate(self):
+    def test_does_not_duplicate(self, tmp_path):
         """Test doesn't add duplicate .ralph2-id entry."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            gitignore = project_root / ".gitignore"
-            gitignore.write_text(f"{RALPH2_ID_FILENAME}\nother_ignore\n")
+        project_root = tmp_path
+        gitignore = project_root / ".gitignore"
+        gitignore.write_text(f"{RALPH2_ID_FILENAME}\nother_ignore\n")
 
-            result = ensure_ralph2_id_in_gitignore(project_root)
+        result = ensure_ralph2_id_in_gitignore(project_root)
 
-            assert result is False
-            # Should not have duplicated the entry
-            content = gitignore.read_text()
-            assert content.count(RALPH2_ID_FILENAME) == 1
+        assert result is False
+        # Should not have duplicated the entry
+        content = gitignore.read_text()
+        assert content.count(RALPH2_ID_FILENAME) == 1
 
-    def test_appends_newline_if_needed(self):
+    def test_appends_newline_if_needed(self, tmp_path):
         """Test appends newline before adding entry if needed."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            gitignore = project_root / ".gitignore"
-            gitignore.write_text("*.log")  # No trailing newline
+        project_root = tmp_path
+        gitignore = project_root / ".gitignore"
+        gitignore.write_text("*.log")  # No trailing newline
 
-            ensure_ralph2_id_in_gitignore(project_root)
+        ensure_ralph2_id_in_gitignore(project_root)
 
-            content = gitignore.read_text()
-            # Should have newline before .ralph2-id
-            assert "*.log\n.ralph2-id" in content
+        content = gitignore.read_text()
+        # Should have newline before .ralph2-id
+        assert "*.log\n.ralph2-id" in content
 
 
 class TestProjectContext:
     """Tests for ProjectContext class."""
 
-    def test_init_with_explicit_project_root(self):
+    def test_init_with_explicit_project_root(self, tmp_path):
         """Test initializing with explicit project root."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / "Ralph2file").write_text("# Test Spec")
-            mock_projects_dir = Path(tmpdir) / ".ralph2" / "projects"
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                ctx = ProjectContext(project_root)
+        ctx = ProjectContext(project_root)
 
-                assert ctx.project_root == project_root
-                assert ctx.project_id is not None
-                assert ctx.state_dir.exists()
+        assert ctx.project_root == project_root
+        assert ctx.project_id is not None
+        assert ctx.state_dir.exists()
 
-    def test_init_searches_for_ralph2file(self):
+    def test_init_searches_for_ralph2file(self, tmp_path):
         """Test initialization searches for Ralph2file if no root provided."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / "Ralph2file").write_text("# Test Spec")
-            mock_projects_dir = Path(tmpdir) / ".ralph2" / "projects"
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                with patch('ralph2.project.find_project_root', return_value=project_root):
-                    ctx = ProjectContext()
+        with patch('ralph2.project.find_project_root', return_value=project_root):
+            ctx = ProjectContext()
 
-                    assert ctx.project_root == project_root
+            assert ctx.project_root == project_root
 
     def test_init_raises_if_no_ralph2file(self):
         """Test initialization raises ValueError if no Ralph2file found."""
@@ -449,68 +462,92 @@ class TestProjectContext:
 
             assert "No Ralph2file found" in str(exc_info.value)
 
-    def test_db_path_property(self):
+    def test_db_path_property(self, tmp_path):
         """Test db_path property returns correct path."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / "Ralph2file").write_text("# Test Spec")
-            mock_projects_dir = Path(tmpdir) / ".ralph2" / "projects"
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                ctx = ProjectContext(project_root)
+        ctx = ProjectContext(project_root)
 
-                assert ctx.db_path == ctx.state_dir / "ralph2.db"
+        assert ctx.db_path == ctx.state_dir / "ralph2.db"
 
-    def test_outputs_dir_property(self):
+    def test_outputs_dir_property(self, tmp_path):
         """Test outputs_dir property returns correct path and creates it."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / "Ralph2file").write_text("# Test Spec")
-            mock_projects_dir = Path(tmpdir) / ".ralph2" / "projects"
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                ctx = ProjectContext(project_root)
+        ctx = ProjectContext(project_root)
 
-                outputs_dir = ctx.outputs_dir
+        outputs_dir = ctx.outputs_dir
 
-                assert outputs_dir == ctx.state_dir / "outputs"
-                assert outputs_dir.exists()
+        assert outputs_dir == ctx.state_dir / "outputs"
+        assert outputs_dir.exists()
 
-    def test_summaries_dir_property(self):
+    def test_summaries_dir_property(self, tmp_path):
         """Test summaries_dir property returns correct path and creates it."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / "Ralph2file").write_text("# Test Spec")
-            mock_projects_dir = Path(tmpdir) / ".ralph2" / "projects"
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
+
+        ctx = ProjectContext(project_root)
+
+        summaries_dir = ctx.summaries_dir
+
+        assert summaries_dir == ctx.state_dir / "summaries"
+        assert summaries_dir.exists()
+
+    def test_state_path_properties_are_cached(self, tmp_path):
+        """Test state paths are resolved once per context."""
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
+        ctx = ProjectContext(project_root)
+        first = (ctx.db_path, ctx.outputs_dir, ctx.summaries_dir)
+
+        with patch('ralph2.project.get_project_state_dir') as state_dir:
+            assert (ctx.db_path, ctx.outputs_dir, ctx.summaries_dir) == first
+
+        state_dir.assert_not_called()
+
+    def test_project_id_resolved_once_at_construction(self, tmp_path):
+        """Test the project ID is read at construction and never re-read."""
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
+        ctx = ProjectContext(project_root)
+        project_id = ctx.project_id
+
+        with patch('ralph2.project.get_project_id') as get_id:
+            assert ctx.project_id == project_id
+            assert ctx.db_path.parent.name == project_id
+
+        get_id.assert_not_called()
+
+    def test_state_tree_created_at_construction(self, tmp_path):
+        """Test the state directories exist before any path property is read."""
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
+        ctx = ProjectContext(project_root)
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                ctx = ProjectContext(project_root)
+        assert (ctx.state_dir / "outputs").is_dir()
+        assert (ctx.state_dir / "summaries").is_dir()
 
-                summaries_dir = ctx.summaries_dir
+        with patch.object(Path, 'mkdir') as mkdir:
+            ctx.outputs_dir, ctx.summaries_dir, ctx.db_path
 
-                assert summaries_dir == ctx.state_dir / "summaries"
-                assert summaries_dir.exists()
+        mkdir.assert_not_called()
 
-    def test_ralph2file_path_property(self):
+    def test_ralph2file_path_property(self, tmp_path):
         """Test ralph2file_path property returns correct path."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / "Ralph2file").write_text("# Test Spec")
-            mock_projects_dir = Path(tmpdir) / ".ralph2" / "projects"
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                ctx = ProjectContext(project_root)
+        ctx = ProjectContext(project_root)
 
-                assert ctx.ralph2file_path == project_root / "Ralph2file"
+        assert ctx.ralph2file_path == project_root / "Ralph2file"
 
-    def test_ralph2_id_path_property(self):
+    def test_ralph2_id_path_property(self, tmp_path):
         """Test ralph2_id_path property returns correct path."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            (project_root / "Ralph2file").write_text("# Test Spec")
-            mock_projects_dir = Path(tmpdir) / ".ralph2" / "projects"
+        project_root = tmp_path
+        (project_root / "Ralph2file").write_text("# Test Spec")
 
-            with patch('ralph2.project.RALPH2_PROJECTS_DIR', mock_projects_dir):
-                ctx = ProjectContext(project_root)
+        ctx = ProjectContext(project_root)
 
-                assert ctx.ralph2_id_path == project_root / RALPH2_ID_FILENAME
+        assert ctx.ralph2_id_path == project_root / RALPH2_ID_FILENAME
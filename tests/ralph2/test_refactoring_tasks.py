@@ -7,37 +7,36 @@ These tests verify:
 """
 
 import pytest
-import tempfile
 import os
-import threading
 import time
-from pathlib import Path
-from unittest.mock import patch, MagicMock, AsyncMock
+from dataclasses import replace
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
 import asyncio
 
 
 class TestAtomicFileWrite:
     """Tests for atomic file write in get_project_id."""
 
-    def test_atomic_write_creates_file(self):
+    def test_atomic_write_creates_file(self, tmp_path):
         """Test that atomic write creates the file correctly."""
         from ralph2.project import get_project_id, RALPH2_ID_FILENAME
         import uuid
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
+        project_root = tmp_path
 
-            project_id = get_project_id(project_root)
+        project_id = get_project_id(project_root)
 
-            # Should be a valid UUID
-            uuid.UUID(project_id)
+        # Should be a valid UUID
+        uuid.UUID(project_id)
 
-            # File should exist with correct content
-            id_file = project_root / RALPH2_ID_FILENAME
-            assert id_file.exists()
-            assert id_file.read_text().strip() == project_id
+        # File should exist with correct content
+        id_file = project_root / RALPH2_ID_FILENAME
+        assert id_file.exists()
+        assert id_file.read_text().strip() == project_id
 
-    def test_atomic_write_uses_temp_file(self):
+    def test_atomic_write_uses_temp_file(self, tmp_path):
         """Test that atomic write uses a temp file before renaming.
 
         The implementation uses os.link + os.unlink for exclusive creation,
@@ -56,21 +55,20 @@ class TestAtomicFileWrite:
             mkstemp_calls.append((args, kwargs, result))
             return result
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
+        project_root = tmp_path
 
-            with patch('tempfile.mkstemp', side_effect=tracking_mkstemp):
-                project_id = get_project_id(project_root)
+        with patch('tempfile.mkstemp', side_effect=tracking_mkstemp):
+            project_id = get_project_id(project_root)
 
-            # Should have used mkstemp for temp file creation
-            assert len(mkstemp_calls) == 1
-            args, kwargs, (fd, temp_path) = mkstemp_calls[0]
-            # Should have used .ralph2-id- prefix
-            assert kwargs.get('prefix') == '.ralph2-id-' or (len(args) > 1 and '.ralph2-id-' in str(args))
-            # Dir should be project root
-            assert kwargs.get('dir') == project_root or (args and args[0] == project_root)
+        # Should have used mkstemp for temp file creation
+        assert len(mkstemp_calls) == 1
+        args, kwargs, (fd, temp_path) = mkstemp_calls[0]
+        # Should have used .ralph2-id- prefix
+        assert kwargs.get('prefix') == '.ralph2-id-' or (len(args) > 1 and '.ralph2-id-' in str(args))
+        # Dir should be project root
+        assert kwargs.get('dir') == project_root or (args and args[0] == project_root)
 
-    def test_atomic_write_no_partial_content_on_failure(self):
+    def test_atomic_write_no_partial_content_on_failure(self, tmp_path):
         """Test that failed writes don't leave partial files.
 
         We simulate a failure during the atomic write by making os.link fail
@@ -79,61 +77,98 @@ class TestAtomicFileWrite:
         """
         from ralph2.project import get_project_id, RALPH2_ID_FILENAME
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            id_path = project_root / RALPH2_ID_FILENAME
+        project_root = tmp_path
+        id_path = project_root / RALPH2_ID_FILENAME
 
-            # Simulate os.write failure (happens before any atomic ops)
-            with patch('os.write', side_effect=OSError("Simulated write failure")):
-                with pytest.raises(OSError):
-                    get_project_id(project_root)
+        # Simulate os.write failure (happens before any atomic ops)
+        with patch('os.write', side_effect=OSError("Simulated write failure")):
+            with pytest.raises(OSError):
+                get_project_id(project_root)
 
-            # The actual file should not exist (no partial write)
-            assert not id_path.exists()
-            # Also no temp files should be left (cleanup should have run)
-            temp_files = list(project_root.glob('.ralph2-id-*'))
-            assert len(temp_files) == 0, f"Temp files left behind: {temp_files}"
+        # The actual file should not exist (no partial write)
+        assert not id_path.exists()
+        # Also no temp files should be left (cleanup should have run)
+        temp_files = list(project_root.glob('.ralph2-id-*'))
+        assert len(temp_files) == 0, f"Temp files left behind: {temp_files}"
 
-    def test_atomic_write_idempotent(self):
+    def test_atomic_write_idempotent(self, tmp_path):
         """Test that multiple calls return the same ID."""
         from ralph2.project import get_project_id
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
+        project_root = tmp_path
 
-            id1 = get_project_id(project_root)
-            id2 = get_project_id(project_root)
+        id1 = get_project_id(project_root)
+        id2 = get_project_id(project_root)
 
-            assert id1 == id2
+        assert id1 == id2
 
-    def test_concurrent_atomic_writes(self):
-        """Test that concurrent writes don't corrupt the file."""
+    def test_existing_id_read_without_temp_file(self, tmp_path):
+        """Test that an existing ID is returned without any temp-file work."""
         from ralph2.project import get_project_id
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_root = Path(tmpdir)
-            results = []
-            errors = []
+        project_root = tmp_path
+        project_id = get_project_id(project_root)
+
+        with patch('tempfile.mkstemp') as mock_mkstemp, patch('os.link') as mock_link:
+            assert get_project_id(project_root) == project_id
+
+        mock_mkstemp.assert_not_called()
+        mock_link.assert_not_called()
+
+    @pytest.mark.slow
+    def test_concurrent_atomic_writes(self, tmp_path):
+        """Test that concurrent writes from separate processes don't corrupt the file.
+
+        Processes rather than threads, so the creations race in the kernel
+        instead of being serialized by the GIL.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from ralph2.project import get_project_id, RALPH2_ID_FILENAME
+
+        project_root = tmp_path
+
+        # Launch multiple concurrent writes
+        with ProcessPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(get_project_id, [project_root] * 10))
 
-            def write_id():
-                try:
-                    result = get_project_id(project_root)
-                    results.append(result)
-                except Exception as e:
-                    errors.append(e)
+        # All results should be the same (first one won)
+        assert len(set(results)) == 1, "Concurrent writes produced different IDs"
+        assert (project_root / RALPH2_ID_FILENAME).read_text().strip() == results[0]
 
-            # Launch multiple concurrent writes
-            threads = [threading.Thread(target=write_id) for _ in range(10)]
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join()
 
-            # No errors should have occurred
-            assert not errors, f"Concurrent write errors: {errors}"
+@pytest.fixture(scope="module")
+def sample_iteration():
+    """A finished iteration record; treat as read-only."""
+    from ralph2.state.models import Iteration
 
-            # All results should be the same (first one won)
-            assert len(set(results)) == 1, "Concurrent writes produced different IDs"
+    return Iteration(
+        id=1, run_id="test-run", number=1, intent="test",
+        outcome="test", started_at=datetime(2024, 1, 1)
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_outputs():
+    """Executor, verifier and specialist outputs for iteration 1; treat as read-only.
+
+    Use dataclasses.replace() for variants.
+    """
+    from ralph2.state.models import AgentOutput
+
+    return (
+        AgentOutput(
+            id=1, iteration_id=1, agent_type="executor",
+            raw_output_path="/tmp/test", summary="executor summary"
+        ),
+        AgentOutput(
+            id=2, iteration_id=1, agent_type="verifier",
+            raw_output_path="/tmp/test", summary="verifier assessment"
+        ),
+        AgentOutput(
+            id=3, iteration_id=1, agent_type="specialist",
+            raw_output_path="/tmp/test", summary="specialist feedback"
+        ),
+    )
 
 
 class TestIterationSummariesExtraction:
@@ -144,6 +179,11 @@ class TestIterationSummariesExtraction:
     named _get_last_iteration_summaries and takes run_id and last_iteration.
     """
 
+    @staticmethod
+    def _runner_stub(outputs=()):
+        """Stand-in runner whose db returns the given agent outputs."""
+        return SimpleNamespace(db=SimpleNamespace(get_agent_outputs=lambda iteration_id: list(outputs)))
+
     def test_helper_method_exists(self):
         """Test that _get_last_iteration_summaries method exists on Ralph2Runner."""
         from ralph2.runner import Ralph2Runner
@@ -155,75 +195,28 @@ class TestIterationSummariesExtraction:
             f"Available methods with 'last' or 'iteration': {[m for m in methods if 'last' in m.lower() or 'iteration' in m.lower()]}"
         )
 
-    def test_helper_returns_three_values(self):
+    def test_helper_returns_three_values(self, sample_iteration, sample_outputs):
         """Test that _get_last_iteration_summaries returns a tuple of three strings/None."""
         from ralph2.runner import Ralph2Runner
-        from ralph2.state.db import Ralph2DB
-        from ralph2.state.models import AgentOutput, Iteration
-        from unittest.mock import MagicMock
-        from datetime import datetime
-
-        # Create mock runner
-        mock_db = MagicMock(spec=Ralph2DB)
-        mock_runner = MagicMock(spec=Ralph2Runner)
-        mock_runner.db = mock_db
-
-        mock_iteration = Iteration(
-            id=1, run_id="test-run", number=1, intent="test",
-            outcome="test", started_at=datetime.now()
-        )
 
-        mock_outputs = [
-            AgentOutput(
-                id=1, iteration_id=1, agent_type="executor",
-                raw_output_path="/tmp/test", summary="executor summary"
-            ),
-            AgentOutput(
-                id=2, iteration_id=1, agent_type="verifier",
-                raw_output_path="/tmp/test", summary="verifier assessment"
-            ),
-            AgentOutput(
-                id=3, iteration_id=1, agent_type="specialist",
-                raw_output_path="/tmp/test", summary="specialist feedback"
-            ),
-        ]
-
-        mock_db.get_agent_outputs.return_value = mock_outputs
+        mock_runner = self._runner_stub(sample_outputs)
 
         # Call the method (unbound, passing self)
-        result = Ralph2Runner._get_last_iteration_summaries(mock_runner, "test-run", mock_iteration)
+        result = Ralph2Runner._get_last_iteration_summaries(mock_runner, "test-run", sample_iteration)
 
         # Should return tuple of 3
         assert isinstance(result, tuple)
         assert len(result) == 3
 
-    def test_helper_extracts_executor_summary(self):
+    def test_helper_extracts_executor_summary(self, sample_iteration, sample_outputs):
         """Test extraction of executor summary."""
         from ralph2.runner import Ralph2Runner
-        from ralph2.state.db import Ralph2DB
-        from ralph2.state.models import AgentOutput, Iteration
-        from unittest.mock import MagicMock
-        from datetime import datetime
-
-        mock_db = MagicMock(spec=Ralph2DB)
-        mock_runner = MagicMock(spec=Ralph2Runner)
-        mock_runner.db = mock_db
-
-        mock_iteration = Iteration(
-            id=1, run_id="test-run", number=1, intent="test",
-            outcome="test", started_at=datetime.now()
-        )
 
-        mock_outputs = [
-            AgentOutput(
-                id=1, iteration_id=1, agent_type="executor",
-                raw_output_path="/tmp/test", summary="executor did this work"
-            ),
-        ]
-        mock_db.get_agent_outputs.return_value = mock_outputs
+        mock_outputs = [replace(sample_outputs[0], summary="executor did this work")]
+        mock_runner = self._runner_stub(mock_outputs)
 
         last_exec, last_verify, last_spec = Ralph2Runner._get_last_iteration_summaries(
-            mock_runner, "test-run", mock_iteration
+            mock_runner, "test-run", sample_iteration
         )
 
         assert last_exec == "executor did this work"
@@ -231,11 +224,8 @@ class TestIterationSummariesExtraction:
     def test_helper_returns_none_when_no_iteration(self):
         """Test that helper returns None values when no iteration exists."""
         from ralph2.runner import Ralph2Runner
-        from unittest.mock import MagicMock
-
-        mock_runner = MagicMock(spec=Ralph2Runner)
 
-        result = Ralph2Runner._get_last_iteration_summaries(mock_runner, "test-run", None)
+        result = Ralph2Runner._get_last_iteration_summaries(self._runner_stub(), "test-run", None)
 
         assert result == (None, None, None)
 
@@ -259,9 +249,7 @@ class TestConflictResolutionExtraction:
     async def test_conflict_resolution_returns_executor_result(self):
         """Test that conflict resolution returns an ExecutorResult."""
         from ralph2.agents.executor import _attempt_conflict_resolution, ExecutorResult
-        from claude_agent_sdk import ClaudeAgentOptions
-        from ralph2.git import GitBranchManager
-        from unittest.mock import MagicMock, AsyncMock, patch
+        from unittest.mock import AsyncMock, patch
 
         # Create mocks
         mock_result = ExecutorResult(
@@ -271,10 +259,11 @@ class TestConflictResolutionExtraction:
             traces_updated=True
         )
 
-        mock_options = MagicMock(spec=ClaudeAgentOptions)
-        mock_git_manager = MagicMock(spec=GitBranchManager)
-        mock_git_manager.check_merge_conflicts.return_value = (False, "")
-        mock_git_manager.merge_to_main.return_value = (True, None)
+        mock_options = SimpleNamespace()
+        mock_git_manager = SimpleNamespace(
+            check_merge_conflicts=lambda: (False, ""),
+            merge_to_main=lambda: (True, None),
+        )
 
         with patch('ralph2.agents.executor._run_executor_agent', new_callable=AsyncMock) as mock_agent:
             mock_agent.return_value = (
@@ -296,9 +285,7 @@ class TestConflictResolutionExtraction:
     async def test_conflict_resolution_handles_failure(self):
         """Test that conflict resolution handles failure gracefully."""
         from ralph2.agents.executor import _attempt_conflict_resolution, ExecutorResult
-        from claude_agent_sdk import ClaudeAgentOptions
-        from ralph2.git import GitBranchManager
-        from unittest.mock import MagicMock, AsyncMock, patch
+        from unittest.mock import AsyncMock, patch
 
         mock_result = ExecutorResult(
             status="Completed",
@@ -307,10 +294,11 @@ class TestConflictResolutionExtraction:
             traces_updated=True
         )
 
-        mock_options = MagicMock(spec=ClaudeAgentOptions)
-        mock_git_manager = MagicMock(spec=GitBranchManager)
-        mock_git_manager.check_merge_conflicts.return_value = (True, "still conflicted")
-        mock_git_manager.merge_to_main.return_value = (False, "merge failed")
+        mock_options = SimpleNamespace()
+        mock_git_manager = SimpleNamespace(
+            check_merge_conflicts=lambda: (True, "still conflicted"),
+            merge_to_main=lambda: (False, "merge failed"),
+        )
 
         with patch('ralph2.agents.executor._run_executor_agent', new_callable=AsyncMock) as mock_agent:
             # Simulate agent failing to resolve
@@ -335,9 +323,7 @@ class TestConflictResolutionExtraction:
     async def test_conflict_resolution_agent_error_handled(self):
         """Test that agent errors during conflict resolution are handled."""
         from ralph2.agents.executor import _attempt_conflict_resolution, ExecutorResult
-        from claude_agent_sdk import ClaudeAgentOptions
-        from ralph2.git import GitBranchManager
-        from unittest.mock import MagicMock, AsyncMock, patch
+        from unittest.mock import AsyncMock, patch
 
         mock_result = ExecutorResult(
             status="Completed",
@@ -346,9 +332,8 @@ class TestConflictResolutionExtraction:
             traces_updated=True
         )
 
-        mock_options = MagicMock(spec=ClaudeAgentOptions)
-        mock_git_manager = MagicMock(spec=GitBranchManager)
-        mock_git_manager.merge_to_main.return_value = (False, "still failed")
+        mock_options = SimpleNamespace()
+        mock_git_manager = SimpleNamespace(merge_to_main=lambda: (False, "still failed"))
 
         with patch('ralph2.agents.executor._run_executor_agent', new_callable=AsyncMock) as mock_agent:
             mock_agent.side_effect = Exception("Agent crashed")
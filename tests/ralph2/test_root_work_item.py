@@ -1,10 +1,8 @@
 """Tests for automatic root work item creation and management."""
 
 import pytest
-import tempfile
 import subprocess
 import json
-from pathlib import Path
 from datetime import datetime
 
 from ralph2.state.db import Ralph2DB
@@ -13,31 +11,7 @@ from ralph2.runner import Ralph2Runner
 from ralph2.project import ProjectContext
 
 
-@pytest.fixture
-def temp_project():
-    """Create a temporary project directory with git and trace initialized."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        project_root = Path(tmpdir)
-
-        # Initialize git
-        subprocess.run(["git", "init"], cwd=project_root, check=True, capture_output=True)
-        subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=project_root, check=True, capture_output=True)
-        subprocess.run(["git", "config", "user.name", "Test User"], cwd=project_root, check=True, capture_output=True)
-
-        # Initialize trace
-        subprocess.run(["trc", "init"], cwd=project_root, check=True, capture_output=True)
-
-        # Create a Ralph2file
-        ralph2file = project_root / "Ralph2file"
-        ralph2file.write_text("# Test Spec\n\nThis is a test specification.")
-
-        # Commit initial state
-        subprocess.run(["git", "add", "."], cwd=project_root, check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit"], cwd=project_root, check=True, capture_output=True)
-
-        yield project_root
-
-
+@pytest.mark.slow
 def test_root_work_item_auto_created_on_first_run(temp_project):
     """Test that root work item is automatically created on first run."""
     # Create project context
@@ -89,6 +63,7 @@ def test_root_work_item_auto_created_on_first_run(temp_project):
     assert "Test Spec" in result.stdout
 
 
+@pytest.mark.slow
 def test_root_work_item_stored_and_reused(temp_project):
     """Test that root work item ID is stored and reused on subsequent runs."""
     ctx = ProjectContext(temp_project)
@@ -142,6 +117,7 @@ def test_root_work_item_stored_and_reused(temp_project):
     assert root_work_item_id_1 == root_work_item_id_2
 
 
+@pytest.mark.slow
 def test_explicit_root_work_item_id_honored(temp_project):
     """Test that explicitly provided root work item ID is used instead of auto-creating."""
     ctx = ProjectContext(temp_project)
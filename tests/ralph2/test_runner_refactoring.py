@@ -3,11 +3,35 @@
 The spec requires: `Ralph2Runner.run()` broken into smaller methods (each < 50 lines)
 """
 
-import pytest
+import ast
+import functools
 import inspect
+import linecache
+import textwrap
+
+import pytest
 from ralph2.runner import Ralph2Runner
 
 
+@functools.cache
+def _runner_functions():
+    """Ralph2Runner's functions by name, introspected once per session."""
+    return dict(inspect.getmembers(Ralph2Runner, predicate=inspect.isfunction))
+
+
+# runner.py read once; method sources are sliced out of it by line number
+linecache.checkcache()
+_RUNNER_SOURCE_LINES = linecache.getlines(inspect.getsourcefile(Ralph2Runner))
+
+
+@functools.cache
+def _method_source(method) -> str:
+    """Dedented source of a Ralph2Runner method, sliced from runner.py."""
+    first_line = method.__code__.co_firstlineno
+    block = inspect.getblock(_RUNNER_SOURCE_LINES[first_line - 1:])
+    return textwrap.dedent(''.join(block))
+
+
 class TestRunnerMethodSizes:
     """Test that Runner methods are small enough (<50 lines each)."""
 
@@ -15,51 +39,23 @@ class TestRunnerMethodSizes:
 
     def _get_method_line_count(self, method) -> int:
         """Get the number of lines in a method body."""
-        source = inspect.getsource(method)
+        source = _method_source(method)
+        func = ast.parse(source).body[0]
+        body = func.body
+        # Skip the docstring
+        if (isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant)
+                and isinstance(body[0].value.value, str)):
+            body = body[1:]
+        if not body:
+            return 0
+
         # Count non-empty, non-comment lines in the method body
-        lines = source.split('\n')
-        # Find the start of the method body (after the def line and docstring)
-        in_docstring = False
-        body_started = False
-        code_lines = 0
-
-        for line in lines:
-            stripped = line.strip()
-
-            # Skip the def line
-            if stripped.startswith('def ') or stripped.startswith('async def '):
-                body_started = True
-                continue
-
-            if not body_started:
-                continue
-
-            # Handle docstrings
-            if stripped.startswith('"""') or stripped.startswith("'''"):
-                if in_docstring:
-                    in_docstring = False
-                    continue
-                elif stripped.count('"""') == 2 or stripped.count("'''") == 2:
-                    # Single-line docstring
-                    continue
-                else:
-                    in_docstring = True
-                    continue
-
-            if in_docstring:
-                continue
-
-            # Skip empty lines and comments
-            if not stripped or stripped.startswith('#'):
-                continue
-
-            code_lines += 1
-
-        return code_lines
+        lines = source.splitlines()[body[0].lineno - 1:body[-1].end_lineno]
+        return sum(1 for line in lines if line.strip() and not line.strip().startswith('#'))
 
     def test_run_method_under_50_lines(self):
         """The main run() method should be under 50 lines."""
-        line_count = self._get_method_line_count(Ralph2Runner.run)
+        line_count = self._get_method_line_count(_runner_functions()['run'])
         assert line_count <= self.MAX_METHOD_LINES, (
             f"run() method has {line_count} lines of code, "
             f"should be <= {self.MAX_METHOD_LINES} lines"
@@ -67,10 +63,8 @@ class TestRunnerMethodSizes:
 
     def test_all_public_methods_under_50_lines(self):
         """All public methods should be under 50 lines each."""
-        methods = inspect.getmembers(Ralph2Runner, predicate=inspect.isfunction)
-
         oversized_methods = []
-        for name, method in methods:
+        for name, method in _runner_functions().items():
             if name.startswith('_'):
                 continue  # Skip private methods
             try:
@@ -96,10 +90,10 @@ class TestRunnerMethodSizes:
             '_handle_human_inputs',
         ]
 
-        runner_methods = [name for name, _ in inspect.getmembers(Ralph2Runner, predicate=inspect.isfunction)]
+        runner_methods = _runner_functions()
 
         for helper in expected_helpers:
             assert helper in runner_methods, (
                 f"Expected helper method '{helper}' not found in Ralph2Runner. "
-                f"Available methods: {runner_methods}"
+                f"Available methods: {list(runner_methods)}"
             )
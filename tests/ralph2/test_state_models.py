@@ -479,6 +479,27 @@ class TestRalph2DBClose:
 
         db.close()
 
+    def test_context_manager_closes_on_exit(self, tmp_path):
+        """Test that using Ralph2DB in a with-statement closes it on exit."""
+        from ralph2.state.db import Ralph2DB
+
+        db_path = str(tmp_path / "test_ctx.db")
+        with Ralph2DB(db_path) as db:
+            assert db._closed is False
+
+        assert db._closed is True
+
+    def test_context_manager_does_not_suppress_exceptions(self, tmp_path):
+        """Test that exceptions propagate out of the with-statement and the DB is closed."""
+        from ralph2.state.db import Ralph2DB
+
+        db_path = str(tmp_path / "test_ctx_error.db")
+        with pytest.raises(ValueError):
+            with Ralph2DB(db_path) as db:
+                raise ValueError("boom")
+
+        assert db._closed is True
+
 
 class TestRalph2DBUpdateIterationIntent:
     """Tests for Ralph2DB.update_iteration_intent() - spec requirement: 'Database operations use transaction boundaries for multi-step operations' and 'Direct SQL execution bypasses database abstraction'."""
@@ -44,12 +44,12 @@ class TestExecutorGitBranchIsolation:
                     )
 
         # Verify a branch creation command was issued (now via 'git branch')
-        branch_create_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and 'ralph2/ralph-abc123' in ' '.join(cmd)]
+        branch_create_cmds = [cmd for cmd in git_commands if 'branch' in cmd and 'ralph2/ralph-abc123' in cmd]
         assert len(branch_create_cmds) > 0, "No branch creation command found"
 
         # Verify the branch name follows the pattern ralph2/<work-item-id>
         branch_cmd = branch_create_cmds[0]
-        assert 'ralph2/ralph-abc123' in ' '.join(branch_cmd), f"Branch name incorrect: {branch_cmd}"
+        assert 'ralph2/ralph-abc123' in branch_cmd, f"Branch name incorrect: {branch_cmd}"
 
     @pytest.mark.asyncio
     async def test_executor_merges_branch_on_success(self):
@@ -86,15 +86,15 @@ class TestExecutorGitBranchIsolation:
                     )
 
         # Verify merge sequence: checkout main, merge feature branch
-        checkout_main_cmds = [cmd for cmd in git_commands if 'checkout' in ' '.join(cmd) and 'main' in ' '.join(cmd)]
-        merge_cmds = [cmd for cmd in git_commands if 'merge' in ' '.join(cmd)]
+        checkout_main_cmds = [cmd for cmd in git_commands if 'checkout' in cmd and 'main' in cmd]
+        merge_cmds = [cmd for cmd in git_commands if 'merge' in cmd]
 
         assert len(checkout_main_cmds) > 0, "No checkout main command found"
         assert len(merge_cmds) > 0, "No merge command found"
 
         # Verify merge includes the feature branch
         merge_cmd = merge_cmds[0]
-        assert 'ralph2/ralph-xyz789' in ' '.join(merge_cmd), f"Merge command doesn't reference feature branch: {merge_cmd}"
+        assert 'ralph2/ralph-xyz789' in merge_cmd, f"Merge command doesn't reference feature branch: {merge_cmd}"
 
     @pytest.mark.asyncio
     async def test_executor_abandons_branch_on_blocked_status(self):
@@ -131,11 +131,11 @@ class TestExecutorGitBranchIsolation:
                     )
 
         # Verify no merge command was issued
-        merge_cmds = [cmd for cmd in git_commands if 'merge' in ' '.join(cmd)]
+        merge_cmds = [cmd for cmd in git_commands if 'merge' in cmd]
         assert len(merge_cmds) == 0, f"Merge should not happen on Blocked status, but found: {merge_cmds}"
 
         # Verify branch deletion command was issued
-        delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
+        delete_cmds = [cmd for cmd in git_commands if 'branch' in cmd and '-D' in cmd]
         assert len(delete_cmds) > 0, "Branch should be deleted on Blocked status"
 
     @pytest.mark.asyncio
@@ -148,7 +148,7 @@ class TestExecutorGitBranchIsolation:
             result = MagicMock()
 
             # Simulate merge conflict
-            if 'merge' in ' '.join(cmd):
+            if 'merge' in cmd:
                 result.returncode = 1
                 result.stderr = "CONFLICT: Merge conflict in file.py"
             else:
@@ -215,5 +215,5 @@ class TestExecutorGitBranchIsolation:
                 )
 
         # Verify no git branch commands were issued
-        branch_cmds = [cmd for cmd in git_commands if 'checkout' in ' '.join(cmd) and '-b' in cmd]
+        branch_cmds = [cmd for cmd in git_commands if 'checkout' in cmd and '-b' in cmd]
         assert len(branch_cmds) == 0, "No branch creation should happen without work_item_id"
@@ -53,16 +53,16 @@ class TestExecutorGitWorktrees:
                     )
 
         # Verify NO git checkout -b commands (old approach)
-        checkout_create_cmds = [cmd for cmd in git_commands if 'checkout' in ' '.join(cmd) and '-b' in cmd]
+        checkout_create_cmds = [cmd for cmd in git_commands if 'checkout' in cmd and '-b' in cmd]
         assert len(checkout_create_cmds) == 0, f"Should not use 'git checkout -b', found: {checkout_create_cmds}"
 
         # Verify git worktree add command was issued
-        worktree_add_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'add' in ' '.join(cmd)]
+        worktree_add_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'add' in cmd]
         assert len(worktree_add_cmds) > 0, "No 'git worktree add' command found"
 
         # Verify the worktree path and branch name
         worktree_cmd = worktree_add_cmds[0]
-        assert 'ralph2/ralph-abc123' in ' '.join(worktree_cmd), f"Branch name incorrect in worktree command: {worktree_cmd}"
+        assert 'ralph2/ralph-abc123' in worktree_cmd, f"Branch name incorrect in worktree command: {worktree_cmd}"
 
     @pytest.mark.asyncio
     async def test_executor_passes_cwd_to_agent_instead_of_os_chdir(self):
@@ -153,12 +153,12 @@ class TestExecutorGitWorktrees:
                     )
 
         # Verify merge command was issued
-        merge_cmds = [cmd for cmd in git_commands if 'merge' in ' '.join(cmd)]
+        merge_cmds = [cmd for cmd in git_commands if 'merge' in cmd]
         assert len(merge_cmds) > 0, "No merge command found"
 
         # Verify the merge references the feature branch
         merge_cmd = merge_cmds[0]
-        assert 'ralph2/ralph-merge1' in ' '.join(merge_cmd), f"Merge command doesn't reference feature branch: {merge_cmd}"
+        assert 'ralph2/ralph-merge1' in merge_cmd, f"Merge command doesn't reference feature branch: {merge_cmd}"
 
     @pytest.mark.asyncio
     async def test_executor_removes_worktree_on_completion(self):
@@ -195,7 +195,7 @@ class TestExecutorGitWorktrees:
                     )
 
         # Verify worktree remove command was issued
-        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
+        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'remove' in cmd]
         assert len(worktree_remove_cmds) > 0, "No 'git worktree remove' command found - worktree not cleaned up"
 
     @pytest.mark.asyncio
@@ -233,11 +233,11 @@ class TestExecutorGitWorktrees:
                     )
 
         # Verify worktree remove command was issued
-        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in ' '.join(cmd) and 'remove' in ' '.join(cmd)]
+        worktree_remove_cmds = [cmd for cmd in git_commands if 'worktree' in cmd and 'remove' in cmd]
         assert len(worktree_remove_cmds) > 0, "Worktree should be cleaned up even on Blocked status"
 
         # Verify branch deletion command was issued
-        delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
+        delete_cmds = [cmd for cmd in git_commands if 'branch' in cmd and '-D' in cmd]
         assert len(delete_cmds) > 0, "Branch should be deleted on Blocked status"
 
     @pytest.mark.asyncio
@@ -247,7 +247,7 @@ class TestExecutorGitWorktrees:
 
         def mock_subprocess_run(cmd, *args, **kwargs):
             # Capture worktree paths from 'git worktree add' commands
-            if 'worktree' in ' '.join(cmd) and 'add' in ' '.join(cmd):
+            if 'worktree' in cmd and 'add' in cmd:
                 cmd_str = ' '.join(cmd)
                 worktree_paths.append(cmd_str)
 
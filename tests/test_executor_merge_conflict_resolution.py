@@ -25,7 +25,7 @@ class TestExecutorMergeConflictResolution:
             result = MagicMock()
 
             # Simulate merge conflict on first merge attempt
-            if 'merge' in ' '.join(cmd) and 'ralph2/' in ' '.join(cmd):
+            if 'merge' in cmd and any(arg.startswith('ralph2/') for arg in cmd):
                 result.returncode = 1
                 result.stderr = "CONFLICT: Merge conflict in file.py\nAutomatic merge failed; fix conflicts and then commit the result."
             else:
@@ -79,7 +79,7 @@ class TestExecutorMergeConflictResolution:
             result = MagicMock()
 
             # Simulate merge conflict that persists
-            if 'merge' in ' '.join(cmd) and 'ralph2/' in ' '.join(cmd):
+            if 'merge' in cmd and any(arg.startswith('ralph2/') for arg in cmd):
                 result.returncode = 1
                 result.stderr = "CONFLICT: Merge conflict in file.py"
             else:
@@ -124,7 +124,7 @@ class TestExecutorMergeConflictResolution:
         assert result["status"] == "Blocked", "Executor should report Blocked after failed conflict resolution"
 
         # Verify branch deletion was attempted
-        delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
+        delete_cmds = [cmd for cmd in git_commands if 'branch' in cmd and '-D' in cmd]
         assert len(delete_cmds) > 0, "Branch should be deleted after failed conflict resolution"
 
     @pytest.mark.asyncio
@@ -139,7 +139,7 @@ class TestExecutorMergeConflictResolution:
             result = MagicMock()
 
             # Simulate merge conflict on first attempt, success on second
-            if 'merge' in ' '.join(cmd) and 'ralph2/' in ' '.join(cmd):
+            if 'merge' in cmd and any(arg.startswith('ralph2/') for arg in cmd):
                 merge_attempt_count[0] += 1
                 if merge_attempt_count[0] == 1:
                     result.returncode = 1
@@ -190,5 +190,5 @@ class TestExecutorMergeConflictResolution:
         assert merge_attempt_count[0] == 2, f"Expected 2 merge attempts, got {merge_attempt_count[0]}"
 
         # Verify branch deletion occurred (successful merge cleanup)
-        delete_cmds = [cmd for cmd in git_commands if 'branch' in ' '.join(cmd) and '-D' in cmd]
+        delete_cmds = [cmd for cmd in git_commands if 'branch' in cmd and '-D' in cmd]
         assert len(delete_cmds) > 0, "Branch should be deleted after successful merge as part of cleanup"
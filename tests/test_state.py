@@ -3,20 +3,22 @@
 import pytest
 import tempfile
 import os
+import sqlite3
+import uuid
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 from ralph2.state.db import Ralph2DB
 from ralph2.state.models import Run, Iteration, AgentOutput, HumanInput
 
 
 @pytest.fixture
 def temp_db():
-    """Create a temporary database for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = os.path.join(tmpdir, "test_ralph.db")
-        db = Ralph2DB(db_path)
-        yield db
-        db.close()
+    """Create a temporary in-memory database for testing (one per test)."""
+    db = Ralph2DB(f"file:test_ralph_{uuid.uuid4().hex}?mode=memory&cache=shared")
+    yield db
+    db.close()
 
 
 @pytest.fixture
@@ -95,6 +97,70 @@ class TestDatabaseInitialization:
             assert os.path.exists(os.path.dirname(db_path))
             db.close()
 
+    def test_schema_version_recorded(self, temp_db):
+        """Test that schema init records the schema version in user_version."""
+        from ralph2.state.db import _SCHEMA_VERSION
+
+        version = temp_db.conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == _SCHEMA_VERSION
+
+    def test_current_schema_skips_ddl_on_reopen(self):
+        """Test that reopening an up-to-date database does not re-run schema DDL."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test.db")
+            Ralph2DB(db_path).close()
+
+            statements = []
+            original_connect = sqlite3.connect
+
+            def tracing_connect(*args, **kwargs):
+                conn = original_connect(*args, **kwargs)
+                conn.set_trace_callback(statements.append)
+                return conn
+
+            with patch("ralph2.state.db.sqlite3.connect", side_effect=tracing_connect):
+                db = Ralph2DB(db_path)
+            db.close()
+
+            assert not any("CREATE TABLE" in sql for sql in statements)
+
+    def test_latest_run_uses_started_at_index(self, temp_db):
+        """Test that get_latest_run's ORDER BY is served by the started_at index."""
+        plan = temp_db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM runs ORDER BY started_at DESC LIMIT 1"
+        ).fetchall()
+        details = " ".join(row[3] for row in plan)
+
+        assert "idx_runs_started_at" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_version_1_database_gains_started_at_index(self):
+        """Test that opening a version 1 database adds the started_at index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test.db")
+            Ralph2DB(db_path).close()
+            with closing(sqlite3.connect(db_path)) as conn:
+                conn.execute("DROP INDEX idx_runs_started_at")
+                conn.execute("PRAGMA user_version = 1")
+                conn.commit()
+
+            with Ralph2DB(db_path) as db:
+                row = db.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_runs_started_at'"
+                ).fetchone()
+
+            assert row is not None
+
+    def test_shared_memory_uri_connections_share_data(self, sample_run):
+        """Test that Ralph2DB instances opened on one memory URI see the same data."""
+        uri = f"file:shared_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        with Ralph2DB(uri) as first:
+            first.create_run(sample_run)
+            with Ralph2DB(uri) as second:
+                assert second.get_run(sample_run.id) is not None
+
+        assert not os.path.exists(uri)
+
     def test_schema_tables_created(self, temp_db):
         """Test that all required tables are created in the schema."""
         cursor = temp_db.conn.cursor()
@@ -178,6 +244,57 @@ class TestRunOperations:
         assert retrieved_run.started_at == sample_run.started_at
         assert retrieved_run.ended_at is None
 
+    def test_create_runs_batch(self, temp_db, sample_run):
+        """Test creating several runs in one batch."""
+        run2 = Run(
+            id="test-run-456",
+            spec_path="Ralphfile",
+            spec_content="# Test Spec",
+            status="running",
+            config={},
+            started_at=datetime(2024, 1, 16, 10, 30, 0)
+        )
+
+        created = temp_db.create_runs([sample_run, run2])
+
+        assert [r.id for r in created] == [sample_run.id, run2.id]
+        assert {r.id for r in temp_db.list_runs()} == {sample_run.id, run2.id}
+
+    def test_create_runs_rolls_back_with_transaction(self, temp_db, sample_run):
+        """Test that a batch insert inside a failed transaction is rolled back."""
+        with pytest.raises(ValueError):
+            with temp_db.transaction():
+                temp_db.create_runs([sample_run])
+                raise ValueError("boom")
+
+        assert temp_db.get_run(sample_run.id) is None
+
+    def test_create_runs_is_all_or_nothing(self, temp_db, sample_run):
+        """Test that a failing row rolls back the rest of the batch."""
+        other = Run(
+            id="test-run-789",
+            spec_path="Ralphfile",
+            spec_content="# Test Spec",
+            status="running",
+            config={},
+            started_at=datetime(2024, 1, 16, 10, 30, 0)
+        )
+
+        with pytest.raises(sqlite3.IntegrityError):
+            temp_db.create_runs([other, sample_run, sample_run])
+
+        # A later auto-committed write must not commit the failed batch
+        temp_db.create_run(Run(
+            id="test-run-after",
+            spec_path="Ralphfile",
+            spec_content="# Test Spec",
+            status="running",
+            config={},
+            started_at=datetime(2024, 1, 17, 10, 30, 0)
+        ))
+        assert temp_db.get_run(other.id) is None
+        assert temp_db.get_run(sample_run.id) is None
+
     def test_get_nonexistent_run(self, temp_db):
         """Test retrieving a run that doesn't exist."""
         retrieved_run = temp_db.get_run("nonexistent-id")